@@ -1,3 +1,18 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Brand
+
+
+@admin.register(Brand)
+class BrandAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug", "is_active", "modified")
+    list_filter = ("is_active", "sites")
+    search_fields = ("name", "slug")
+    prepopulated_fields = {"slug": ("name",)}
+    filter_horizontal = ("sites",)
+
+    fieldsets = [
+        (None, {"fields": (("name", "slug", "is_active"), "logo", "description")}),
+        ("Sites", {"fields": ("sites",)}),
+        ("SEO", {"fields": ("meta_title", "meta_description", "meta_image")}),
+    ]
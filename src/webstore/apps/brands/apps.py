@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BrandsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.brands"
+
+    def ready(self):
+        # keep the per-site brand listing snapshots in sync
+        from . import signals  # noqa: F401
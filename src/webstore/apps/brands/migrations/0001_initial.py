@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("sites", "0002_alter_domain_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Brand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "meta_title",
+                    models.CharField(
+                        blank=True, max_length=255, verbose_name="Meta Title"
+                    ),
+                ),
+                (
+                    "meta_description",
+                    models.TextField(
+                        blank=True, max_length=300, verbose_name="Meta Description"
+                    ),
+                ),
+                (
+                    "meta_image",
+                    models.ImageField(
+                        blank=True,
+                        null=True,
+                        upload_to="seo/",
+                        verbose_name="Meta Image (OG/Twitter)",
+                    ),
+                ),
+                ("name", models.CharField(max_length=120)),
+                ("slug", models.SlugField(blank=True, db_index=False, max_length=140)),
+                ("logo", models.ImageField(blank=True, null=True, upload_to="brands/")),
+                ("description", models.TextField(blank=True, default="")),
+                ("is_active", models.BooleanField(default=True)),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                (
+                    "sites",
+                    models.ManyToManyField(
+                        blank=True, related_name="brands", to="sites.site"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Brand",
+                "verbose_name_plural": "Brands",
+                "db_table": "brands",
+                "ordering": ("name",),
+                "constraints": [
+                    models.UniqueConstraint(fields=("slug",), name="brands_slug_unique")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("brands", "0002_seo_image_dimensions"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="brand",
+            name="meta_image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                upload_to="seo/",
+                verbose_name="Meta Image (OG/Twitter)",
+            ),
+        ),
+    ]
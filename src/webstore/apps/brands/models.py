@@ -1,3 +1,45 @@
+from django.contrib.sites.models import Site
 from django.db import models
+from django.urls import reverse
+from django.utils.translation import gettext as _
+from slugify import slugify
 
-# Create your models here.
+from apps.siteSettings.models import SEOMixin
+
+
+class Brand(SEOMixin):
+    name = models.CharField(max_length=120)
+    slug = models.SlugField(max_length=140, db_index=False, blank=True)
+    logo = models.ImageField(upload_to="brands/", blank=True, null=True)
+    description = models.TextField(blank=True, default="")
+    sites = models.ManyToManyField(Site, related_name="brands", blank=True)
+    is_active = models.BooleanField(default=True)
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "brands"
+        verbose_name = "Brand"
+        verbose_name_plural = "Brands"
+        ordering = ("name",)
+        constraints = [
+            # the unique index is what the detail page lookup by slug hits
+            models.UniqueConstraint(fields=["slug"], name="brands_slug_unique"),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = slugify(self.name)
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        return reverse("brands:detail", kwargs={"slug": self.slug})
+
+    def get_breadcrumbs(self):
+        return [
+            (_("Brands"), reverse("brands:index")),
+            (self.name, self.get_absolute_url()),
+        ]
@@ -0,0 +1,31 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Brand
+from .snapshot import rebuild_all_snapshots
+
+
+def _schedule_rebuild():
+    # one rebuild per transaction (savepoint) however many brands it changes,
+    # an admin action or an import; a rolled back savepoint drops its
+    # callbacks, the changes after it schedule the rebuild again; the blocks
+    # without a savepoint (related managers, inherited saves) push None
+    connection = transaction.get_connection()
+    savepoints = set(connection.savepoint_ids) - {None}
+    for callback_savepoints, func, robust in connection.run_on_commit:
+        if func is rebuild_all_snapshots and callback_savepoints - {None} == savepoints:
+            return
+    transaction.on_commit(rebuild_all_snapshots)
+
+
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+def brand_changed(sender, **kwargs):
+    _schedule_rebuild()
+
+
+@receiver(m2m_changed, sender=Brand.sites.through)
+def brand_sites_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        _schedule_rebuild()
@@ -0,0 +1,60 @@
+import logging
+
+from django.contrib.sites.models import Site
+from django.core.files.storage import default_storage
+
+from webstore.coordination import cache
+
+from .models import Brand
+
+logger = logging.getLogger("django")
+
+SNAPSHOT_CACHE_KEY = "brands:snapshot:{site_id}"
+# the snapshots are rebuilt on change in the coordination cache, the timeout
+# bounds the age of one a failed rebuild left behind
+SNAPSHOT_TIMEOUT = 60 * 60
+
+
+def build_snapshot(site_id):
+    """
+    Build the denormalized brand listing of a site with a single query.
+
+    Every entry is a plain dict with the logo URL already resolved, so the
+    brand index template never touches the ORM or the storage backend.
+    """
+    rows = (
+        Brand.objects.filter(sites=site_id, is_active=True)
+        .order_by("name")
+        .values_list("name", "slug", "logo", "meta_description")
+    )
+    return tuple(
+        {
+            "name": name,
+            "slug": slug,
+            "logo_url": default_storage.url(logo) if logo else None,
+            "description": description,
+        }
+        for name, slug, logo, description in rows
+    )
+
+
+def rebuild_snapshot(site_id):
+    snapshot = build_snapshot(site_id)
+    cache.set(
+        SNAPSHOT_CACHE_KEY.format(site_id=site_id), snapshot, timeout=SNAPSHOT_TIMEOUT
+    )
+    return snapshot
+
+
+def rebuild_all_snapshots():
+    for site_id in Site.objects.values_list("pk", flat=True):
+        rebuild_snapshot(site_id)
+    logger.info("[Brands] Rebuilt the brand listing snapshots")
+
+
+def get_snapshot(site):
+    """Return the brand listing of `site`, zero queries once it is cached."""
+    snapshot = cache.get(SNAPSHOT_CACHE_KEY.format(site_id=site.pk))
+    if snapshot is None:
+        snapshot = rebuild_snapshot(site.pk)
+    return snapshot
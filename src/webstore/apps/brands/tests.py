@@ -1,3 +1,155 @@
-from django.test import TestCase
+import io
+import tempfile
 
-# Create your tests here.
+from django.contrib.sites.models import Site
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, transaction
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from PIL import Image
+
+from webstore.coordination import cache
+
+from .models import Brand
+from .snapshot import get_snapshot, rebuild_all_snapshots
+
+
+class BrandSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(domain="shop.test", name="shop")
+        cls.other = Site.objects.create(domain="other.test", name="other")
+        for name in ("Makita", "Bosch", "DeWalt"):
+            Brand.objects.create(name=name).sites.add(cls.site)
+        Brand.objects.create(name="Hidden", is_active=False).sites.add(cls.site)
+        Brand.objects.create(name="Elsewhere").sites.add(cls.other)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_snapshot_is_one_query_then_none(self):
+        with self.assertNumQueries(1):
+            snapshot = get_snapshot(self.site)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_snapshot(self.site), snapshot)
+
+        self.assertEqual(
+            [brand["name"] for brand in snapshot], ["Bosch", "DeWalt", "Makita"]
+        )
+        self.assertEqual(snapshot[0]["slug"], "bosch")
+        self.assertIsNone(snapshot[0]["logo_url"])
+
+    def test_snapshot_rebuilt_on_change(self):
+        get_snapshot(self.site)
+        with self.captureOnCommitCallbacks(execute=True):
+            Brand.objects.create(name="Einhell").sites.add(self.site)
+
+        with self.assertNumQueries(0):
+            names = [brand["name"] for brand in get_snapshot(self.site)]
+        self.assertIn("Einhell", names)
+
+    def test_one_rebuild_per_transaction(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for brand in Brand.objects.all():
+                brand.save()
+            Brand.objects.get(name="Bosch").sites.add(self.other)
+        self.assertEqual(callbacks.count(rebuild_all_snapshots), 1)
+
+    def test_rebuild_rescheduled_after_rollback(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    Brand.objects.get(name="Bosch").save()
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+            Brand.objects.get(name="Makita").save()
+        self.assertEqual(callbacks.count(rebuild_all_snapshots), 1)
+
+    def test_rebuild_all_snapshots(self):
+        rebuild_all_snapshots()
+        with self.assertNumQueries(0):
+            self.assertEqual(len(get_snapshot(self.other)), 1)
+
+
+@override_settings(ALLOWED_HOSTS=["shop.test"])
+class OpenGraphTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(name="Makita", meta_description="Drills")
+
+    def setUp(self):
+        cache.clear()
+
+    def render(self, obj):
+        site = {
+            "name": "Shop",
+            "og_site_name": "Shop",
+            "twitter_handle": "@shop",
+            "title": "Shop",
+            "description": "A shop",
+            "image": "http://shop.test/static/default.png",
+            "image_width": 1200,
+            "image_height": 630,
+        }
+        request = RequestFactory().get("/", HTTP_HOST="shop.test")
+        template = Template("{% load opengraph %}{% opengraph_tags obj %}")
+        return template.render(
+            Context({"request": request, "global_seo": site, "obj": obj})
+        )
+
+    def test_tags_of_an_object(self):
+        html = self.render(self.brand)
+        self.assertIn('<meta property="og:title" content="Makita">', html)
+        self.assertIn('<meta property="og:description" content="Drills">', html)
+        self.assertIn('<meta property="og:image:width" content="1200">', html)
+        self.assertIn('<meta name="twitter:site" content="@shop">', html)
+        self.assertIn(
+            '"item": "http://shop.test/brands/makita/"}]}</script>',
+            html,
+        )
+        # the site defaults without an object
+        self.assertIn('<meta property="og:title" content="Shop">', self.render(""))
+
+    def test_cached_per_version(self):
+        html = self.render(self.brand)
+        Brand.objects.filter(pk=self.brand.pk).update(name="<Bosch>")
+        self.assertEqual(self.render(Brand.objects.get(pk=self.brand.pk)), html)
+
+        brand = Brand.objects.get(pk=self.brand.pk)
+        brand.save()
+        html = self.render(brand)
+        self.assertIn('content="&lt;Bosch&gt;"', html)
+        self.assertIn('"name": "\\u003CBosch\\u003E"', html)
+
+    def test_image_dimensions_are_stored(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (40, 21)).save(buffer, "PNG")
+        with (
+            tempfile.TemporaryDirectory() as media,
+            override_settings(MEDIA_ROOT=media),
+        ):
+            self.brand.meta_image = SimpleUploadedFile("og.png", buffer.getvalue())
+            self.brand.save()
+            brand = Brand.objects.get(pk=self.brand.pk)
+            self.assertEqual(
+                (brand.meta_image_width, brand.meta_image_height), (40, 21)
+            )
+            html = self.render(brand)
+        self.assertIn('<meta property="og:image:width" content="40">', html)
+        self.assertIn('content="http://shop.test/media/seo/og', html)
+
+    def test_missing_image_file(self):
+        with (
+            tempfile.TemporaryDirectory() as media,
+            override_settings(MEDIA_ROOT=media),
+        ):
+            # stored before the dimensions, the file gone since
+            Brand.objects.filter(pk=self.brand.pk).update(meta_image="seo/gone.png")
+            (brand,) = Brand.objects.all()
+            brand.save()
+            brand.refresh_from_db()
+            self.assertEqual((brand.meta_image_width, brand.meta_image_height), (0, 0))
+            html = self.render(brand)
+        self.assertIn('content="http://shop.test/media/seo/gone.png"', html)
+        self.assertNotIn("og:image:width", html)
@@ -1,2 +1,9 @@
+from django.urls import path
+
+from .views import detail, index
+
 app_name = "brands"
-urlpatterns = []
+urlpatterns = [
+    path("", index, name="index"),
+    path("<slug:slug>/", detail, name="detail"),
+]
@@ -1,3 +1,27 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
 
-# Create your views here.
+from apps.catalog.listing import listing_from_request
+from apps.catalog.models import Product
+from webstore.streaming import render_stream
+
+from .models import Brand
+from .snapshot import get_snapshot
+
+
+def index(request):
+    return render_stream(
+        request,
+        template_name="brands/index.html",
+        context={"brands": get_snapshot(request.site)},
+    )
+
+
+def detail(request, slug):
+    brand = get_object_or_404(
+        Brand.objects.filter(sites=request.site, is_active=True), slug=slug
+    )
+    context = listing_from_request(
+        request, Product.objects.select_related("brand"), brand=brand.pk
+    )
+    context.update({"brand": brand, "seo": brand.get_seo(), "seo_object": brand})
+    return render_stream(request, template_name="brands/detail.html", context=context)
@@ -0,0 +1,23 @@
+from django.contrib import admin
+
+from .models import Category, Product
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug", "parent", "is_active")
+    list_filter = ("is_active", "sites")
+    search_fields = ("name", "slug")
+    prepopulated_fields = {"slug": ("name",)}
+    filter_horizontal = ("sites",)
+
+
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ("sku", "title", "brand", "category", "price", "stock", "is_active")
+    list_filter = ("is_active", "brand", "category")
+    list_select_related = ("brand", "category")
+    search_fields = ("sku", "title")
+    raw_id_fields = ("brand", "category")
+    # avoid COUNT(*) over the whole table on every changelist page
+    show_full_result_count = False
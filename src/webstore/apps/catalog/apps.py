@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+
+
+class CatalogConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.catalog"
+
+    def ready(self):
+        # invalidate the listing counts and facet indexes when products change
+        from . import signals  # noqa: F401
+
+    def warmup(self):
+        from django.contrib.sites.models import Site
+
+        from .facets import get_index
+
+        # maps the facet index files
+        for site_id in Site.objects.values_list("pk", flat=True):
+            get_index(site_id)
@@ -0,0 +1,352 @@
+"""
+In-process facet index of the catalog.
+
+Every facet value (brand, category, price band, attribute) owns a bitmap
+with one bit per product of the site, so facet counts and filter
+intersections are integer AND + popcount operations done in memory.
+
+The index of a site is written to a single file by `build_index()` (from a
+Celery task or the `build_facet_index` command) and read through `mmap` by
+the workers, which share the same page cache copy instead of holding one
+each. File layout, little endian:
+
+    header   magic, version, products, bitmap bytes, table bytes, generation
+    table    JSON list of the facet keys, in bitmap order
+    ids      one int64 product id per bit position
+    bitmaps  one fixed size bitmap per facet key
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from pathlib import Path
+from threading import Lock
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from apps.brands.models import Brand
+
+from .models import Category, Product
+
+logger = logging.getLogger("django")
+
+MAGIC = b"SGFX"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxIIIQ")
+
+# (lower, upper) bounds of the price bands, None means open ended
+PRICE_BANDS = ((0, 50), (50, 100), (100, 250), (250, 500), (500, 1000), (1000, None))
+
+# Above this many matches the selection is filtered in SQL instead of pk__in
+MAX_IDS = 2000
+
+# How often a worker checks if the index file was rebuilt, in seconds
+RELOAD_INTERVAL = 5
+
+
+def price_band(price):
+    for lower, upper in PRICE_BANDS:
+        if upper is None or price < upper:
+            return f"{lower}-{upper or ''}"
+    return None
+
+
+def facet_name(key):
+    """Return the facet of a key, "attr:color:red" belongs to "attr:color"."""
+    return key.rpartition(":")[0]
+
+
+def product_keys(brand_id, category_id, price, attributes):
+    """Return the facet keys a product contributes to."""
+    keys = [f"brand:{brand_id}", f"price:{price_band(price)}"]
+    if category_id:
+        keys.append(f"category:{category_id}")
+    for name, values in (attributes or {}).items():
+        if not isinstance(values, list):
+            values = [values]
+        keys.extend(f"attr:{name}:{value}" for value in values)
+    return keys
+
+
+def index_path(site_id):
+    return Path(settings.CATALOG_INDEX_ROOT, f"facets-{site_id}.idx")
+
+
+def build_index(site_id):
+    """Write the facet index file of a site, return the number of products."""
+    rows = (
+        Product.objects.filter(is_active=True, brand__sites=site_id)
+        .order_by("id")
+        .values_list("id", "brand_id", "category_id", "price", "attributes")
+        .distinct()
+    )
+
+    ids = array("q")
+    bitmaps = {}
+    for position, (pk, *values) in enumerate(rows.iterator(chunk_size=5000)):
+        ids.append(pk)
+        byte, bit = divmod(position, 8)
+        for key in product_keys(*values):
+            # bytearrays are filled in place, OR-ing Python ints would copy
+            # the whole bitmap for every product
+            bitmap = bitmaps.setdefault(key, bytearray())
+            if len(bitmap) <= byte:
+                bitmap.extend(bytes(byte + 1 - len(bitmap)))
+            bitmap[byte] |= 1 << bit
+
+    size = (len(ids) + 7) // 8
+    keys = sorted(bitmaps)
+    table = json.dumps(keys, separators=(",", ":")).encode()
+
+    path = index_path(site_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+        tmp.write(
+            HEADER.pack(MAGIC, VERSION, len(ids), size, len(table), time.time_ns())
+        )
+        tmp.write(table)
+        tmp.write(ids.tobytes())
+        for key in keys:
+            bitmap = bitmaps[key]
+            tmp.write(bitmap + bytes(size - len(bitmap)))
+    # readers keep their mapping of the old file until they reload
+    os.replace(tmp.name, path)
+
+    logger.info(f"[Facets] Site {site_id}: {len(ids)} products, {len(keys)} values")
+    return len(ids)
+
+
+class FacetIndex:
+    """Read-only view over the mmap'ed facet index of one site."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.size, self._bytes, table, self.generation = (
+            HEADER.unpack_from(self._mmap)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a facet index v{VERSION}")
+
+        offset = HEADER.size
+        self.keys = {
+            key: slot
+            for slot, key in enumerate(json.loads(self._mmap[offset : offset + table]))
+        }
+        self._ids = offset + table
+        self._bitmaps = self._ids + self.size * 8
+        self._view = memoryview(self._mmap)
+        self.all = (1 << self.size) - 1
+
+    def bitmap(self, key):
+        slot = self.keys.get(key)
+        if slot is None:
+            return 0
+        start = self._bitmaps + slot * self._bytes
+        return int.from_bytes(self._view[start : start + self._bytes], "little")
+
+    def match(self, selected, exclude=None):
+        """
+        Return the bitmap of the products matching `selected`, a mapping of
+        facet name to the keys picked in it: keys of one facet are OR-ed,
+        facets are AND-ed. `exclude` skips a facet (for its own counts).
+        """
+        bits = self.all
+        for facet, keys in selected.items():
+            if facet == exclude or not keys:
+                continue
+            union = 0
+            for key in keys:
+                union |= self.bitmap(key)
+            bits &= union
+        return bits
+
+    def facet_counts(self, selected=None, within=None):
+        """
+        Return `{facet: {key: count}}` for every facet value with products.
+
+        Counts are disjunctive: the values of a selected facet are counted
+        against the other selected facets only, so picking "brand:1" still
+        shows how many products "brand:2" would add. `within` is the bitmap
+        of the listing scope (a brand or a category).
+        """
+        selected = selected or {}
+        scope = self.all if within is None else within
+        base = self.match(selected) & scope
+        bases = {
+            facet: self.match(selected, exclude=facet) & scope for facet in selected
+        }
+
+        counts = {}
+        for key in self.keys:
+            facet = facet_name(key)
+            count = (self.bitmap(key) & bases.get(facet, base)).bit_count()
+            if count:
+                counts.setdefault(facet, {})[key] = count
+        return counts
+
+    def product_ids(self, bits, limit=None):
+        """Return the product ids of the bits set in `bits`, in id order."""
+        ids = []
+        while bits and (limit is None or len(ids) < limit):
+            low = bits & -bits
+            position = low.bit_length() - 1
+            start = self._ids + position * 8
+            ids.append(struct.unpack_from("<q", self._mmap, start)[0])
+            bits ^= low
+        return ids
+
+
+_indexes = {}
+_indexes_lock = Lock()
+
+
+def get_index(site_id):
+    """
+    Return the `FacetIndex` of a site, or None when it was never built.
+
+    The file is stat'ed at most every RELOAD_INTERVAL seconds and remapped
+    when a rebuild replaced it.
+    """
+    now = time.monotonic()
+    entry = _indexes.get(site_id)
+    if entry and now - entry[1] < RELOAD_INTERVAL:
+        return entry[0]
+
+    with _indexes_lock:
+        index = entry[0] if entry else None
+        path = index_path(site_id)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            _indexes[site_id] = (None, now)
+            return None
+
+        if index is None or stat.st_ino != index.stat.st_ino:
+            index = FacetIndex(path)
+        _indexes[site_id] = (index, now)
+        return index
+
+
+def key_filter(key):
+    """Translate a facet key to the equivalent ORM condition."""
+    facet, _, value = key.rpartition(":")
+    if facet == "brand":
+        return Q(brand_id=value)
+    if facet == "category":
+        return Q(category_id=value)
+    if facet == "price":
+        lower, _, upper = value.partition("-")
+        return Q(price__gte=lower, **({"price__lt": upper} if upper else {}))
+    # attr:<name>, multi-valued attributes only match on the index
+    return Q(**{f"attributes__{facet[5:]}": value})
+
+
+def valid_key(key):
+    """
+    Whether the facet key of the query string can become an ORM condition
+    (`key_filter`): the ids and prices clean with their field, like the
+    min_price/max_price parameters.
+    """
+    facet, _, value = key.rpartition(":")
+    try:
+        if facet in ("brand", "category"):
+            Product._meta.get_field(facet).to_python(value)
+        elif facet == "price":
+            lower, _, upper = value.partition("-")
+            price = Product._meta.get_field("price")
+            price.to_python(lower)
+            if upper:
+                price.to_python(upper)
+        elif facet.startswith("attr:"):
+            # a single JSON key, not a lookup path
+            name = facet[5:]
+            return bool(name) and "__" not in name
+        else:
+            return False
+    except ValidationError:
+        return False
+    return bool(value)
+
+
+def selected_facets(request):
+    """Group the valid `f` query string keys by facet, the others are dropped."""
+    selected = {}
+    for key in request.GET.getlist("f"):
+        if valid_key(key):
+            selected.setdefault(facet_name(key), []).append(key)
+    return selected
+
+
+def filter_queryset(queryset, selected, index=None, within=None):
+    """
+    Restrict `queryset` to the products matching the selected facets.
+
+    Small selections become a `pk__in` taken from the index bitmaps, bigger
+    ones (or a missing index) are translated to SQL conditions.
+    """
+    if not selected:
+        return queryset
+
+    if index is not None:
+        bits = index.match(selected)
+        if within is not None:
+            bits &= within
+        if bits.bit_count() <= MAX_IDS:
+            return queryset.filter(pk__in=index.product_ids(bits))
+
+    for keys in selected.values():
+        condition = Q()
+        for key in keys:
+            condition |= key_filter(key)
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+def facet_labels(keys):
+    """Return the display label of the facet keys, names for brands/categories."""
+    ids = {"brand": set(), "category": set()}
+    for key in keys:
+        facet, _, value = key.rpartition(":")
+        if facet in ids:
+            ids[facet].add(value)
+
+    labels = {key: key.rpartition(":")[2] for key in keys}
+    for facet, model in (("brand", Brand), ("category", Category)):
+        if ids[facet]:
+            for pk, name in model.objects.filter(pk__in=ids[facet]).values_list(
+                "pk", "name"
+            ):
+                labels[f"{facet}:{pk}"] = name
+    return labels
+
+
+def facet_context(index, selected, within, params):
+    """
+    Return the facets of a listing for the templates, a list of
+    `(facet, [(key, label, count, is_selected, querystring)])`.
+    """
+    counts = index.facet_counts(selected, within)
+    labels = facet_labels([key for values in counts.values() for key in values])
+    picked = {key for keys in selected.values() for key in keys}
+
+    facets = []
+    for facet in sorted(counts):
+        values = []
+        for key, count in sorted(counts[facet].items()):
+            toggled = params.copy()
+            keys = [k for k in params.getlist("f") if k != key]
+            toggled.setlist("f", keys if key in picked else [*keys, key])
+            values.append((key, labels[key], count, key in picked, toggled.urlencode()))
+        facets.append((facet, values))
+    return facets
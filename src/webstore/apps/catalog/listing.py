@@ -0,0 +1,236 @@
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from webstore import coordination
+
+from .facets import facet_context, filter_queryset, get_index, selected_facets
+from .models import Product
+
+# Sort orders offered on the listing pages. Every ordering ends with the
+# primary key so the seek position is unique, and each one is backed by a
+# composite (scope, sort column, id) index on Product.
+SORTS = {
+    "popularity": ("-popularity", "-id"),
+    "newest": ("-created", "-id"),
+    "price": ("price", "id"),
+    "-price": ("-price", "-id"),
+}
+DEFAULT_SORT = "popularity"
+
+PAGE_SIZE = 24
+
+# Counting stops here, bigger result sets are shown as "10000+"
+COUNT_LIMIT = 10000
+COUNT_TIMEOUT = 60 * 10
+# in the coordination cache, shared by the web workers and the Celery
+# processes (webstore.coordination): a bump in one reaches all of them
+COUNT_VERSION_KEY = "catalog:count:version"
+
+
+class InvalidCursor(ValueError):
+    """The cursor from the query string can't be decoded."""
+
+
+@dataclass(frozen=True)
+class Page:
+    items: list
+    sort: str
+    next_cursor: str = None
+    prev_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+
+def _field_name(ordering):
+    return ordering.lstrip("-")
+
+
+def encode_cursor(obj, ordering, direction):
+    values = [
+        Product._meta.get_field(_field_name(field)).value_to_string(obj)
+        for field in ordering
+    ]
+    raw = json.dumps([direction, *values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _seek_value(name, value):
+    # the sort columns are NOT NULL, a null (or out of range) value would only
+    # fail later, in seek_filter or the database
+    field = Product._meta.get_field(name)
+    value = field.to_python(value)
+    if value is None:
+        raise ValueError(name)
+    field.run_validators(value)
+    return value
+
+
+def decode_cursor(cursor, ordering):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        direction, *values = json.loads(raw)
+        if direction not in ("next", "prev") or len(values) != len(ordering):
+            raise ValueError(cursor)
+        return direction, [
+            _seek_value(_field_name(field), value)
+            for field, value in zip(ordering, values)
+        ]
+    except Exception as e:
+        raise InvalidCursor(cursor) from e
+
+
+def seek_filter(ordering, values, backwards=False):
+    """
+    Build the keyset condition "rows after `values` in `ordering`".
+
+    For `(a, b)` this is `a >= x AND (a > x OR b > y)` (operators flipped for
+    descending columns), which both SQLite and MariaDB turn into a range scan
+    on the composite index instead of the row-value OR expansion.
+    """
+    (first, second), (first_value, second_value) = ordering, values
+
+    def op(field, strict):
+        descending = field.startswith("-") != backwards
+        return f"{_field_name(field)}__{'l' if descending else 'g'}t{'' if strict else 'e'}"
+
+    return Q(**{op(first, False): first_value}) & (
+        Q(**{op(first, True): first_value}) | Q(**{op(second, True): second_value})
+    )
+
+
+def paginate(queryset, sort=DEFAULT_SORT, cursor=None, page_size=PAGE_SIZE):
+    """
+    Return one `Page` of `queryset` using keyset (seek) pagination.
+
+    The cost of a page is O(page_size) whatever its depth: the cursor holds
+    the sort values of the last (or first) row shown, so the database seeks
+    into the index instead of skipping OFFSET rows.
+    """
+    ordering = SORTS.get(sort) or SORTS[DEFAULT_SORT]
+    direction = "next"
+
+    if cursor:
+        direction, values = decode_cursor(cursor, ordering)
+        queryset = queryset.filter(
+            seek_filter(ordering, values, backwards=direction == "prev")
+        )
+
+    if direction == "prev":
+        queryset = queryset.order_by(
+            *(field[1:] if field.startswith("-") else f"-{field}" for field in ordering)
+        )
+    else:
+        queryset = queryset.order_by(*ordering)
+
+    rows = list(queryset[: page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == "prev":
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if has_more or direction == "prev":
+            next_cursor = encode_cursor(rows[-1], ordering, "next")
+        if cursor and (has_more or direction == "next"):
+            prev_cursor = encode_cursor(rows[0], ordering, "prev")
+
+    return Page(items=rows, sort=sort, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+def invalidate_counts():
+    """
+    Bump the version of every cached count, called when products change.
+
+    The version is in the coordination cache, shared by the processes, the
+    next listing of every process counts again.
+    """
+    try:
+        coordination.cache.incr(COUNT_VERSION_KEY)
+    except ValueError:
+        coordination.cache.set(COUNT_VERSION_KEY, 1, timeout=None)
+
+
+def estimate_count(queryset, **filters):
+    """
+    Return `(count, is_capped)` for a filter combination, cached per version.
+
+    `filters` identify the combination (scope, price range, ...) and build the
+    cache key, the count itself never reads more than COUNT_LIMIT + 1 rows.
+    """
+    version = coordination.cache.get(COUNT_VERSION_KEY, 0)
+    digest = hashlib.md5(
+        json.dumps(filters, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    key = f"catalog:count:{version}:{digest}"
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.order_by()[: COUNT_LIMIT + 1].count()
+        cache.set(key, count, timeout=COUNT_TIMEOUT)
+    return min(count, COUNT_LIMIT), count > COUNT_LIMIT
+
+
+def listing_from_request(request, queryset, **scope):
+    """
+    Apply the query string (sort, cursor, price range) to `queryset` and
+    return the template context of a product listing.
+    """
+    sort = request.GET.get("sort", DEFAULT_SORT)
+    if sort not in SORTS:
+        sort = DEFAULT_SORT
+
+    filters = dict(scope)
+    for param, lookup in (("min_price", "price__gte"), ("max_price", "price__lte")):
+        value = request.GET.get(param)
+        if value:
+            try:
+                filters[lookup] = Product._meta.get_field("price").to_python(value)
+            except ValidationError:
+                continue
+
+    queryset = queryset.filter(is_active=True, **filters)
+
+    # facet selections are resolved on the in-memory index when it's built
+    selected = selected_facets(request)
+    index = get_index(request.site.pk) if hasattr(request, "site") else None
+    within = None
+    if index is not None:
+        within = index.all
+        for name, value in scope.items():
+            within &= index.bitmap(f"{name}:{value}")
+    queryset = filter_queryset(queryset, selected, index, within)
+
+    try:
+        page = paginate(queryset, sort, request.GET.get("cursor"))
+    except InvalidCursor:
+        page = paginate(queryset, sort)
+
+    count, capped = estimate_count(
+        queryset, **filters, facets=sorted(request.GET.getlist("f"))
+    )
+    # the filters to keep on the sort and pager links
+    params = request.GET.copy()
+    for param in ("sort", "cursor"):
+        params.pop(param, None)
+    return {
+        "facets": facet_context(index, selected, within, params) if index else (),
+        "querystring": params.urlencode(),
+        "page": page,
+        "products": page.items,
+        "sorts": SORTS,
+        "count": count,
+        "count_capped": capped,
+    }
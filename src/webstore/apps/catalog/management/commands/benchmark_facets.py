@@ -0,0 +1,83 @@
+import random
+from statistics import median
+from time import perf_counter
+
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from apps.catalog.facets import facet_name, get_index, key_filter
+from apps.catalog.models import Product
+
+
+def _timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        timings.append((perf_counter() - start) * 1_000_000)
+    return median(timings)
+
+
+class Command(BaseCommand):
+    help = "Compare facet counts on the mmap'ed index with GROUP BY queries"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--site", type=int, help="defaults to the first site")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        site_id = options["site"] or Site.objects.order_by("pk").first().pk
+        index = get_index(site_id)
+        if index is None:
+            raise CommandError("No facet index, run build_facet_index first.")
+
+        rng = random.Random(options["seed"])
+        keys = list(index.keys)
+        facets = sorted({facet_name(key) for key in keys})
+        self.stdout.write(
+            self.style.NOTICE(
+                f"📊 Site {site_id}: {index.size} products, {len(keys)} facet values "
+                f"in {len(facets)} facets, {index.stat.st_size / 1024:.0f} KiB mapped"
+            )
+        )
+
+        # a category listing with one brand and one attribute value picked
+        category = rng.choice([k for k in keys if k.startswith("category:")])
+        selected = {"brand": [rng.choice([k for k in keys if k.startswith("brand:")])]}
+        attributes = [k for k in keys if k.startswith("attr:")]
+        if attributes:
+            picked = rng.choice(attributes)
+            selected[facet_name(picked)] = [picked]
+        within = index.bitmap(category)
+
+        memory = {
+            "intersection": _timed(
+                lambda: index.match(selected) & within, options["repeat"]
+            ),
+            "all facet counts": _timed(
+                lambda: index.facet_counts(selected, within), options["repeat"]
+            ),
+        }
+
+        queryset = Product.objects.filter(
+            is_active=True, brand__sites=site_id, category_id=category.split(":")[1]
+        )
+        for keys_ in selected.values():
+            queryset = queryset.filter(key_filter(keys_[0]))
+
+        def group_by():
+            for field in ("brand", "category"):
+                list(queryset.values(field).annotate(total=Count("id")).order_by())
+
+        sql = {
+            "intersection": _timed(lambda: queryset.count(), options["repeat"]),
+            "brand + category counts": _timed(group_by, options["repeat"]),
+        }
+
+        self.stdout.write(f"  selected: {category} + {selected}")
+        for name, micros in memory.items():
+            self.stdout.write(f"  index {name:<24} {micros:>10.1f} µs")
+        for name, micros in sql.items():
+            self.stdout.write(f"  SQL   {name:<24} {micros:>10.1f} µs")
@@ -0,0 +1,90 @@
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+
+from apps.catalog.listing import (
+    PAGE_SIZE,
+    SORTS,
+    encode_cursor,
+    paginate,
+    seek_filter,
+)
+from apps.catalog.models import Product
+
+
+def _timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        timings.append((perf_counter() - start) * 1000)
+    return median(timings)
+
+
+class Command(BaseCommand):
+    help = "Compare keyset and OFFSET pagination of the product listings at depth"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scope", choices=("brand", "category"), default="brand")
+        parser.add_argument("--sort", choices=tuple(SORTS), default="price")
+        parser.add_argument(
+            "--pages", default="1,10,100,1000", help="comma separated page numbers"
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--explain", action="store_true")
+
+    def handle(self, *args, **options):
+        scope, sort = options["scope"], options["sort"]
+        ordering = SORTS[sort]
+
+        # benchmark the biggest listing of the scope
+        biggest = (
+            Product.objects.filter(is_active=True)
+            .values(scope)
+            .annotate(total=Count("id"))
+            .order_by("-total")
+            .first()
+        )
+        if not biggest:
+            raise CommandError("No products, run generate_catalog first.")
+
+        queryset = Product.objects.filter(is_active=True, **{scope: biggest[scope]})
+        self.stdout.write(
+            self.style.NOTICE(
+                f"📊 {connection.vendor}: {scope}={biggest[scope]} "
+                f"({biggest['total']} products), sort={sort}, page size={PAGE_SIZE}"
+            )
+        )
+        self.stdout.write(f"  {'page':>6} {'keyset ms':>10} {'offset ms':>10}")
+
+        for number in (int(page) for page in options["pages"].split(",")):
+            offset = (number - 1) * PAGE_SIZE
+            if offset >= biggest["total"]:
+                self.stdout.write(f"  {number:>6} {'-':>10} {'-':>10} (past the end)")
+                continue
+
+            cursor = None
+            if offset:
+                # position the cursor on the last row of the previous page
+                anchor = queryset.order_by(*ordering)[offset - 1]
+                cursor = encode_cursor(anchor, ordering, "next")
+
+            keyset = _timed(
+                lambda: paginate(queryset, sort, cursor, PAGE_SIZE), options["repeat"]
+            )
+            offset_ms = _timed(
+                lambda: list(queryset.order_by(*ordering)[offset : offset + PAGE_SIZE]),
+                options["repeat"],
+            )
+            self.stdout.write(f"  {number:>6} {keyset:>10.2f} {offset_ms:>10.2f}")
+
+            if options["explain"] and cursor:
+                seek = seek_filter(
+                    ordering, [getattr(anchor, f.lstrip("-")) for f in ordering]
+                )
+                self.stdout.write(
+                    queryset.filter(seek).order_by(*ordering)[:PAGE_SIZE].explain()
+                )
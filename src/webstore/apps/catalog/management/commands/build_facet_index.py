@@ -0,0 +1,27 @@
+from time import perf_counter
+
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand
+
+from apps.catalog.facets import build_index, index_path
+
+
+class Command(BaseCommand):
+    help = "Build the facet index file of every site (or the given site ids)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("site_ids", nargs="*", type=int)
+
+    def handle(self, *args, **options):
+        site_ids = options["site_ids"] or Site.objects.values_list("pk", flat=True)
+        for site_id in site_ids:
+            start = perf_counter()
+            products = build_index(site_id)
+            path = index_path(site_id)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ Site {site_id}: {products} products, "
+                    f"{path.stat().st_size / 1024:.0f} KiB in "
+                    f"{perf_counter() - start:.2f}s ({path})"
+                )
+            )
@@ -0,0 +1,124 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from time import perf_counter
+
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.brands.models import Brand
+from apps.brands.snapshot import rebuild_all_snapshots
+from apps.catalog.facets import build_index
+from apps.catalog.listing import invalidate_counts
+from apps.catalog.models import Category, Product
+from apps.search.backends import get_backend
+
+NAMES = (
+    "Bormașină",
+    "Șurubelniță",
+    "Fierăstrău",
+    "Polizor unghiular",
+    "Mașină de tuns iarba",
+    "Drujbă",
+    "Aspirator",
+    "Compresor",
+    "Generator",
+    "Panou solar",
+    "Cască de protecție",
+    "Mănuși de protecție",
+    "Priză inteligentă",
+    "Bec inteligent",
+)
+QUALIFIERS = (
+    "cu acumulator",
+    "electric",
+    "profesional",
+    "compact",
+    "pentru grădină",
+    "reîncărcabil",
+    "cu fir",
+)
+
+ATTRIBUTES = {
+    "color": ("red", "blue", "green", "yellow", "black", "orange"),
+    "voltage": ("12V", "18V", "36V", "230V"),
+    "power": ("battery", "corded", "petrol", "manual"),
+}
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic catalog (brands, categories, products) for benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=100_000)
+        parser.add_argument("--brands", type=int, default=200)
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="BENCH", help="SKU/slug prefix")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        prefix = options["prefix"]
+        sites = list(Site.objects.all())
+        start = perf_counter()
+
+        with transaction.atomic():
+            brands = Brand.objects.bulk_create(
+                Brand(name=f"{prefix} Brand {i}", slug=f"{prefix.lower()}-brand-{i}")
+                for i in range(options["brands"])
+            )
+            categories = Category.objects.bulk_create(
+                Category(
+                    name=f"{prefix} Category {i}",
+                    slug=f"{prefix.lower()}-category-{i}",
+                )
+                for i in range(options["categories"])
+            )
+            for site in sites:
+                site.brands.add(*brands)
+                site.categories.add(*categories)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {len(brands)} brands and {len(categories)} categories created"
+            )
+        )
+
+        now = timezone.now()
+        total, batch_size = options["products"], options["batch_size"]
+        for offset in range(0, total, batch_size):
+            Product.objects.bulk_create(
+                (
+                    Product(
+                        brand=rng.choice(brands),
+                        category=rng.choice(categories),
+                        sku=f"{prefix}-{i:08d}",
+                        title=f"{rng.choice(NAMES)} {rng.choice(QUALIFIERS)} {i}",
+                        price=Decimal(rng.randrange(100, 1_000_000)) / 100,
+                        popularity=int(rng.paretovariate(1.2)),
+                        stock=rng.randrange(0, 500),
+                        attributes={
+                            name: rng.choice(values)
+                            for name, values in ATTRIBUTES.items()
+                        },
+                        created=now - timedelta(minutes=rng.randrange(0, 525_600)),
+                    )
+                    for i in range(offset, min(offset + batch_size, total))
+                ),
+                batch_size=batch_size,
+            )
+            self.stdout.write(f"  {min(offset + batch_size, total)}/{total} products")
+
+        # bulk_create skips the signals, refresh the derived data once
+        invalidate_counts()
+        rebuild_all_snapshots()
+        for site in sites:
+            build_index(site.pk)
+        get_backend().rebuild()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Catalog generated in {perf_counter() - start:.1f}s")
+        )
@@ -0,0 +1,197 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:13
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("brands", "0001_initial"),
+        ("sites", "0002_alter_domain_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Category",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "meta_title",
+                    models.CharField(
+                        blank=True, max_length=255, verbose_name="Meta Title"
+                    ),
+                ),
+                (
+                    "meta_description",
+                    models.TextField(
+                        blank=True, max_length=300, verbose_name="Meta Description"
+                    ),
+                ),
+                (
+                    "meta_image",
+                    models.ImageField(
+                        blank=True,
+                        null=True,
+                        upload_to="seo/",
+                        verbose_name="Meta Image (OG/Twitter)",
+                    ),
+                ),
+                ("name", models.CharField(max_length=120)),
+                ("slug", models.SlugField(blank=True, db_index=False, max_length=140)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                (
+                    "parent",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="children",
+                        to="catalog.category",
+                    ),
+                ),
+                (
+                    "sites",
+                    models.ManyToManyField(
+                        blank=True, related_name="categories", to="sites.site"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Category",
+                "verbose_name_plural": "Categories",
+                "db_table": "categories",
+                "ordering": ("name",),
+            },
+        ),
+        migrations.CreateModel(
+            name="Product",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "meta_title",
+                    models.CharField(
+                        blank=True, max_length=255, verbose_name="Meta Title"
+                    ),
+                ),
+                (
+                    "meta_description",
+                    models.TextField(
+                        blank=True, max_length=300, verbose_name="Meta Description"
+                    ),
+                ),
+                (
+                    "meta_image",
+                    models.ImageField(
+                        blank=True,
+                        null=True,
+                        upload_to="seo/",
+                        verbose_name="Meta Image (OG/Twitter)",
+                    ),
+                ),
+                ("sku", models.CharField(max_length=64)),
+                ("title", models.CharField(max_length=255)),
+                ("price", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("popularity", models.PositiveIntegerField(default=0)),
+                ("stock", models.IntegerField(default=0)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                (
+                    "brand",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="products",
+                        to="brands.brand",
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="products",
+                        to="catalog.category",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Product",
+                "verbose_name_plural": "Products",
+                "db_table": "products",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="category",
+            constraint=models.UniqueConstraint(
+                fields=("slug",), name="categories_slug_unique"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["brand", "price", "id"], name="products_brand_price"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["brand", "-created", "-id"], name="products_brand_newest"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["brand", "-popularity", "-id"], name="products_brand_popular"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["category", "price", "id"], name="products_category_price"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["category", "-created", "-id"], name="products_category_newest"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["category", "-popularity", "-id"],
+                name="products_category_popular",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="product",
+            constraint=models.UniqueConstraint(
+                fields=("sku",), name="products_sku_unique"
+            ),
+        ),
+    ]
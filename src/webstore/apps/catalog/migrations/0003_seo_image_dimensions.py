@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:30
+
+from django.core.files.images import get_image_dimensions
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def read_dimensions(model):
+    # the images stored before the dimension fields, 0 for the missing or
+    # unreadable files (SEOMixin.get_seo leaves them out)
+    rows = model.objects.exclude(meta_image="").exclude(meta_image=None)
+    for pk, name in rows.values_list("pk", "meta_image"):
+        try:
+            with default_storage.open(name) as image:
+                width, height = get_image_dimensions(image)
+        except OSError:
+            width = height = None
+        model.objects.filter(pk=pk).update(
+            meta_image_width=width or 0, meta_image_height=height or 0
+        )
+
+
+def read_image_dimensions(apps, schema_editor):
+    for app_label, model_name in (
+        ("catalog", "Category"),
+        ("catalog", "Product"),
+    ):
+        read_dimensions(apps.get_model(app_label, model_name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0002_product_attributes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="meta_image_height",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="meta_image_width",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="meta_image_height",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="meta_image_width",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name="category",
+            name="meta_image",
+            field=models.ImageField(
+                blank=True,
+                height_field="meta_image_height",
+                null=True,
+                upload_to="seo/",
+                verbose_name="Meta Image (OG/Twitter)",
+                width_field="meta_image_width",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="meta_image",
+            field=models.ImageField(
+                blank=True,
+                height_field="meta_image_height",
+                null=True,
+                upload_to="seo/",
+                verbose_name="Meta Image (OG/Twitter)",
+                width_field="meta_image_width",
+            ),
+        ),
+        migrations.RunPython(read_image_dimensions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0003_seo_image_dimensions"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="category",
+            name="meta_image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                upload_to="seo/",
+                verbose_name="Meta Image (OG/Twitter)",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="meta_image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                upload_to="seo/",
+                verbose_name="Meta Image (OG/Twitter)",
+            ),
+        ),
+    ]
@@ -0,0 +1,111 @@
+from django.contrib.sites.models import Site
+from django.db import models
+from django.urls import reverse
+from django.utils import timezone
+from slugify import slugify
+
+from apps.brands.models import Brand
+from apps.siteSettings.models import SEOMixin
+
+
+class Category(SEOMixin):
+    name = models.CharField(max_length=120)
+    slug = models.SlugField(max_length=140, db_index=False, blank=True)
+    parent = models.ForeignKey(
+        "self", on_delete=models.PROTECT, null=True, blank=True, related_name="children"
+    )
+    sites = models.ManyToManyField(Site, related_name="categories", blank=True)
+    is_active = models.BooleanField(default=True)
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "categories"
+        verbose_name = "Category"
+        verbose_name_plural = "Categories"
+        ordering = ("name",)
+        constraints = [
+            models.UniqueConstraint(fields=["slug"], name="categories_slug_unique"),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = slugify(self.name)
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        return reverse("catalog:category", kwargs={"slug": self.slug})
+
+    def get_breadcrumbs(self):
+        # a query per parent, the tags are cached
+        category, trail = self, []
+        while category is not None:
+            trail.append((category.name, category.get_absolute_url()))
+            category = category.parent
+        return trail[::-1]
+
+
+class Product(SEOMixin):
+    # the composite indexes below start with these columns, no need for
+    # the single column indexes Django creates for foreign keys
+    brand = models.ForeignKey(
+        Brand, on_delete=models.PROTECT, related_name="products", db_index=False
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.PROTECT,
+        related_name="products",
+        null=True,
+        blank=True,
+        db_index=False,
+    )
+    sku = models.CharField(max_length=64)
+    title = models.CharField(max_length=255)
+    price = models.DecimalField(max_digits=12, decimal_places=2)
+    popularity = models.PositiveIntegerField(default=0)
+    stock = models.IntegerField(default=0)
+    # facet attributes, {"color": "red", "voltage": ["18V", "36V"]}
+    attributes = models.JSONField(default=dict, blank=True)
+    is_active = models.BooleanField(default=True)
+    created = models.DateTimeField(default=timezone.now)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "products"
+        verbose_name = "Product"
+        verbose_name_plural = "Products"
+        constraints = [
+            models.UniqueConstraint(fields=["sku"], name="products_sku_unique"),
+        ]
+        # one index per (listing scope, sort order), see apps.catalog.listing.SORTS;
+        # is_active stays out of them, Django renders `is_active=True` as a bare
+        # boolean column which can't be used as an index equality
+        indexes = [
+            models.Index(fields=["brand", "price", "id"], name="products_brand_price"),
+            models.Index(
+                fields=["brand", "-created", "-id"],
+                name="products_brand_newest",
+            ),
+            models.Index(
+                fields=["brand", "-popularity", "-id"],
+                name="products_brand_popular",
+            ),
+            models.Index(
+                fields=["category", "price", "id"],
+                name="products_category_price",
+            ),
+            models.Index(
+                fields=["category", "-created", "-id"],
+                name="products_category_newest",
+            ),
+            models.Index(
+                fields=["category", "-popularity", "-id"],
+                name="products_category_popular",
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
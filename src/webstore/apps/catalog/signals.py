@@ -0,0 +1,32 @@
+from django.contrib.sites.models import Site
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.brands.models import Brand
+
+from .listing import invalidate_counts
+from .models import Product
+from .tasks import schedule_index_rebuild
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_changed(sender, instance, **kwargs):
+    invalidate_counts()
+
+    site_ids = list(
+        Site.objects.filter(brands=instance.brand_id).values_list("pk", flat=True)
+    )
+    transaction.on_commit(lambda: schedule_index_rebuild(site_ids))
+
+
+@receiver(m2m_changed, sender=Brand.sites.through)
+def brand_sites_changed(sender, instance, action, pk_set, **kwargs):
+    # the products of the brand enter or leave the index of those sites
+    if action in ("post_add", "post_remove", "post_clear"):
+        site_ids = pk_set if isinstance(instance, Brand) else [instance.pk]
+        if action == "post_clear" or not site_ids:
+            site_ids = Site.objects.values_list("pk", flat=True)
+        site_ids = list(site_ids)
+        transaction.on_commit(lambda: schedule_index_rebuild(site_ids))
@@ -0,0 +1,26 @@
+from celery import shared_task
+from django.conf import settings
+
+from webstore.coordination import cache
+
+from .facets import build_index
+
+PENDING_KEY = "catalog:facets:pending:{site_id}"
+
+
+def schedule_index_rebuild(site_ids):
+    """
+    Queue one facet index rebuild per site, the first change starts a
+    CATALOG_INDEX_DEBOUNCE window and the changes inside it share the rebuild.
+    """
+    delay = settings.CATALOG_INDEX_DEBOUNCE
+    for site_id in site_ids:
+        if cache.add(PENDING_KEY.format(site_id=site_id), True, timeout=delay):
+            rebuild_facet_index.apply_async((site_id,), countdown=delay)
+
+
+@shared_task(ignore_result=True)
+def rebuild_facet_index(site_id):
+    # changes made while building schedule the next rebuild
+    cache.delete(PENDING_KEY.format(site_id=site_id))
+    return build_index(site_id)
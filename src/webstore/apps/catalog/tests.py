@@ -0,0 +1,283 @@
+import base64
+import json
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import (
+    AsyncRequestFactory,
+    RequestFactory,
+    TestCase,
+    override_settings,
+)
+from django.utils import timezone
+
+from apps.brands.models import Brand
+from packages import opengraph
+from webstore import coordination
+
+from . import facets, views
+from .listing import SORTS, estimate_count, listing_from_request, paginate
+from .models import Category, Product
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(name="Makita")
+        now = timezone.now()
+        Product.objects.bulk_create(
+            Product(
+                brand=cls.brand,
+                sku=f"SKU-{i}",
+                title=f"Product {i}",
+                # duplicated sort values make sure the id tie-breaker works
+                price=Decimal(i % 7),
+                popularity=i % 5,
+                created=now - timedelta(hours=i % 3),
+            )
+            for i in range(50)
+        )
+        cls.queryset = Product.objects.filter(brand=cls.brand, is_active=True)
+
+    def setUp(self):
+        cache.clear()
+        coordination.cache.clear()
+
+    def walk(self, sort):
+        pages = [paginate(self.queryset, sort, page_size=7)]
+        while pages[-1].has_next:
+            pages.append(paginate(self.queryset, sort, pages[-1].next_cursor, 7))
+        return pages
+
+    def test_forward_walk_matches_ordering(self):
+        for sort, ordering in SORTS.items():
+            with self.subTest(sort=sort):
+                pages = self.walk(sort)
+                seen = [product.pk for page in pages for product in page.items]
+                expected = list(
+                    self.queryset.order_by(*ordering).values_list("pk", flat=True)
+                )
+                self.assertEqual(seen, expected)
+                self.assertFalse(pages[0].has_previous)
+
+    def test_backward_walk(self):
+        pages = self.walk("price")
+        page = pages[-1]
+        for expected in reversed(pages[:-1]):
+            page = paginate(self.queryset, "price", page.prev_cursor, 7)
+            self.assertEqual([p.pk for p in page.items], [p.pk for p in expected.items])
+        self.assertFalse(page.has_previous)
+
+    def test_invalid_cursor_shows_the_first_page(self):
+        request = RequestFactory().get("/")
+        first = listing_from_request(request, self.queryset)["page"]
+        for values in (["next", None, None], ["prev", "1", 2**70], ["next"], "x"):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            with self.subTest(values=values):
+                request = RequestFactory().get("/", {"cursor": cursor})
+                page = listing_from_request(request, self.queryset)["page"]
+                self.assertEqual(page.items, first.items)
+
+    def test_page_is_one_query(self):
+        cursor = paginate(self.queryset, "newest", page_size=7).next_cursor
+        with self.assertNumQueries(1):
+            paginate(self.queryset, "newest", cursor, 7)
+
+    def test_count_is_cached_per_filters(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(estimate_count(self.queryset, brand=1), (50, False))
+        with self.assertNumQueries(0):
+            estimate_count(self.queryset, brand=1)
+
+        # product changes bump the count version
+        Product.objects.filter(pk=self.queryset.first().pk).get().save()
+        with self.assertNumQueries(1):
+            estimate_count(self.queryset, brand=1)
+
+
+class FacetIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(domain="shop.test", name="shop")
+        cls.brands = [Brand.objects.create(name=name) for name in ("Bosch", "Stihl")]
+        cls.site.brands.add(*cls.brands)
+        cls.category = Category.objects.create(name="Drills")
+        Product.objects.bulk_create(
+            Product(
+                brand=cls.brands[i % 2],
+                category=cls.category if i % 3 else None,
+                sku=f"FX-{i}",
+                title=f"Product {i}",
+                price=Decimal(i * 20),
+                attributes={"color": ("red", "blue", "green")[i % 3]},
+            )
+            for i in range(30)
+        )
+        # not on the site, stays out of its index
+        hidden = Brand.objects.create(name="Hidden")
+        Product.objects.create(brand=hidden, sku="FX-H", title="Hidden", price=1)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(CATALOG_INDEX_ROOT=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        facets._indexes.clear()
+        facets.build_index(self.site.pk)
+        self.index = facets.get_index(self.site.pk)
+
+    def queryset(self):
+        return Product.objects.filter(is_active=True, brand__sites=self.site)
+
+    def test_bitmaps_match_the_database(self):
+        self.assertEqual(self.index.size, 30)
+        bosch = f"brand:{self.brands[0].pk}"
+        for key in (bosch, f"category:{self.category.pk}", "attr:color:red"):
+            with self.subTest(key=key):
+                expected = self.queryset().filter(facets.key_filter(key))
+                self.assertCountEqual(
+                    self.index.product_ids(self.index.bitmap(key)),
+                    expected.values_list("pk", flat=True),
+                )
+        self.assertEqual(self.index.bitmap("brand:0"), 0)
+
+    def test_counts_are_disjunctive(self):
+        bosch, stihl = (f"brand:{brand.pk}" for brand in self.brands)
+        selected = {"brand": [bosch], "attr:color": ["attr:color:red"]}
+        counts = self.index.facet_counts(selected)
+
+        # the other brand is counted as if it was added to the selection
+        self.assertEqual(counts["brand"], {bosch: 5, stihl: 5})
+        self.assertEqual(
+            counts["attr:color"],
+            {"attr:color:red": 5, "attr:color:blue": 5, "attr:color:green": 5},
+        )
+        self.assertEqual(sum(counts["price"].values()), 5)
+
+    def test_filter_queryset_matches_sql(self):
+        selected = {"attr:color": ["attr:color:red", "attr:color:blue"]}
+        within = self.index.bitmap(f"category:{self.category.pk}")
+        with self.assertNumQueries(0):
+            from_index = facets.filter_queryset(
+                self.queryset(), selected, self.index, within
+            )
+        from_sql = facets.filter_queryset(
+            self.queryset().filter(category=self.category), selected
+        )
+        self.assertCountEqual(from_index, from_sql)
+        self.assertEqual(len(from_sql), 10)
+
+    def test_rebuilt_file_is_remapped(self):
+        Product.objects.filter(sku="FX-0").update(is_active=False)
+        facets.build_index(self.site.pk)
+        # still inside the reload interval
+        self.assertIs(facets.get_index(self.site.pk), self.index)
+
+        facets._indexes[self.site.pk] = (self.index, 0)
+        index = facets.get_index(self.site.pk)
+        self.assertIsNot(index, self.index)
+        self.assertEqual(index.size, 29)
+
+    def test_product_changes_schedule_a_rebuild(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Product.objects.get(sku="FX-1").save()
+        modules = [callback.__module__ for callback in callbacks]
+        self.assertEqual(modules.count("apps.catalog.signals"), 1)
+
+    def test_listing_applies_and_lists_facets(self):
+        request = RequestFactory().get("/", {"f": "attr:color:blue"})
+        request.site = self.site
+        context = listing_from_request(
+            request, Product.objects.all(), category=self.category.pk
+        )
+        self.assertEqual(len(context["products"]), 10)
+        facet_names = [facet for facet, values in context["facets"]]
+        self.assertIn("attr:color", facet_names)
+
+    def test_malformed_keys_are_dropped(self):
+        keys = [
+            "brand:abc",
+            "category:",
+            "price:abc-x",
+            "price:10-x",
+            "attr:color__contains:r",
+            "attr::red",
+            "color:red",
+            "price:0-50",
+            "attr:color:red",
+        ]
+        request = RequestFactory().get("/", {"f": keys})
+        selected = facets.selected_facets(request)
+        self.assertEqual(
+            selected, {"price": ["price:0-50"], "attr:color": ["attr:color:red"]}
+        )
+        # the SQL path (no index or too many ids)
+        self.assertEqual(len(facets.filter_queryset(self.queryset(), selected)), 1)
+
+
+class StockTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(domain="shop.test", name="shop")
+        bosch = Brand.objects.create(name="Bosch")
+        bosch.sites.add(cls.site)
+        hidden = Brand.objects.create(name="Hidden")
+        for sku, brand, stock, active in (
+            ("ST-1", bosch, 4, True),
+            ("ST-2", bosch, 0, True),
+            ("ST-3", bosch, 9, False),
+            ("ST-4", hidden, 7, True),
+        ):
+            Product.objects.create(
+                brand=brand, sku=sku, title=sku, price=1, stock=stock, is_active=active
+            )
+
+    async def test_stock_of_the_site_products(self):
+        request = AsyncRequestFactory().get(
+            "/", {"sku": ["ST-1", "ST-2", "ST-3", "ST-4", "ST-X"]}
+        )
+        request.site = self.site
+        response = await views.stock(request)
+        self.assertEqual(
+            json.loads(response.content), {"stock": {"ST-1": 4, "ST-2": 0}}
+        )
+
+    @override_settings(STOCK_LOOKUP_LIMIT=1)
+    async def test_limited_skus(self):
+        request = AsyncRequestFactory().get("/", {"sku": ["ST-2", "ST-1"]})
+        request.site = self.site
+        response = await views.stock(request)
+        self.assertEqual(json.loads(response.content), {"stock": {"ST-2": 0}})
+
+
+class StructuredDataTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        brand = Brand.objects.create(name="Bosch")
+        cls.product = Product.objects.create(
+            brand=brand, sku="SD-1", title="Drill", price=Decimal("99.5"), stock=0
+        )
+        tools = Category.objects.create(name="Tools")
+        cls.category = Category.objects.create(name="Drills", parent=tools)
+
+    def test_product(self):
+        data = opengraph.product(self.product, "https://shop.test/p/", "RON")
+        self.assertEqual(data["@type"], "Product")
+        self.assertEqual(data["brand"]["name"], "Bosch")
+        self.assertEqual(data["offers"]["price"], "99.50")
+        self.assertEqual(
+            data["offers"]["availability"], "https://schema.org/OutOfStock"
+        )
+        self.assertNotIn("image", data)
+
+    def test_category_breadcrumbs(self):
+        self.assertEqual(
+            self.category.get_breadcrumbs(),
+            [("Tools", "/catalog/tools/"), ("Drills", "/catalog/drills/")],
+        )
+        data = opengraph.breadcrumb_list([("Shop", "https://shop.test/")])
+        self.assertEqual(data["itemListElement"][0]["position"], 1)
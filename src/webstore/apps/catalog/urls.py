@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import category
+
+app_name = "catalog"
+urlpatterns = [
+    path("<slug:slug>/", category, name="category"),
+]
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.cache import cache_control
+
+from webstore.streaming import render_stream
+
+from .listing import listing_from_request
+from .models import Category, Product
+
+
+def category(request, slug):
+    category = get_object_or_404(
+        Category.objects.filter(sites=request.site, is_active=True), slug=slug
+    )
+    context = listing_from_request(
+        request, Product.objects.select_related("brand"), category=category.pk
+    )
+    context.update(
+        {"category": category, "seo": category.get_seo(), "seo_object": category}
+    )
+    return render_stream(
+        request, template_name="catalog/category.html", context=context
+    )
+
+
+@cache_control(public=True, max_age=10)
+async def stock(request):
+    """Stock of the products of the site, `?sku=...&sku=...`."""
+    skus = request.GET.getlist("sku")[: settings.STOCK_LOOKUP_LIMIT]
+    stock = {
+        sku: quantity
+        async for sku, quantity in Product.objects.filter(
+            sku__in=skus, is_active=True, brand__sites=request.site
+        ).values_list("sku", "stock")
+    }
+    return JsonResponse({"stock": stock})
@@ -1,7 +1,7 @@
-from django.shortcuts import render
+from webstore.streaming import render_stream
 
 
 # Create your views here.
 def index(request):
 
-    return render(request, template_name="frontpage/index.html", context={})
+    return render_stream(request, template_name="frontpage/index.html", context={})
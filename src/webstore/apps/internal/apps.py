@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class InternalConfig(AppConfig):
     name = "apps.internal"
+
+    def ready(self):
+        from . import checks  # noqa: F401
+        from webstore.context_processors.settings import build_exported_settings
+
+        # validate SETTINGS_EXPORT at boot and share one immutable context
+        build_exported_settings()
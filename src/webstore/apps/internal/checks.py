@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# caches that aren't shared by the processes
+PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    The versions and snapshots in the coordination cache (and the fragments
+    of the default one) must reach every worker and the Celery processes: a
+    per-process cache is an error out of the development server and the
+    tests.
+    """
+    if settings.DEBUG or settings.TESTING:
+        return []
+    errors = []
+    for alias in ("default", "coordination"):
+        backend = settings.CACHES[alias]["BACKEND"]
+        if backend in PROCESS_CACHES:
+            errors.append(
+                Error(
+                    f"The {alias} cache ({backend}) isn't shared by the processes.",
+                    hint="Use the database or Redis cache.",
+                    id="internal.E001",
+                )
+            )
+    return errors
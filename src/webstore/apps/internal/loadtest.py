@@ -0,0 +1,88 @@
+"""
+A small HTTP/1.1 load generator: `concurrency` keep-alive connections, each
+sending its next request as soon as the previous response is read, for
+`duration` seconds. It runs on asyncio in the calling process, start it on
+another core than the server when comparing servers.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from itertools import cycle
+from time import perf_counter
+
+
+@dataclass
+class LoadResult:
+    duration: float
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def throughput(self):
+        return len(self.latencies) / self.duration
+
+    def percentile(self, percent):
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+
+async def _read_response(reader):
+    """Read one response, return its status code."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = dict(
+        (name.strip().lower(), value.strip())
+        for name, _, value in (line.partition(":") for line in lines[1:] if line)
+    )
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while size := int((await reader.readuntil(b"\r\n")).split(b";")[0], 16):
+            await reader.readexactly(size + 2)
+        await reader.readuntil(b"\r\n")
+    return status, headers.get("connection") == "close"
+
+
+async def _connection(address, requests, deadline, result):
+    reader = writer = None
+    while perf_counter() < deadline:
+        if writer is None:
+            reader, writer = await asyncio.open_connection(*address)
+        request = next(requests)
+        start = perf_counter()
+        try:
+            writer.write(request)
+            status, close = await _read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            result.errors += 1
+            close = True
+        else:
+            if status == 200:
+                result.latencies.append(perf_counter() - start)
+            else:
+                result.errors += 1
+        if close:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _load(address, paths, host, concurrency, duration):
+    requests = cycle(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode() for path in paths
+    )
+    result = LoadResult(duration)
+    deadline = perf_counter() + duration
+    await asyncio.gather(
+        *(_connection(address, requests, deadline, result) for _ in range(concurrency))
+    )
+    return result
+
+
+def load(address, paths, host="localhost", concurrency=32, duration=10):
+    """Send GET `paths` (in turn) to `address` and return a `LoadResult`."""
+    return asyncio.run(_load(address, paths, host, concurrency, duration))
@@ -0,0 +1,104 @@
+"""
+Batched email delivery through Celery.
+
+`BatchedEmailBackend` groups the outgoing messages by recipient domain into
+chunks of CELERY_EMAIL_CHUNK_SIZE, one Celery task per chunk. The workers
+deliver through a SMTP connection kept open across tasks (checked with a
+NOOP when it sat idle) and only the messages that failed are retried.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from time import monotonic
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from djcelery_email import conf  # noqa: F401, the CELERY_EMAIL_* defaults
+from djcelery_email.utils import chunked, email_to_dict
+
+logger = logging.getLogger("django")
+
+# a connection idle for longer is checked with NOOP before being reused
+KEEPALIVE_CHECK = 30
+
+
+def recipient_domain(message):
+    recipients = [*message["to"], *message["cc"], *message["bcc"]]
+    if not recipients:
+        return ""
+    return recipients[0].rpartition("@")[2].strip("> ").lower()
+
+
+class BatchedEmailBackend(BaseEmailBackend):
+    def __init__(self, fail_silently=False, **kwargs):
+        super().__init__(fail_silently)
+        self.init_kwargs = kwargs
+
+    @staticmethod
+    def batches(email_messages):
+        """Serialized messages, in chunks sharing the recipient domain."""
+        domains = defaultdict(list)
+        for message in email_messages:
+            message = email_to_dict(message)
+            domains[recipient_domain(message)].append(message)
+        for messages in domains.values():
+            yield from chunked(messages, settings.CELERY_EMAIL_CHUNK_SIZE)
+
+    def send_messages(self, email_messages):
+        from .tasks import send_email_batch
+
+        queued = 0
+        for chunk in self.batches(email_messages):
+            send_email_batch.delay(chunk, self.init_kwargs)
+            queued += len(chunk)
+        return queued
+
+
+_local = threading.local()
+
+
+def get_worker_connection(backend_kwargs=None):
+    """
+    Return the SMTP connection of the worker (thread), opened on first use
+    and reused by the following tasks.
+    """
+    backend_kwargs = backend_kwargs or {}
+    connection = getattr(_local, "connection", None)
+    if connection is not None and _local.kwargs != backend_kwargs:
+        close_worker_connection()
+        connection = None
+
+    if connection is None:
+        connection = get_connection(
+            backend=settings.CELERY_EMAIL_BACKEND, **backend_kwargs
+        )
+        _local.connection, _local.kwargs = connection, backend_kwargs
+    elif monotonic() - _local.used > KEEPALIVE_CHECK and not _is_alive(connection):
+        connection.close()
+
+    # no-op when the connection is already open
+    connection.open()
+    _local.used = monotonic()
+    return connection
+
+
+def _is_alive(connection):
+    smtp = getattr(connection, "connection", None)
+    if smtp is None:
+        return True
+    try:
+        return smtp.noop()[0] == 250
+    except Exception:
+        return False
+
+
+def close_worker_connection(**kwargs):
+    connection = getattr(_local, "connection", None)
+    _local.connection = None
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            logger.exception("[Mail] Closing the SMTP connection failed")
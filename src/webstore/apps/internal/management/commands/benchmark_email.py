@@ -0,0 +1,108 @@
+import socket
+import threading
+from time import perf_counter, sleep
+
+from aiosmtpd.controller import Controller
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+
+from apps.internal.mail import BatchedEmailBackend, close_worker_connection
+from apps.internal.tasks import send_email_batch
+
+
+class CountingHandler:
+    """aiosmtpd handler counting the SMTP sessions and delivered messages."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.sessions = 0
+        self.messages = 0
+        self.lock = threading.Lock()
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        # the TCP/TLS/AUTH handshake cost of a real server
+        sleep(self.latency)
+        session.host_name = hostname
+        with self.lock:
+            self.sessions += 1
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        with self.lock:
+            self.messages += 1
+        return "250 Message accepted for delivery"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Send messages to a local aiosmtpd server with a connection per message "
+        "(the previous CeleryEmailBackend with CHUNK_SIZE=1) and batched on a "
+        "persistent worker connection, report messages/s and SMTP sessions"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=1000)
+        parser.add_argument("--domains", type=int, default=5)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=5,
+            help="simulated handshake latency per SMTP session, in ms",
+        )
+
+    def handle(self, *args, **options):
+        messages = [
+            EmailMessage(
+                f"Order #{i}",
+                "Thank you for your order.",
+                "shop@localhost",
+                [f"customer{i}@domain{i % options['domains']}.test"],
+            )
+            for i in range(options["messages"])
+        ]
+        handler = CountingHandler(options["latency"] / 1000)
+        controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+        controller.start()
+        backend_kwargs = {
+            "host": controller.hostname,
+            "port": controller.port,
+            "username": "",
+            "password": "",
+            "use_tls": False,
+            "use_ssl": False,
+        }
+        try:
+            for name, send in (
+                ("per message", self.per_message),
+                ("batched", self.batched),
+            ):
+                handler.sessions = handler.messages = 0
+                start = perf_counter()
+                send(messages, backend_kwargs)
+                elapsed = perf_counter() - start
+                self.stdout.write(
+                    f"  {name:<12} {handler.messages / elapsed:>8.0f} msgs/s  "
+                    f"{handler.messages:>6} delivered  "
+                    f"{handler.sessions:>5} SMTP sessions"
+                )
+        finally:
+            controller.stop()
+
+    def per_message(self, messages, backend_kwargs):
+        connection = get_connection(
+            "django.core.mail.backends.smtp.EmailBackend", **backend_kwargs
+        )
+        for message in messages:
+            connection.send_messages([message])
+
+    def batched(self, messages, backend_kwargs):
+        # runs the tasks inline, the worker connection outlives each of them
+        for chunk in BatchedEmailBackend.batches(messages):
+            send_email_batch(chunk, backend_kwargs)
+        close_worker_connection()
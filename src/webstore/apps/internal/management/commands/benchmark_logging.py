@@ -0,0 +1,106 @@
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from time import perf_counter, sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from webstore.logs import QueueListenerHandler
+
+
+class SlowEmailHandler(logging.Handler):
+    """Stands in for AdminEmailHandler, one SMTP round trip per record."""
+
+    def __init__(self, latency):
+        super().__init__(logging.ERROR)
+        self.latency = latency
+
+    def emit(self, record):
+        sleep(self.latency)
+
+
+def _handlers(directory, latency):
+    formatter = logging.Formatter(
+        settings.LOGGING["formatters"]["verbose"]["format"],
+        settings.LOGGING["formatters"]["verbose"]["datefmt"],
+    )
+    logfile = logging.FileHandler(Path(directory, "benchmark.log"))
+    logfile.setFormatter(formatter)
+    return [logfile, SlowEmailHandler(latency)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time simulated requests logging like the views do, with the handlers "
+        "called inline and through the QueueListenerHandler"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument(
+            "--logs", type=int, default=3, help="info records per request"
+        )
+        parser.add_argument(
+            "--errors", type=float, default=0.01, help="share of requests erroring"
+        )
+        parser.add_argument(
+            "--smtp-latency", type=float, default=50, help="per admin email, in ms"
+        )
+
+    def handle(self, *args, **options):
+        latency = options["smtp_latency"] / 1000
+        with tempfile.TemporaryDirectory() as directory:
+            sync = _handlers(directory, latency)
+            queued = QueueListenerHandler(_handlers(directory, latency))
+            for name, handlers in (("inline", sync), ("queued", [queued])):
+                logger = logging.getLogger(f"benchmark.{name}")
+                logger.propagate = False
+                logger.setLevel(logging.DEBUG)
+                for handler in handlers:
+                    logger.addHandler(handler)
+                timings = self.run(logger, options)
+                timings.sort()
+                self.stdout.write(
+                    f"  {name:<7} p50 {timings[len(timings) // 2]:.3f} ms  "
+                    f"p99 {timings[int(len(timings) * 0.99)]:.3f} ms  "
+                    f"max {timings[-1]:.3f} ms"
+                )
+                for handler in handlers:
+                    logger.removeHandler(handler)
+            queued.stop()
+            for handler in [*sync, *queued.handlers]:
+                handler.close()
+
+    def run(self, logger, options):
+        timings = []
+        lock = threading.Lock()
+        per_thread = options["requests"] // options["threads"]
+        every = int(1 / options["errors"]) if options["errors"] else 0
+
+        def worker(number):
+            local = []
+            for i in range(per_thread):
+                start = perf_counter()
+                for j in range(options["logs"]):
+                    logger.info("[Benchmark] request %s step %s", i, j)
+                if every and (i + number) % every == 0:
+                    try:
+                        raise ValueError(i)
+                    except ValueError:
+                        logger.exception("[Benchmark] request %s failed", i)
+                local.append((perf_counter() - start) * 1000)
+            with lock:
+                timings.extend(local)
+
+        threads = [
+            threading.Thread(target=worker, args=(number,))
+            for number in range(options["threads"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return timings
@@ -0,0 +1,157 @@
+import random
+import tempfile
+import threading
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.db.utils import OperationalError
+
+ROWS = 20_000
+
+
+def _profiles(directory):
+    """The stock connection settings against the `default` profile."""
+    tuned = settings.DATABASES["default"]
+    stock = {
+        key: value
+        for key, value in tuned.items()
+        if key not in ("OPTIONS", "CONN_MAX_AGE", "CONN_HEALTH_CHECKS")
+    }
+    return {
+        "stock": {**stock, "NAME": str(Path(directory, "stock.sqlite3"))},
+        "tuned": {**tuned, "NAME": str(Path(directory, "tuned.sqlite3"))},
+    }
+
+
+def _connect(settings_dict, alias):
+    wrapper = DatabaseWrapper(
+        {
+            "OPTIONS": {},
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": False,
+            "AUTOCOMMIT": True,
+            "ATOMIC_REQUESTS": False,
+            "TIME_ZONE": None,
+            **settings_dict,
+        },
+        alias=alias,
+    )
+    wrapper.ensure_connection()
+    return wrapper
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer an SQLite file from many threads (like gunicorn --threads) with "
+        "the stock and the tuned connection profile, report throughput and "
+        "'database is locked' errors"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument("--writes", type=float, default=0.1, help="write ratio")
+        parser.add_argument(
+            "--reconnect",
+            action="store_true",
+            help="open a connection per request, like CONN_MAX_AGE=0",
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            for name, settings_dict in _profiles(directory).items():
+                self.prepare(settings_dict)
+                stats = self.run(settings_dict, options)
+                seconds = options["seconds"]
+                self.stdout.write(
+                    f"  {name:<6} reads {stats['reads'] / seconds:>8.0f}/s  "
+                    f"writes {stats['writes'] / seconds:>7.0f}/s  "
+                    f"locked {stats['locked']:>5}  "
+                    f"p99 write {stats['p99']:.1f} ms"
+                )
+
+    def prepare(self, settings_dict):
+        wrapper = _connect(settings_dict, "prepare")
+        with wrapper.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE stock (id INTEGER PRIMARY KEY, quantity INTEGER, "
+                "title TEXT)"
+            )
+            cursor.executemany(
+                "INSERT INTO stock (quantity, title) VALUES (%s, %s)",
+                [(i % 100, f"product {i}") for i in range(ROWS)],
+            )
+        wrapper.close()
+
+    def run(self, settings_dict, options):
+        stats = {"reads": 0, "writes": 0, "locked": 0, "p99": 0.0}
+        write_timings = []
+        lock = threading.Lock()
+        deadline = perf_counter() + options["seconds"]
+        mode = settings_dict.get("OPTIONS", {}).get("transaction_mode", "DEFERRED")
+
+        def worker(seed):
+            rng = random.Random(seed)
+            reads = writes = locked = 0
+            timings = []
+            wrapper = _connect(settings_dict, f"worker-{seed}")
+            while perf_counter() < deadline:
+                if options["reconnect"]:
+                    wrapper.close()
+                    wrapper.ensure_connection()
+                start = perf_counter()
+                try:
+                    with wrapper.cursor() as cursor:
+                        if rng.random() < options["writes"]:
+                            # a read-modify-write request, as in a checkout
+                            cursor.execute(f"BEGIN {mode}")
+                            pk = rng.randrange(1, ROWS)
+                            cursor.execute(
+                                "SELECT quantity FROM stock WHERE id = %s", [pk]
+                            )
+                            cursor.execute(
+                                "UPDATE stock SET quantity = quantity - 1 "
+                                "WHERE id = %s",
+                                [pk],
+                            )
+                            cursor.execute("COMMIT")
+                            writes += 1
+                            timings.append((perf_counter() - start) * 1000)
+                        else:
+                            low = rng.randrange(1, ROWS - 50)
+                            cursor.execute(
+                                "SELECT id, quantity, title FROM stock "
+                                "WHERE id BETWEEN %s AND %s",
+                                [low, low + 50],
+                            )
+                            cursor.fetchall()
+                            reads += 1
+                except OperationalError as e:
+                    if "locked" not in str(e):
+                        raise
+                    locked += 1
+                    if wrapper.connection.in_transaction:
+                        wrapper.connection.rollback()
+            wrapper.close()
+            with lock:
+                stats["reads"] += reads
+                stats["writes"] += writes
+                stats["locked"] += locked
+                write_timings.extend(timings)
+
+        threads = [
+            threading.Thread(target=worker, args=(seed,))
+            for seed in range(options["threads"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if write_timings:
+            write_timings.sort()
+            stats["p99"] = write_timings[int(len(write_timings) * 0.99)]
+        return stats
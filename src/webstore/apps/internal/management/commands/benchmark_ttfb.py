@@ -0,0 +1,96 @@
+import asyncio
+from time import perf_counter
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+
+
+def _wsgi_get(handler, host, path):
+    """(time to first byte, total) of a request through the WSGI handler."""
+    environ = RequestFactory(HTTP_HOST=host).get(path).environ
+    start = perf_counter()
+    first = None
+    response = handler(environ, lambda status, headers: None)
+    try:
+        for chunk in response:
+            if chunk and first is None:
+                first = perf_counter() - start
+    finally:
+        response.close()
+    return first, perf_counter() - start
+
+
+async def _asgi_get(handler, host, path):
+    """(time to first byte, total) of a request through the ASGI handler."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", host.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": (host, 80),
+    }
+    requests = asyncio.Queue()
+    requests.put_nowait({"type": "http.request", "body": b"", "more_body": False})
+    first = None
+
+    async def send(message):
+        nonlocal first
+        if message["type"] == "http.response.body" and message.get("body"):
+            if first is None:
+                first = perf_counter() - start
+
+    start = perf_counter()
+    # waits for a disconnect, never sent
+    await handler(scope, requests.get, send)
+    return first, perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the time to first byte and the total time of the storefront "
+        "pages rendered in full and streamed, under WSGI and ASGI"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="*", default=["/ro/"])
+        parser.add_argument("--host", default="localhost", help="HTTP Host header")
+        parser.add_argument("--requests", type=int, default=50)
+
+    def handle(self, *args, **options):
+        host = options["host"]
+        count = options["requests"]
+        wsgi = WSGIHandler()
+        asgi = ASGIHandler()
+
+        for url in options["urls"]:
+            self.stdout.write(self.style.NOTICE(f"⏱️ {url}, {count} requests"))
+            for server in ("wsgi", "asgi"):
+                for streaming in (False, True):
+                    with override_settings(STREAMING_RENDER=streaming):
+                        if server == "wsgi":
+                            get = lambda: _wsgi_get(wsgi, host, url)
+                        else:
+                            get = lambda: asyncio.run(_asgi_get(asgi, host, url))
+                        get()  # the caches
+                        timings = [get() for _ in range(count)]
+                    self.report(server, streaming, timings)
+
+    def report(self, server, streaming, timings):
+        ttfb = sorted(first for first, total in timings)
+        total = sorted(total for first, total in timings)
+        middle = len(timings) // 2
+        self.stdout.write(
+            f"  {server} {'streamed' if streaming else 'full':<9} "
+            f"TTFB p50 {ttfb[middle] * 1000:>7.2f} ms  "
+            f"p90 {ttfb[int(len(ttfb) * 0.9)] * 1000:>7.2f} ms  "
+            f"total p50 {total[middle] * 1000:>7.2f} ms"
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from webstore.jscatalog import compile_catalogs, manifest_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompile the JavaScript translation catalog of every language into "
+        "hashed, gzipped static files"
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.NOTICE("🔤 Compiling the JavaScript catalogs..."))
+        manifest = compile_catalogs()
+        for language, name in manifest.items():
+            self.stdout.write(f"  {language}: {name}")
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Catalogs listed in {manifest_path()}")
+        )
@@ -1,15 +1,20 @@
 import subprocess
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.core.management import call_command
 
 
 class Command(BaseCommand):
-    help = "Compile .po translation files and restart Gunicorn via Supervisor"
+    help = (
+        "Compile .po translation files and the JavaScript catalogs, reload the "
+        "Gunicorn workers (or restart it via Supervisor)"
+    )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.NOTICE("🔤 Compiling translation files..."))
         try:
             call_command("compilemessages", verbosity=1)
+            # the JavaScript catalogs are static files built from the .mo files
+            call_command("compile_js_catalog")
             self.stdout.write(
                 self.style.SUCCESS("✅ Translations compiled successfully.")
             )
@@ -17,6 +22,13 @@ class Command(BaseCommand):
             self.stderr.write(self.style.ERROR(f"❌ Failed to compile messages: {e}"))
             return
 
+        # rolling reload, the new workers are warm before they take traffic
+        try:
+            call_command("reload_workers")
+            return
+        except CommandError as e:
+            self.stderr.write(self.style.WARNING(f"{e}, restarting instead"))
+
         self.stdout.write(self.style.NOTICE("🔁 Restarting Gunicorn..."))
         try:
             result = subprocess.run(
@@ -0,0 +1,67 @@
+from functools import wraps
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.test import Client
+
+from webstore.context_processors.lazy import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the given URLs and report the cost of every template context "
+        "processor, plus the hit rate of the lazy ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="*", default=["/"])
+        parser.add_argument("--host", default="localhost", help="HTTP Host header")
+        parser.add_argument("--requests", type=int, default=50)
+
+    def handle(self, *args, **options):
+        engine = engines["django"].engine
+        timings = {}
+
+        def timed(processor):
+            name = f"{processor.__module__}.{processor.__name__}"
+            timings[name] = [0, 0.0]
+
+            @wraps(processor)
+            def wrapper(request):
+                start = perf_counter()
+                try:
+                    return processor(request)
+                finally:
+                    timings[name][0] += 1
+                    timings[name][1] += perf_counter() - start
+
+            return wrapper
+
+        # the processors are a cached_property on the engine, swap them in place
+        original = engine.template_context_processors
+        engine.__dict__["template_context_processors"] = tuple(
+            timed(processor) for processor in original
+        )
+        reset_stats()
+
+        client = Client(HTTP_HOST=options["host"])
+        try:
+            for url in options["urls"]:
+                for _ in range(options["requests"]):
+                    client.get(url)
+        finally:
+            engine.__dict__["template_context_processors"] = original
+
+        self.stdout.write(self.style.NOTICE("⏱️ Context processors (eager call)"))
+        for name, (calls, seconds) in timings.items():
+            avg = seconds * 1000 / calls if calls else 0
+            self.stdout.write(f"  {name:<60} calls={calls:<6} avg={avg:.3f}ms")
+
+        self.stdout.write(self.style.NOTICE("💤 Lazy context processors"))
+        for name, stats in get_stats().items():
+            self.stdout.write(
+                f"  {name:<60} offered={stats['offered']:<6} "
+                f"evaluated={stats['evaluated']:<6} "
+                f"hit_rate={stats['hit_rate']:.0%} avg={stats['avg_ms']:.3f}ms"
+            )
@@ -0,0 +1,82 @@
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from webstore.profiler import read_profiles
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge the stacks sampled by ProfilerMiddleware in all the workers and "
+        "write them collapsed (flamegraph.pl, speedscope), rooted at the URL name"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url-name",
+            action="append",
+            default=[],
+            help="only these URL names, e.g. frontpage:index (repeatable)",
+        )
+        parser.add_argument("--output", help="file to write, stdout by default")
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=0,
+            help="print the N functions with the most samples instead",
+        )
+        parser.add_argument(
+            "--clear", action="store_true", help="delete the samples afterwards"
+        )
+
+    def handle(self, *args, **options):
+        stacks = read_profiles()
+        if options["url_name"]:
+            stacks = Counter(
+                {
+                    stack: count
+                    for stack, count in stacks.items()
+                    if stack.partition(";")[0] in options["url_name"]
+                }
+            )
+
+        if not stacks:
+            self.stdout.write(self.style.NOTICE("⚠️ No samples, is PROFILER_ENABLED?"))
+        elif options["top"]:
+            self.top(stacks, options["top"])
+        else:
+            lines = "".join(
+                f"{stack} {count}\n" for stack, count in sorted(stacks.items())
+            )
+            if options["output"]:
+                Path(options["output"]).write_text(lines, encoding="utf-8")
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"✅ {sum(stacks.values())} samples in {options['output']}"
+                    )
+                )
+            else:
+                self.stdout.write(lines, ending="")
+
+        if options["clear"]:
+            for path in Path(settings.PROFILER_ROOT).glob("*.collapsed"):
+                path.unlink()
+
+    def top(self, stacks, limit):
+        total = sum(stacks.values())
+        own = Counter()  # the leaf, where the time is spent
+        inclusive = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+        self.stdout.write(f"{total} samples\n   own   incl  function")
+        for frame, count in own.most_common(limit):
+            self.stdout.write(
+                f"{count / total:>6.1%} {inclusive[frame] / total:>6.1%}  {frame}"
+            )
@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import translation
+from django.utils.http import urlencode
+
+from apps.catalog.models import Product
+from apps.internal.loadtest import load
+from apps.internal.reload import ReloadError, run_gunicorn
+
+SERVERS = {
+    "wsgi": ("webstore.wsgi:application", {"GUNICORN_WORKER_CLASS": "gthread"}),
+    "asgi": (
+        "webstore.asgi:application",
+        {"GUNICORN_WORKER_CLASS": "uvicorn_worker.UvicornWorker"},
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the async endpoints (autocomplete, zip codes, stock) under "
+        "gunicorn with threaded WSGI workers and with uvicorn ASGI workers"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="default: the async endpoints")
+        parser.add_argument("--host", default="localhost", help="HTTP Host header")
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--threads", type=int, default=4, help="of WSGI workers")
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--duration", type=float, default=10)
+        parser.add_argument("--server", choices=list(SERVERS), action="append")
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or self.default_paths(options["host"])
+        workers = options["workers"]
+        for server in options["server"] or list(SERVERS):
+            application, env = SERVERS[server]
+            env = {**env, "GUNICORN_THREADS": str(options["threads"])}
+            self.stdout.write(
+                self.style.NOTICE(f"🚀 {server}: starting {workers} workers...")
+            )
+            try:
+                with run_gunicorn(workers, application, env) as (pidfile, address):
+                    load(address, paths, options["host"], duration=1)  # warm up
+                    result = load(
+                        address,
+                        paths,
+                        options["host"],
+                        options["concurrency"],
+                        options["duration"],
+                    )
+            except (ReloadError, OSError) as e:
+                raise CommandError(f"❌ {e}")
+            self.stdout.write(
+                f"  {server}  {result.throughput:>8.1f} req/s  "
+                f"p50 {result.percentile(50) * 1000:>7.2f} ms  "
+                f"p99 {result.percentile(99) * 1000:>7.2f} ms  "
+                f"errors {result.errors}"
+            )
+
+    def default_paths(self, host):
+        try:
+            site = Site.objects.get(domain=host)
+        except Site.DoesNotExist:
+            raise CommandError(f"❌ No site {host}, pass the paths")
+        skus = list(
+            Product.objects.filter(is_active=True, brand__sites=site).values_list(
+                "sku", flat=True
+            )[:10]
+        )
+        with translation.override(settings.LANGUAGES[0][0]):
+            return [
+                f"{reverse('webstore:autocomplete')}?{urlencode({'q': 'bo'})}",
+                f"{reverse('webstore:autocomplete')}?{urlencode({'q': 'motocoasa'})}",
+                f"{reverse('webstore:zip_codes')}?{urlencode({'q': '0100'})}",
+                f"{reverse('webstore:stock')}?{urlencode({'sku': skus}, doseq=True)}",
+            ]
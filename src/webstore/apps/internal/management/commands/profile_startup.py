@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.internal.startup import aggregate, run_probe
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot the project in a new interpreter and report the startup time per "
+        "phase and settings component, and the import time per app and package"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--process",
+            choices=["web", "celery"],
+            default="web",
+            help="boot a web worker (URLconf, templates) or a Celery process",
+        )
+        parser.add_argument(
+            "--profile",
+            default="lean",
+            help="WORKER_PROFILE of the probe, 'full' for all INSTALLED_APPS",
+        )
+        parser.add_argument("--top", type=int, default=15)
+
+    def handle(self, *args, **options):
+        timings, imports = run_probe(options["process"], options["profile"])
+        top = options["top"]
+
+        phases = timings["phases"]
+        self.stdout.write(
+            self.style.NOTICE(
+                f"⏱️ Startup of a {options['process']} process "
+                f"({options['profile']}): {sum(phases.values()) * 1000:.0f}ms"
+            )
+        )
+        for name, seconds in phases.items():
+            self.stdout.write(f"  {name:<40} {seconds * 1000:>8.1f}ms")
+
+        self.stdout.write(self.style.NOTICE("⏱️ Settings components"))
+        for name, seconds in sorted(
+            timings["settings"].items(), key=lambda item: item[1], reverse=True
+        ):
+            self.stdout.write(f"  {name:<40} {seconds * 1000:>8.1f}ms")
+
+        total = sum(own for own, cumulative in imports.values())
+        self.stdout.write(
+            self.style.NOTICE(
+                f"⏱️ Imports: {len(imports)} modules, {total * 1000:.0f}ms, "
+                f"top {top} apps and packages"
+            )
+        )
+        groups = aggregate(imports, settings.INSTALLED_APPS)
+        for name, (seconds, modules) in sorted(
+            groups.items(), key=lambda item: item[1][0], reverse=True
+        )[:top]:
+            self.stdout.write(
+                f"  {name:<40} {seconds * 1000:>8.1f}ms  modules={modules}"
+            )
+
+        self.stdout.write(self.style.NOTICE(f"⏱️ Top {top} modules (cumulative)"))
+        for name, (own, cumulative) in sorted(
+            imports.items(), key=lambda item: item[1][1], reverse=True
+        )[:top]:
+            self.stdout.write(
+                f"  {name:<40} {cumulative * 1000:>8.1f}ms  self={own * 1000:.1f}ms"
+            )
+
+        if options["process"] == "web" and timings["deferred"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"⚠️ Imported at startup, should be deferred: "
+                    f"{', '.join(timings['deferred'])}"
+                )
+            )
+        elif options["process"] == "web":
+            self.stdout.write(self.style.SUCCESS("✅ No deferred module imported"))
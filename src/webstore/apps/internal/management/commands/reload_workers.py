@@ -0,0 +1,73 @@
+from time import monotonic, sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.internal.reload import LatencyProbe, ReloadError, reload_gunicorn
+
+
+class Command(BaseCommand):
+    help = (
+        "Reload the gunicorn workers without dropping requests, the new ones "
+        "are warmed up before they take traffic"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pidfile", default=settings.GUNICORN_PIDFILE)
+        parser.add_argument(
+            "--signal",
+            choices=("HUP", "USR2"),
+            default="HUP",
+            help="USR2 keeps the old workers serving until the new ones are "
+            "warm, not usable under supervisor",
+        )
+        parser.add_argument("--timeout", type=float, default=60)
+        parser.add_argument(
+            "--probe",
+            metavar="URL",
+            help="request URL during the reload and report the latency",
+        )
+        parser.add_argument("--host", help="Host header of the probe requests")
+
+    def handle(self, *args, **options):
+        probe = None
+        if options["probe"]:
+            probe = LatencyProbe(options["probe"], options["host"])
+            probe.start()
+            # the baseline
+            sleep(1)
+
+        self.stdout.write(
+            self.style.NOTICE(f"🔁 Reloading gunicorn ({options['signal']})...")
+        )
+        start = monotonic()
+        try:
+            elapsed = reload_gunicorn(
+                options["pidfile"], options["signal"], options["timeout"]
+            )
+        except (ReloadError, OSError) as e:
+            if probe:
+                probe.stop()
+            raise CommandError(f"❌ Reload failed: {e}")
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Workers reloaded and warm in {elapsed:.2f}s")
+        )
+
+        if probe:
+            sleep(1)
+            end = monotonic()
+            probe.stop()
+            for name, summary in (
+                ("before", probe.summary(until=start)),
+                ("reload", probe.summary(since=start, until=start + elapsed)),
+                ("after", probe.summary(since=start + elapsed, until=end)),
+            ):
+                if not summary["requests"]:
+                    continue
+                self.stdout.write(
+                    f"  {name:<7} {summary['requests']:>5} requests  "
+                    f"{summary['errors']:>3} errors  "
+                    f"p50 {summary['p50']:>7.1f} ms  "
+                    f"p99 {summary['p99']:>7.1f} ms  "
+                    f"max {summary['max']:>7.1f} ms"
+                )
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.internal.memory import gunicorn_memory, measure_gunicorn, private
+from apps.internal.reload import ReloadError
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the memory (RSS, PSS, private) of the gunicorn master and "
+        "workers, or compare a regular and a preloaded start"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pidfile", default=settings.GUNICORN_PIDFILE)
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="start gunicorn without and with GUNICORN_PRELOAD and compare",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=4, help="workers of --compare"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if not options["compare"]:
+                self.report("gunicorn", *gunicorn_memory(options["pidfile"]))
+                return
+            for preload in (False, True):
+                self.stdout.write(
+                    self.style.NOTICE(f"🚀 Starting {options['workers']} workers...")
+                )
+                master, workers = measure_gunicorn(options["workers"], preload)
+                self.report("preload" if preload else "regular", master, workers)
+        except (ReloadError, OSError) as e:
+            raise CommandError(f"❌ {e}")
+
+    def report(self, name, master, workers):
+        self.stdout.write(self.style.NOTICE(f"🧠 {name}, memory in MiB"))
+        self.stdout.write(
+            f"  {'process':<16} {'RSS':>8} {'PSS':>8} {'shared':>8} {'private':>8}"
+        )
+        for label, memory in [
+            ("master", master),
+            *((f"worker {pid}", memory) for pid, memory in workers.items()),
+        ]:
+            shared = memory["Shared_Clean"] + memory["Shared_Dirty"]
+            self.stdout.write(
+                f"  {label:<16} {memory['Rss'] / 1024:>8.1f} "
+                f"{memory['Pss'] / 1024:>8.1f} {shared / 1024:>8.1f} "
+                f"{private(memory) / 1024:>8.1f}"
+            )
+        if workers:
+            pss = sum(memory["Pss"] for memory in [master, *workers.values()])
+            average = sum(private(memory) for memory in workers.values()) / len(workers)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ Total PSS {pss / 1024:.1f} MiB, "
+                    f"{average / 1024:.1f} MiB private per worker"
+                )
+            )
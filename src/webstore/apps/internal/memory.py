@@ -0,0 +1,61 @@
+"""
+Memory of the gunicorn workers, from /proc/<pid>/smaps_rollup (Linux).
+
+RSS counts the pages shared with the master and the other workers in every
+worker; PSS splits them between the processes sharing them, its sum is what
+the workers really cost, and the private pages are what each worker adds.
+"""
+
+from pathlib import Path
+from time import sleep
+
+from .reload import ReloadError, children, read_pid, run_gunicorn
+
+FIELDS = (
+    "Rss",
+    "Pss",
+    "Shared_Clean",
+    "Shared_Dirty",
+    "Private_Clean",
+    "Private_Dirty",
+)
+
+
+def smaps_rollup(pid):
+    """{field: kB} of FIELDS for the process `pid`."""
+    memory = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        name, _, value = line.partition(":")
+        if name in FIELDS:
+            memory[name] = int(value.split()[0])
+    return memory
+
+
+def private(memory):
+    return memory["Private_Clean"] + memory["Private_Dirty"]
+
+
+def gunicorn_memory(pidfile):
+    """smaps_rollup of the master and of each worker: (master, {pid: memory})."""
+    master = read_pid(pidfile)
+    if master is None:
+        raise ReloadError(f"No gunicorn pid in {pidfile}")
+    workers = {}
+    for pid in sorted(children(master)):
+        try:
+            workers[pid] = smaps_rollup(pid)
+        except OSError:
+            pass  # exited meanwhile
+    return smaps_rollup(master), workers
+
+
+def measure_gunicorn(workers=4, preload=False, settle=2):
+    """
+    Start gunicorn with gunicorn.conf.py, wait for its warm workers and
+    measure them, then stop it.
+    """
+    env = {"GUNICORN_PRELOAD": "1" if preload else "0"}
+    with run_gunicorn(workers, env=env) as (pidfile, address):
+        # the workers finish their warmup requests
+        sleep(settle)
+        return gunicorn_memory(pidfile)
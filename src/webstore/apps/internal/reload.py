@@ -0,0 +1,224 @@
+"""
+Rolling reload of the gunicorn workers.
+
+HUP makes the gunicorn master start a new set of workers and stop the old
+ones gracefully (the requests in flight are finished, the waiting ones are
+served by the new workers). USR2 starts a second master with its own
+workers next to the running one, which is stopped only once they are warm;
+it's not usable under supervisor, which follows the first master.
+
+The workers mark themselves ready in <pidfile>.ready/ once their warmup is
+done (gunicorn.conf.py), `reload_gunicorn` waits for them.
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from time import monotonic, sleep
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+class ReloadError(Exception):
+    pass
+
+
+def read_pid(pidfile):
+    try:
+        return int(Path(pidfile).read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def ready_dir(pidfile):
+    return Path(f"{pidfile}.ready")
+
+
+def mark_ready(pidfile, pid):
+    directory = ready_dir(pidfile)
+    directory.mkdir(parents=True, exist_ok=True)
+    directory.joinpath(str(pid)).touch()
+
+
+def unmark_ready(pidfile, pid):
+    ready_dir(pidfile).joinpath(str(pid)).unlink(missing_ok=True)
+
+
+def children(pid):
+    """The pids of the child processes of `pid` (Linux /proc)."""
+    pids = set()
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            # the command name is in parentheses and may contain spaces
+            fields = stat.read_text().rpartition(")")[2].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            pids.add(int(stat.parent.name))
+    return pids
+
+
+def ready_workers(pidfile, master):
+    ready = {int(path.name) for path in ready_dir(pidfile).glob("[0-9]*")}
+    return children(master) & ready
+
+
+def _wait(condition, timeout, message):
+    deadline = monotonic() + timeout
+    while not condition():
+        if monotonic() > deadline:
+            raise ReloadError(message)
+        sleep(0.05)
+
+
+def reload_gunicorn(pidfile, signal_name="HUP", timeout=60):
+    """
+    Reload the workers of the gunicorn master of `pidfile`, return the
+    seconds until the new workers were all warm and the old ones gone.
+    """
+    master = read_pid(pidfile)
+    if master is None:
+        raise ReloadError(f"No gunicorn pid in {pidfile}")
+    old = children(master)
+    if not old:
+        raise ReloadError(f"gunicorn {master} has no workers")
+
+    start = monotonic()
+    if signal_name == "HUP":
+        os.kill(master, signal.SIGHUP)
+        _wait(
+            lambda: len(ready_workers(pidfile, master) - old) >= len(old)
+            and not children(master) & old,
+            timeout,
+            "The new workers didn't start in time",
+        )
+    elif signal_name == "USR2":
+        os.kill(master, signal.SIGUSR2)
+        # renamed to `pidfile` once the old master exits
+        new_pidfile = f"{pidfile}.2"
+        _wait(
+            lambda: read_pid(new_pidfile) is not None,
+            timeout,
+            "The new gunicorn master didn't start in time",
+        )
+        new_master = read_pid(new_pidfile)
+        _wait(
+            lambda: len(ready_workers(pidfile, new_master)) >= len(old),
+            timeout,
+            "The new workers didn't start in time",
+        )
+        # both masters serve now, the old one stops gracefully (WINCH only
+        # works for daemonized masters)
+        os.kill(master, signal.SIGTERM)
+        _wait(lambda: not children(master), timeout, "The old workers didn't stop")
+    else:
+        raise ReloadError(f"Unsupported signal {signal_name}")
+    return monotonic() - start
+
+
+class LatencyProbe(threading.Thread):
+    """Requests `url` in a loop, recording (time, milliseconds, status)."""
+
+    def __init__(self, url, host=None, interval=0.02, timeout=10):
+        super().__init__(name="latency-probe", daemon=True)
+        self.request = Request(url, headers={"Host": host} if host else {})
+        self.interval = interval
+        self.timeout = timeout
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            start = monotonic()
+            try:
+                with urlopen(self.request, timeout=self.timeout) as response:
+                    response.read()
+                    status = response.status
+            except HTTPError as e:
+                status = e.code
+            except (URLError, OSError) as e:
+                status = type(e).__name__
+            self.samples.append((start, (monotonic() - start) * 1000, status))
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def summary(self, since=None, until=None):
+        samples = [
+            (ms, status)
+            for at, ms, status in self.samples
+            if (since is None or at >= since) and (until is None or at < until)
+        ]
+        timings = sorted(ms for ms, status in samples)
+        if not timings:
+            return {"requests": 0}
+        return {
+            "requests": len(timings),
+            "errors": sum(1 for ms, status in samples if status != 200),
+            "p50": timings[len(timings) // 2],
+            "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+            "max": timings[-1],
+        }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def run_gunicorn(
+    workers=4, application="webstore.wsgi:application", env=None, timeout=120
+):
+    """
+    Start gunicorn with gunicorn.conf.py on a free local port and wait for its
+    warm workers, yield `(pidfile, address)` and stop it. `env` are the extra
+    environment variables (GUNICORN_PRELOAD, GUNICORN_WORKER_CLASS...).
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        pidfile = os.path.join(directory, "gunicorn.pid")
+        address = ("127.0.0.1", _free_port())
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "--config",
+                str(PROJECT_DIR.joinpath("gunicorn.conf.py")),
+                application,
+            ],
+            cwd=PROJECT_DIR,
+            env={
+                **os.environ,
+                "GUNICORN_BIND": "%s:%d" % address,
+                "GUNICORN_PIDFILE": pidfile,
+                "GUNICORN_WORKERS": str(workers),
+                **(env or {}),
+            },
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = monotonic() + timeout
+            while (
+                read_pid(pidfile) != process.pid
+                or len(ready_workers(pidfile, process.pid)) < workers
+            ):
+                if process.poll() is not None or monotonic() > deadline:
+                    raise ReloadError("gunicorn didn't start its workers")
+                sleep(0.1)
+            yield pidfile, address
+        finally:
+            process.terminate()
+            process.wait(timeout)
@@ -0,0 +1,118 @@
+"""
+Startup profile of a web worker or a Celery process.
+
+`run_probe` starts a fresh interpreter with `-X importtime` that boots the
+project the way the process would (settings, apps, URLconf and template
+libraries for the web, the Celery app and its tasks for celery) and reports
+the time of each phase and of each settings component. The import times are
+then aggregated per installed app, the other modules per top-level package.
+
+The web workers run with the lean settings profile (WORKER_PROFILE=lean,
+without COMMAND_APPS) and don't import DEFERRED_MODULES at startup, they
+are only needed by a few pages and imported on first use.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from importlib import import_module
+from time import perf_counter
+
+DEFERRED_MODULES = ("requests", "pymdownx", "bleach", "pygments", "markdown")
+
+
+def probe(kind="web"):
+    """Boot the project, return the timings; runs in the child process."""
+    phases = {}
+
+    def phase(name, function):
+        start = perf_counter()
+        function()
+        phases[name] = perf_counter() - start
+
+    import django
+    from django.conf import settings
+
+    phase("settings", lambda: settings.INSTALLED_APPS)
+    phase("apps", django.setup)
+    if kind == "web":
+        from django.template import engines
+        from django.urls import get_resolver
+
+        phase("urls", lambda: get_resolver().url_patterns)
+        phase("templates", lambda: engines["django"].engine.template_libraries)
+    else:
+        phase("celery", lambda: import_module("webstore.celery"))
+        app = import_module("webstore.celery").app
+        phase("tasks", app.loader.import_default_modules)
+
+    return {
+        "phases": phases,
+        "settings": getattr(settings, "SETTINGS_TIMINGS", {}),
+        "deferred": [name for name in DEFERRED_MODULES if name in sys.modules],
+    }
+
+
+def run_probe(kind="web", profile=None):
+    """Probe a new interpreter, return (timings, {module: (self, cumulative)})."""
+    env = dict(os.environ)
+    # the project first, the paths already set (vendored packages) kept
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [os.getcwd(), env.get("PYTHONPATH")])
+    )
+    env.setdefault("DJANGO_SETTINGS_MODULE", "webstore.settings")
+    env.pop("WORKER_PROFILE", None)
+    if profile:
+        env["WORKER_PROFILE"] = profile
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", __name__, kind],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, parse_importtime(result.stderr)
+
+
+def parse_importtime(output):
+    """The `-X importtime` lines as {module: (self, cumulative)} seconds."""
+    imports = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header
+        imports[fields[2].strip()] = (
+            int(fields[0]) / 1_000_000,
+            int(fields[1]) / 1_000_000,
+        )
+    return imports
+
+
+def aggregate(imports, app_names):
+    """
+    Sum the self times per installed app (longest matching app name), the
+    modules out of the apps per top-level package: {group: (seconds, modules)}.
+    """
+    app_names = sorted(app_names, key=len, reverse=True)
+    groups = defaultdict(lambda: [0.0, 0])
+    for module, (own, cumulative) in imports.items():
+        group = next(
+            (
+                name
+                for name in app_names
+                if module == name or module.startswith(f"{name}.")
+            ),
+            module.partition(".")[0],
+        )
+        groups[group][0] += own
+        groups[group][1] += 1
+    return {group: tuple(total) for group, total in groups.items()}
+
+
+if __name__ == "__main__":
+    print(json.dumps(probe(*sys.argv[1:])))
@@ -0,0 +1,56 @@
+import logging
+
+from celery import shared_task
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from djcelery_email.utils import dict_to_email
+
+from .mail import close_worker_connection, get_worker_connection
+
+logger = logging.getLogger("django")
+
+worker_process_shutdown.connect(close_worker_connection)
+
+
+# same queue and rate limit as the djcelery_email task, which stays registered
+TASK_CONFIG = {**settings.CELERY_EMAIL_TASK_CONFIG, "name": "send_email_batch"}
+
+
+@shared_task(bind=True, max_retries=5, **TASK_CONFIG)
+def send_email_batch(self, messages, backend_kwargs=None):
+    """
+    Deliver a chunk of messages (dicts, see `email_to_dict`) on the worker's
+    SMTP connection, retry only the ones that failed.
+    """
+    try:
+        connection = get_worker_connection(backend_kwargs)
+    except Exception as e:
+        # the server is unreachable, the whole chunk waits for it
+        logger.warning(f"[Mail] Connecting to the SMTP server failed: {e!r}")
+        close_worker_connection()
+        raise _retry(self, messages, backend_kwargs, e)
+
+    sent, failed, error = 0, [], None
+    for message in messages:
+        try:
+            # reopens after a failure, the backend doesn't close what it
+            # didn't open itself
+            connection.open()
+            sent += connection.send_messages([dict_to_email(message)]) or 0
+        except Exception as e:
+            logger.warning(f"[Mail] Sending to {message['to']} failed: {e!r}")
+            failed.append(message)
+            error = e
+            connection.close()
+
+    if failed:
+        raise _retry(self, failed, backend_kwargs, error)
+    return sent
+
+
+def _retry(task, messages, backend_kwargs, error):
+    return task.retry(
+        args=(messages, backend_kwargs),
+        exc=error,
+        countdown=60 * 2**task.request.retries,
+    )
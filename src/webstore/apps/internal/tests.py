@@ -0,0 +1,692 @@
+import asyncio
+import gc
+import gzip
+import importlib
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+from time import monotonic, sleep
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core import mail as outbox
+from django.core.mail import EmailMessage
+from django.core.handlers.asgi import ASGIHandler
+from django.core.mail.backends.base import BaseEmailBackend
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template import Context, Template, TemplateDoesNotExist
+from django.template.loader import render_to_string
+from django.test import (
+    AsyncRequestFactory,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import ResolverMatch, reverse
+from django.utils import translation
+
+from apps.siteSettings.models import SiteSettings
+from webstore.coordination import cache
+from webstore.logs import (
+    JSONFormatter,
+    QueueListenerHandler,
+    RateLimitedAdminEmailHandler,
+)
+from webstore import jscatalog, profiler, streaming, warmup
+from webstore.middleware import (
+    PrimaryPinMiddleware,
+    ProfilerMiddleware,
+    ThreadLocalMiddleware,
+)
+from webstore.profiler import Sampler, read_profiles
+from webstore.routers import PrimaryReplicaRouter, is_pinned
+from webstore.settings.components import database
+from webstore.threadlocals import get_current_request
+
+from . import loadtest, mail, reload, startup
+from .checks import check_shared_cache
+from .memory import FIELDS, private, smaps_rollup
+from .tasks import send_email_batch
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_per_process_cache_is_an_error(self):
+        locmem = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        database = {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "cache_coordination",
+        }
+        caches = {"default": database, "coordination": locmem}
+        with override_settings(TESTING=False, DEBUG=False, CACHES=caches):
+            errors = check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ["internal.E001"])
+        self.assertIn("coordination", errors[0].msg)
+
+        caches = {"default": database, "coordination": database}
+        with override_settings(TESTING=False, DEBUG=False, CACHES=caches):
+            self.assertEqual(check_shared_cache(None), [])
+
+
+class CelerySettingsTests(SimpleTestCase):
+    def setup_django(self, **env):
+        env = {**os.environ, "PYTHONPATH": os.getcwd(), **env}
+        for name in ("DJANGO_TESTING", "DEBUG", "CELERY_BROKER_URL"):
+            env.pop(name, None)
+        return subprocess.run(
+            [sys.executable, "-c", "import django; django.setup()"],
+            env={**env, "DJANGO_SETTINGS_MODULE": "webstore.settings"},
+            capture_output=True,
+            text=True,
+        )
+
+    def test_no_broker_fails_out_of_development(self):
+        result = self.setup_django()
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("CELERY_BROKER_URL is not set", result.stderr)
+        self.assertEqual(self.setup_django(CELERY_TASK_ALWAYS_EAGER="1").returncode, 0)
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    def test_asgi_workers_dont_keep_connections(self):
+        self.addCleanup(importlib.reload, database)
+        for worker_class, max_age in (
+            ("gthread", 600),
+            ("uvicorn_worker.UvicornWorker", 0),
+        ):
+            with mock.patch.dict(os.environ, {"GUNICORN_WORKER_CLASS": worker_class}):
+                os.environ.pop("CONN_MAX_AGE", None)
+                importlib.reload(database)
+            with self.subTest(worker_class=worker_class):
+                self.assertEqual(database.DATABASES["default"]["CONN_MAX_AGE"], max_age)
+
+
+class RecordingBackend(BaseEmailBackend):
+    """
+    Counts the opened connections, refuses the `bounce@` recipients and
+    every connection while `down`.
+    """
+
+    opened = 0
+    sent = []
+    down = False
+
+    def open(self):
+        if RecordingBackend.down:
+            raise ConnectionRefusedError("down")
+        if not getattr(self, "connection", None):
+            self.connection = True
+            RecordingBackend.opened += 1
+
+    def close(self):
+        self.connection = None
+
+    def send_messages(self, email_messages):
+        for message in email_messages:
+            if message.to[0].startswith("bounce@"):
+                raise ConnectionResetError("rejected")
+            RecordingBackend.sent.append(message.to[0])
+        return len(email_messages)
+
+
+def _message(to):
+    return EmailMessage("Order", "Thanks", "shop@shop.test", [to])
+
+
+@override_settings(
+    CELERY_EMAIL_BACKEND="apps.internal.tests.RecordingBackend",
+    CELERY_EMAIL_CHUNK_SIZE=2,
+)
+class BatchedEmailTests(SimpleTestCase):
+    def setUp(self):
+        RecordingBackend.opened = 0
+        RecordingBackend.sent = []
+        RecordingBackend.down = False
+        self.addCleanup(mail.close_worker_connection)
+
+    def test_batches_by_recipient_domain(self):
+        messages = [
+            _message("a@one.test"),
+            _message("b@two.test"),
+            _message("c@ONE.test"),
+            _message("d@one.test"),
+        ]
+        batches = list(mail.BatchedEmailBackend.batches(messages))
+        self.assertEqual(
+            [[message["to"][0] for message in batch] for batch in batches],
+            [["a@one.test", "c@ONE.test"], ["d@one.test"], ["b@two.test"]],
+        )
+
+    def test_send_queues_a_task_per_batch(self):
+        backend = mail.BatchedEmailBackend(host="localhost")
+        with mock.patch.object(send_email_batch, "delay") as delay:
+            queued = backend.send_messages(
+                [_message("a@one.test"), _message("b@two.test")]
+            )
+        self.assertEqual(queued, 2)
+        self.assertEqual(delay.call_count, 2)
+        self.assertEqual(delay.call_args.args[1], {"host": "localhost"})
+
+    def test_connection_is_kept_across_tasks(self):
+        for batch in mail.BatchedEmailBackend.batches(
+            [_message(f"{i}@one.test") for i in range(5)]
+        ):
+            send_email_batch(batch)
+        self.assertEqual(len(RecordingBackend.sent), 5)
+        self.assertEqual(RecordingBackend.opened, 1)
+
+    def test_only_failed_messages_are_retried(self):
+        batch = next(
+            mail.BatchedEmailBackend.batches(
+                [_message("bounce@one.test"), _message("ok@one.test")]
+            )
+        )
+        with mock.patch.object(
+            send_email_batch, "retry", side_effect=RuntimeError
+        ) as retry:
+            with self.assertRaises(RuntimeError):
+                send_email_batch(batch)
+
+        self.assertEqual(RecordingBackend.sent, ["ok@one.test"])
+        failed, backend_kwargs = retry.call_args.kwargs["args"]
+        self.assertEqual([message["to"] for message in failed], [["bounce@one.test"]])
+        # the connection was reopened after the failure
+        self.assertEqual(RecordingBackend.opened, 2)
+
+    def test_unreachable_server_retries_the_chunk(self):
+        batch = next(
+            mail.BatchedEmailBackend.batches(
+                [_message("a@one.test"), _message("b@one.test")]
+            )
+        )
+        RecordingBackend.down = True
+        with mock.patch.object(
+            send_email_batch, "retry", side_effect=RuntimeError
+        ) as retry:
+            with self.assertRaises(RuntimeError):
+                send_email_batch(batch)
+
+        self.assertEqual(retry.call_args.kwargs["args"], (batch, None))
+        self.assertIsInstance(retry.call_args.kwargs["exc"], ConnectionRefusedError)
+
+        # the retry connects again
+        RecordingBackend.down = False
+        send_email_batch(batch)
+        self.assertEqual(RecordingBackend.sent, ["a@one.test", "b@one.test"])
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _error_record(args=(1,), lineno=1, exception=True):
+    exc_info = None
+    if exception:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+    return logging.LogRecord(
+        "test", logging.ERROR, __file__, lineno, "[Test] failed %s", args, exc_info
+    )
+
+
+@override_settings(
+    ADMINS=[("Admin", "admin@shop.test")],
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+class LoggingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_queue_hands_records_to_the_handlers(self):
+        target = ListHandler()
+        handler = QueueListenerHandler([target])
+        handler.handle(_error_record())
+        handler.stop()
+
+        (record,) = target.records
+        self.assertEqual(record.getMessage(), "[Test] failed 1")
+        # kept for the admin emails
+        self.assertIs(record.exc_info[0], ValueError)
+
+    def test_full_queue_drops_records(self):
+        handler = QueueListenerHandler([ListHandler()], maxsize=1)
+        handler.stop()
+        handler.handle(_error_record())
+        handler.handle(_error_record())
+        self.assertEqual(handler.dropped, 1)
+
+    def test_forked_process_restarts_the_listener(self):
+        target = ListHandler()
+        handler = QueueListenerHandler([target])
+        self.addCleanup(handler.stop)
+        # the listener thread waits on the queue, like in the gunicorn master
+        sleep(0.1)
+
+        pid = os.fork()
+        if pid == 0:
+            # nothing logged: the stop sentinel is the only record
+            handler.stop()
+            os._exit(0)
+
+        deadline = monotonic() + 10
+        while (result := os.waitpid(pid, os.WNOHANG)) == (0, 0):
+            if monotonic() > deadline:
+                os.kill(pid, signal.SIGKILL)
+                self.fail("The forked process doesn't stop its listener")
+            sleep(0.05)
+        self.assertEqual(os.waitstatus_to_exitcode(result[1]), 0)
+
+    def test_admin_emails_are_deduplicated(self):
+        handler = RateLimitedAdminEmailHandler()
+        handler.emit(_error_record())
+        handler.emit(_error_record(args=(2,)))
+        self.assertEqual(len(outbox.outbox), 1)
+
+        # no traceback, the logging call sites differ
+        handler.emit(_error_record(exception=False))
+        handler.emit(_error_record(lineno=2, exception=False))
+        handler.emit(_error_record(lineno=2, exception=False))
+        self.assertEqual(len(outbox.outbox), 3)
+
+    def test_json_formatter(self):
+        data = json.loads(JSONFormatter().format(_error_record()))
+        self.assertEqual(data["level"], "ERROR")
+        self.assertEqual(data["message"], "[Test] failed 1")
+        self.assertIn("ValueError: boom", data["exception"])
+
+
+def _profiled_view(started, done):
+    started.set()
+    done.wait(5)
+
+
+class ProfilerTests(SimpleTestCase):
+    def test_samples_are_counted_per_url_name(self):
+        started, done = threading.Event(), threading.Event()
+        sampler = Sampler()
+        request = RequestFactory().get("/")
+
+        def serve():
+            sampler.active[threading.get_ident()] = (request, Counter())
+            _profiled_view(started, done)
+            request.resolver_match = ResolverMatch(
+                _profiled_view, (), {}, "index", namespaces=["frontpage"]
+            )
+            sampler.remove()
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+        started.wait(5)
+        sampler.sample()
+        sampler.sample()
+        done.set()
+        thread.join()
+
+        ((name, stack), count), *rest = sampler.stacks.items()
+        self.assertEqual((name, count, rest), ("frontpage:index", 2, []))
+        self.assertIn(";_profiled_view (", stack)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(PROFILER_ROOT=directory):
+                sampler.pid = 1
+                sampler.flush()
+                # the counts are reset, the next periods are added to the file
+                self.assertEqual(sampler.stacks, Counter())
+                sampler.stacks[(name, stack)] += 3
+                sampler.flush()
+                self.assertEqual(
+                    Path(directory, "1.collapsed").read_text(encoding="utf-8"),
+                    f"frontpage:index;{stack} 5\n",
+                )
+                sampler.pid = 2
+                sampler.stacks[(name, stack)] += 1
+                sampler.flush()
+                self.assertEqual(
+                    read_profiles(), Counter({f"frontpage:index;{stack}": 6})
+                )
+
+    @override_settings(PROFILER_ENABLED=True, PROFILER_SAMPLE_RATE=1)
+    def test_streaming_response_is_profiled_until_closed(self):
+        request = RequestFactory().get("/")
+        middleware = ProfilerMiddleware(
+            lambda request: StreamingHttpResponse(iter([b"page"]))
+        )
+        response = middleware(request)
+        self.assertIn(threading.get_ident(), profiler.sampler.active)
+        b"".join(response)
+        # request_finished closes the database connections
+        with mock.patch("django.http.response.signals.request_finished"):
+            response.close()
+        self.assertNotIn(threading.get_ident(), profiler.sampler.active)
+
+
+class JavaScriptCatalogTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        static_root = override_settings(STATIC_ROOT=directory.name)
+        static_root.enable()
+        self.addCleanup(static_root.disable)
+        self.addCleanup(jscatalog.reset_manifest)
+        jscatalog.reset_manifest()
+
+    def render(self, language):
+        with translation.override(language):
+            return Template("{% load assets %}{% javascript_catalog %}").render(
+                Context()
+            )
+
+    def test_falls_back_to_the_view(self):
+        with translation.override("en"):
+            url = reverse("javascript-catalog")
+        self.assertIn(f'src="{url}"', self.render("en"))
+
+    def test_precompiled_catalogs(self):
+        manifest = jscatalog.compile_catalogs()
+        self.assertEqual(set(manifest), {"ro", "en"})
+
+        path = jscatalog.manifest_path().parent.parent.joinpath(manifest["ro"])
+        content = path.read_bytes()
+        self.assertIn(b"django.catalog", content)
+        self.assertEqual(
+            gzip.decompress(path.with_name(f"{path.name}.gz").read_bytes()), content
+        )
+        self.assertIn(f"/static/{manifest['ro']}", self.render("ro"))
+        self.assertIn(f"/static/{manifest['en']}", self.render("en-us"))
+
+        # the same catalogs, the same names
+        self.assertEqual(jscatalog.compile_catalogs(), manifest)
+
+
+@override_settings(WARMUP_LOG=None)
+class WarmupTests(TestCase):
+    def test_runs_every_step(self):
+        timings = warmup.run_warmups(requests=False)
+        steps = [function.__name__ for function in warmup.WARMUPS]
+        self.assertEqual(list(timings)[: len(steps)], steps)
+        for label in ("siteSettings", "catalog", "search"):
+            self.assertIn(label, timings)
+        self.assertIn("base.html", warmup.template_names())
+        self.assertIn("frontpage/index.html", warmup.template_names())
+
+    def test_requests_every_site(self):
+        site = Site.objects.create(domain="shop.test", name="shop")
+        SiteSettings.objects.create(site=site, name="shop")
+
+        urls = warmup.warmup_urls()
+        self.assertEqual({host for host, path in urls}, {"shop.test"})
+        self.assertEqual(len(urls), len(set(urls)))
+
+        with tempfile.TemporaryDirectory() as directory:
+            log = os.path.join(directory, "log", "warmup.log")
+            with override_settings(WARMUP_LOG=log):
+                timings = warmup.run_warmups()
+            with open(log) as file:
+                line = json.loads(file.read())
+        self.assertIn("shop.test" + urls[0][1], timings)
+        self.assertEqual(set(line["requests_ms"]), {f"{h}{p}" for h, p in urls})
+
+
+STREAMED_TEMPLATES = {
+    "base.html": (
+        "<head>{% block head %}H{% endblock %}</head>"
+        "<body>{% block body %}<b>{% block inner %}I{% endblock %}</b>{% endblock %}"
+        "</body>"
+    ),
+    "layout.html": (
+        "{% extends 'base.html' %}{% block inner %}[{{ block.super }}]{% endblock %}"
+    ),
+    "page.html": (
+        "{% extends 'layout.html' %}"
+        "{% block head %}{{ block.super }} {{ title }}{% endblock %}"
+        "{% block inner %}{{ block.super }}{% for item in items %}{{ item }}"
+        "{% endfor %}{% endblock %}"
+    ),
+    "broken.html": (
+        "{% extends 'base.html' %}{% block inner %}{% include 'missing.html' %}"
+        "{% endblock %}"
+    ),
+}
+
+
+@override_settings(
+    TEMPLATES=[
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "OPTIONS": {
+                "loaders": [
+                    ("django.template.loaders.locmem.Loader", STREAMED_TEMPLATES)
+                ]
+            },
+        }
+    ],
+    STREAMING_CHUNK_SIZE=1,
+)
+class StreamingTests(SimpleTestCase):
+    context = {"title": "<T>", "items": [1, 2]}
+
+    def test_same_output_head_first(self):
+        chunks = list(streaming.stream_template("page.html", self.context))
+        self.assertEqual("".join(chunks), render_to_string("page.html", self.context))
+        self.assertEqual(chunks[0], "<head>H &lt;T&gt;")
+        self.assertGreater(len(chunks), 2)
+
+    def test_render_stream(self):
+        request = RequestFactory().get("/")
+        response = streaming.render_stream(request, "page.html", self.context)
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.is_async)
+        self.assertIn(b"[I]12", b"".join(response.streaming_content))
+
+        with override_settings(STREAMING_RENDER=False):
+            response = streaming.render_stream(request, "page.html", self.context)
+        self.assertFalse(response.streaming)
+
+    def test_error_truncates_the_page(self):
+        chunks = streaming.stream_template("broken.html")
+        self.assertEqual(next(chunks), "<head>H")
+        with self.assertLogs("django", "ERROR") as logs:
+            with self.assertRaises(TemplateDoesNotExist):
+                list(chunks)
+        self.assertIn("broken.html failed, the page is truncated", logs.output[0])
+
+    @override_settings(DATABASE_REPLICAS=["replica"])
+    def test_primary_pin_is_kept_until_closed(self):
+        def view(request):
+            # reads made by the template
+            return streaming.render_stream(request, "page.html", {"items": pinned()})
+
+        def pinned():
+            yield is_pinned()
+
+        request = RequestFactory().get("/")
+        request.COOKIES[settings.REPLICA_PIN_COOKIE] = "1"
+        response = PrimaryPinMiddleware(view)(request)
+        self.assertIn(b"True", b"".join(response))
+        # request_finished closes the database connections
+        with mock.patch("django.http.response.signals.request_finished"):
+            response.close()
+        self.assertFalse(is_pinned())
+
+    def test_asgi_iterates_asynchronously(self):
+        request = AsyncRequestFactory().get("/")
+        response = streaming.render_stream(request, "page.html", self.context)
+        self.assertTrue(response.is_async)
+
+        async def consume():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertEqual(
+            asyncio.run(consume()).decode(),
+            render_to_string("page.html", self.context),
+        )
+
+
+class PreloadTests(SimpleTestCase):
+    def test_preload_freezes_the_structures(self):
+        self.addCleanup(warmup.reset_preload)
+        steps = warmup.run_preload()
+        self.assertEqual(
+            list(steps),
+            [function.__name__ for function in [*warmup.WARMUPS, *warmup.PRELOADS]],
+        )
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+        warmup.reset_preload()
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_worker_memory(self):
+        memory = smaps_rollup(os.getpid())
+        self.assertEqual(set(memory), set(FIELDS))
+        self.assertGreater(memory["Rss"], 0)
+        self.assertLessEqual(private(memory), memory["Rss"])
+
+
+class ReloadTests(SimpleTestCase):
+    def test_ready_workers(self):
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+        self.addCleanup(child.wait)
+        self.addCleanup(child.kill)
+
+        with tempfile.TemporaryDirectory() as directory:
+            pidfile = os.path.join(directory, "gunicorn.pid")
+            self.assertIn(child.pid, reload.children(os.getpid()))
+            self.assertEqual(reload.ready_workers(pidfile, os.getpid()), set())
+
+            reload.mark_ready(pidfile, child.pid)
+            reload.mark_ready(pidfile, 1)  # not a worker of this master
+            self.assertEqual(reload.ready_workers(pidfile, os.getpid()), {child.pid})
+            reload.unmark_ready(pidfile, child.pid)
+            self.assertEqual(reload.ready_workers(pidfile, os.getpid()), set())
+
+    def test_missing_pidfile(self):
+        with self.assertRaises(reload.ReloadError):
+            reload.reload_gunicorn("/nonexistent/gunicorn.pid")
+
+
+class AsyncMiddlewareTests(SimpleTestCase):
+    @override_settings(DEBUG=True, PROFILER_ENABLED=True)
+    def test_async_stack_is_not_adapted(self):
+        # a sync only middleware logs the adaptation of the handler (DEBUG)
+        with self.assertNoLogs("django.request", "DEBUG"):
+            ASGIHandler()
+
+    def test_request_follows_into_sync_code(self):
+        async def view(request):
+            await asyncio.sleep(0)
+            return HttpResponse(await sync_to_async(get_current_request)() is request)
+
+        middleware = ThreadLocalMiddleware(view)
+        requests = [AsyncRequestFactory().get(f"/{n}") for n in range(2)]
+
+        async def both():
+            return await asyncio.gather(*(middleware(r) for r in requests))
+
+        responses = asyncio.run(both())
+        self.assertEqual([r.content for r in responses], [b"True", b"True"])
+
+    @override_settings(DATABASE_REPLICAS=["replica"])
+    def test_write_in_a_thread_pins_the_request(self):
+        async def view(request):
+            await sync_to_async(PrimaryReplicaRouter().db_for_write)(SiteSettings)
+            # the state set in the thread is seen by the request
+            return HttpResponse(is_pinned())
+
+        request = AsyncRequestFactory().get("/")
+        response = asyncio.run(PrimaryPinMiddleware(view)(request))
+        self.assertEqual(response.content, b"True")
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+
+class LoadTestTests(SimpleTestCase):
+    def read(self, data):
+        async def read():
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            response = await loadtest._read_response(reader)
+            return response, await reader.read()
+
+        return asyncio.run(read())
+
+    def test_read_response(self):
+        self.assertEqual(
+            self.read(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}next"),
+            ((200, False), b"next"),
+        )
+        self.assertEqual(
+            self.read(
+                b"HTTP/1.1 404 Not Found\r\nTransfer-Encoding: chunked\r\n"
+                b"Connection: close\r\n\r\n3\r\nabc\r\n0\r\n\r\nnext"
+            ),
+            ((404, True), b"next"),
+        )
+
+    def test_percentiles(self):
+        result = loadtest.LoadResult(2, latencies=[0.01 * n for n in range(100, 0, -1)])
+        self.assertEqual(result.throughput, 50)
+        self.assertEqual(result.percentile(50), 0.51)
+        self.assertEqual(result.percentile(99), 1.0)
+
+
+class StartupTests(SimpleTestCase):
+    def test_aggregate_per_app(self):
+        imports = startup.parse_importtime(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   django.contrib.admin.sites\n"
+            "import time:       300 |        400 | django.contrib.admin\n"
+            "import time:       200 |        200 | django.urls\n"
+            "import time:        50 |        250 | apps.catalog.models\n"
+        )
+        self.assertEqual(imports["django.contrib.admin"], (0.0003, 0.0004))
+        groups = startup.aggregate(imports, ["django.contrib.admin", "apps.catalog"])
+        self.assertEqual(
+            {
+                group: (round(seconds, 6), count)
+                for group, (seconds, count) in groups.items()
+            },
+            {
+                "django.contrib.admin": (0.0004, 2),
+                "django": (0.0002, 1),
+                "apps.catalog": (0.00005, 1),
+            },
+        )
+
+    def test_probe_keeps_the_pythonpath(self):
+        with (
+            mock.patch.dict(os.environ, {"PYTHONPATH": "/vendor"}),
+            mock.patch.object(
+                startup.subprocess, "run", side_effect=RuntimeError
+            ) as run,
+            self.assertRaises(RuntimeError),
+        ):
+            startup.run_probe()
+        self.assertEqual(
+            run.call_args.kwargs["env"]["PYTHONPATH"],
+            os.pathsep.join([os.getcwd(), "/vendor"]),
+        )
+
+    def test_lean_web_worker(self):
+        timings, imports = startup.run_probe("web", "lean")
+        self.assertEqual(timings["deferred"], [])
+        self.assertIn("components/base.py", timings["settings"])
+        self.assertEqual(
+            list(timings["phases"]), ["settings", "apps", "urls", "templates"]
+        )
+        self.assertNotIn("django_extensions", imports)
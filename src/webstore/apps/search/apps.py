@@ -0,0 +1,22 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.search"
+
+    def ready(self):
+        # index the product changes incrementally
+        from . import signals  # noqa: F401
+
+    def warmup(self):
+        from django.contrib.sites.models import Site
+
+        from .autocomplete import get_suggestions
+        from .backends import MemoryBackend, get_backend
+
+        backend = get_backend()
+        if isinstance(backend, MemoryBackend):
+            backend.sync()
+        for site_id in Site.objects.values_list("pk", flat=True):
+            get_suggestions(site_id)
@@ -0,0 +1,202 @@
+"""
+Search box suggestions served from memory.
+
+Every site gets a `Suggestions` structure: a sorted array of folded keys
+(the whole label and each word start, so "benzina" finds "Drujbă pe
+benzină") searched with bisect, plus the precomputed answers of the short
+prefixes where the ranges are the widest. A background thread rebuilds the
+structures when the catalog changed and swaps them in one assignment, the
+requests never wait for a rebuild (but the very first one of a site).
+
+The catalog version is kept in the coordination cache, shared by the
+processes (webstore.coordination), so a change made in one of them (the admin, a
+Celery task) reaches the threads of all the others.
+"""
+
+import heapq
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from time import sleep
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.models import Sum
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from apps.brands.models import Brand
+from apps.catalog.models import Product
+from apps.siteSettings.models import SiteSettings
+from webstore.coordination import cache
+
+from .normalize import fold
+
+logger = logging.getLogger("django")
+
+VERSION_KEY = "search:autocomplete:version"
+LIMIT = 8
+# prefixes up to this length get their answer precomputed
+HOT_PREFIX_LENGTH = 4
+# entries looked at for longer prefixes before ranking, the ones sorted after
+# it are only reached as the prefix gets longer
+MAX_SCAN = 2000
+
+
+class Suggestions:
+    def __init__(self, entries):
+        """`entries` is a list of `(label, kind, url, popularity)`."""
+        self.entries = tuple(
+            {"label": e[0], "kind": e[1], "url": e[2]} for e in entries
+        )
+        self.popularity = array("q", (e[3] for e in entries))
+
+        pairs = sorted(
+            (key, index)
+            for index, (label, *_) in enumerate(entries)
+            for key in self._keys(label)
+        )
+        self.keys = [key for key, index in pairs]
+        self.positions = array("I", (index for key, index in pairs))
+
+        self.hot = {}
+        for key in self.keys:
+            for length in range(1, min(len(key), HOT_PREFIX_LENGTH) + 1):
+                prefix = key[:length]
+                if prefix not in self.hot:
+                    self.hot[prefix] = self._lookup(prefix, scan=len(self.keys))
+
+    @staticmethod
+    def _keys(label):
+        words = fold(label).split()
+        return {" ".join(words[start:]) for start in range(len(words))}
+
+    def _lookup(self, prefix, scan=MAX_SCAN):
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\U0010ffff", lo=start)
+        candidates = set(self.positions[start : min(end, start + scan)])
+        best = heapq.nlargest(
+            LIMIT, candidates, key=lambda index: (self.popularity[index], -index)
+        )
+        return tuple(self.entries[index] for index in best)
+
+    def __call__(self, query):
+        prefix = " ".join(fold(query).split())
+        if not prefix:
+            return ()
+        if len(prefix) <= HOT_PREFIX_LENGTH:
+            return self.hot.get(prefix, ())
+        return self._lookup(prefix)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def build_suggestions(site_id):
+    """
+    Load the suggestions of a site: its brands (ranked by the popularity of
+    their products), the most popular products and the SEO keywords, which
+    go first.
+    """
+    brands = list(
+        Brand.objects.filter(sites=site_id, is_active=True)
+        .annotate(popularity=Sum("products__popularity"))
+        .values_list("name", "slug", "popularity")
+    )
+    products = list(
+        Product.objects.filter(is_active=True, brand__sites=site_id)
+        .order_by("-popularity", "-id")
+        .values_list("title", "popularity")[: settings.AUTOCOMPLETE_PRODUCTS]
+    )
+    top = max(
+        [popularity or 0 for *_, popularity in brands]
+        + [popularity for _, popularity in products]
+        + [0]
+    )
+
+    search_url = reverse("search:index")
+    entries = [
+        (
+            item["value"],
+            "keyword",
+            f"{search_url}?{urlencode({'q': item['value']})}",
+            top + 1,
+        )
+        for site_settings in SiteSettings.objects.filter(site=site_id)
+        for item in site_settings.keywords
+        if item.get("value")
+    ]
+    entries.extend(
+        (name, "brand", reverse("brands:detail", kwargs={"slug": slug}), pop or 0)
+        for name, slug, pop in brands
+    )
+    entries.extend(
+        (title, "product", f"{search_url}?{urlencode({'q': title})}", popularity)
+        for title, popularity in products
+    )
+    return Suggestions(entries)
+
+
+def invalidate():
+    """
+    Ask the background threads of every process to rebuild, called when the
+    sources change.
+    """
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, timeout=None)
+
+
+_suggestions = {}
+_versions = {}
+_lock = threading.Lock()
+_thread = None
+
+
+def _refresh():
+    while True:
+        sleep(settings.AUTOCOMPLETE_REFRESH)
+        version = cache.get(VERSION_KEY, 0)
+        for site_id in list(_suggestions):
+            if _versions.get(site_id) == version:
+                continue
+            try:
+                suggestions = build_suggestions(site_id)
+            except Exception:
+                logger.exception(f"[Autocomplete] Rebuild of site {site_id} failed")
+                continue
+            # readers hold the old structure until they are done with it
+            _suggestions[site_id] = suggestions
+            _versions[site_id] = version
+        connections.close_all()
+
+
+def get_suggestions(site_id):
+    """Return the `Suggestions` of a site, built on the first call."""
+    global _thread
+    suggestions = _suggestions.get(site_id)
+    if suggestions is not None:
+        return suggestions
+
+    with _lock:
+        if site_id not in _suggestions:
+            _versions[site_id] = cache.get(VERSION_KEY, 0)
+            _suggestions[site_id] = build_suggestions(site_id)
+        # started in the worker on first use, never in a forking master
+        if _thread is None:
+            _thread = threading.Thread(
+                target=_refresh, name="autocomplete-refresh", daemon=True
+            )
+            _thread.start()
+    return _suggestions[site_id]
+
+
+async def aget_suggestions(site_id):
+    """`get_suggestions` for the async views, the first build in a thread."""
+    suggestions = _suggestions.get(site_id)
+    if suggestions is not None:
+        return suggestions
+    return await sync_to_async(get_suggestions)(site_id)
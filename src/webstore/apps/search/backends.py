@@ -0,0 +1,301 @@
+"""
+Product search backends.
+
+`FTS5Backend` keeps the analyzed documents in an SQLite FTS5 table and lets
+SQLite rank them with bm25(). `MemoryBackend` is the pure Python fallback
+(databases without FTS5): an inverted index held by every process, kept in
+sync through the change log published in the coordination cache, shared by
+the processes (webstore.coordination).
+
+`search(query, queryset=...)` ranks only the products of the queryset (the
+ones sold on a site), before the limit.
+"""
+
+import heapq
+import logging
+import math
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import islice
+from threading import Lock
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.catalog.models import Product
+from webstore.coordination import cache
+
+from .normalize import analyze
+
+logger = logging.getLogger("django")
+
+# indexed fields and their BM25 weight
+FIELDS = {"title": 10.0, "brand": 5.0, "category": 2.0, "sku": 1.0}
+TABLE = "search_products"
+LIMIT = 48
+CHUNK_SIZE = 2000
+
+
+def documents(pks=None):
+    """
+    Yield `(pk, {field: terms})` for the active products, all of them or
+    the given `pks`.
+    """
+    queryset = Product.objects.filter(is_active=True)
+    if pks is not None:
+        queryset = queryset.filter(pk__in=pks)
+    rows = queryset.values_list("pk", "title", "brand__name", "category__name", "sku")
+    for pk, *values in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield pk, {field: analyze(value) for field, value in zip(FIELDS, values)}
+
+
+def _chunks(iterable, size=CHUNK_SIZE):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class FTS5Backend:
+    name = "fts5"
+
+    def rebuild(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE}")
+            count = self._insert(cursor, documents())
+        return count
+
+    def update(self, pks):
+        """Reindex `pks`, the ones gone or inactive are dropped."""
+        pks = list(pks)
+        with transaction.atomic(), connection.cursor() as cursor:
+            for chunk in _chunks(pks):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(
+                    f"DELETE FROM {TABLE} WHERE rowid IN ({placeholders})", chunk
+                )
+            return self._insert(cursor, documents(pks))
+
+    def _insert(self, cursor, docs):
+        count = 0
+        for chunk in _chunks(docs):
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (rowid, {', '.join(FIELDS)}) "
+                f"VALUES (%s{', %s' * len(FIELDS)})",
+                [
+                    (pk, *(" ".join(fields[field]) for field in FIELDS))
+                    for pk, fields in chunk
+                ],
+            )
+            count += len(chunk)
+        return count
+
+    def search(self, query, limit=LIMIT, queryset=None):
+        terms = analyze(query)
+        if not terms:
+            return []
+        # every term is required, the last one is a prefix (search as you type)
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        weights = ", ".join(str(weight) for weight in FIELDS.values())
+        where, params = f"{TABLE} MATCH %s", [match]
+        if queryset is not None:
+            sql, subquery_params = queryset.values("pk").query.sql_with_params()
+            where += f" AND rowid IN ({sql})"
+            params += subquery_params
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {TABLE} WHERE {where} "
+                f"ORDER BY bm25({TABLE}, {weights}) LIMIT %s",
+                [*params, limit],
+            )
+            return [pk for (pk,) in cursor.fetchall()]
+
+
+VERSION_KEY = "search:version"
+CHANGES_KEY = "search:changes:{version}"
+CHANGES_TIMEOUT = 60 * 60 * 24
+
+
+class MemoryBackend:
+    """
+    BM25F over an in-process inverted index.
+
+    Every process loads the index once, then replays the product ids
+    published for each version bump (falling back to a full load when the
+    change log expired) before answering a query.
+    """
+
+    name = "memory"
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self.version = None
+        self._lock = Lock()
+        self._reset()
+
+    def _reset(self):
+        # term -> {pk: saturated term frequency}, the BM25 part that doesn't
+        # depend on the query is computed at indexing time
+        self.postings = defaultdict(dict)
+        self.terms = {}  # pk -> terms, to drop them on update
+        self.average = 1.0  # average document length, fixed at load time
+        self._vocabulary = None  # sorted terms, for the prefix lookups
+
+    @staticmethod
+    def _frequencies(fields):
+        frequencies = defaultdict(float)
+        for field, weight in FIELDS.items():
+            for term in fields[field]:
+                frequencies[term] += weight
+        return frequencies
+
+    def _add(self, pk, frequencies):
+        length = sum(frequencies.values())
+        norm = self.k1 * (1 - self.b + self.b * length / self.average)
+        for term, frequency in frequencies.items():
+            self.postings[term][pk] = frequency * (self.k1 + 1) / (frequency + norm)
+        self.terms[pk] = tuple(frequencies)
+
+    def _remove(self, pk):
+        for term in self.terms.pop(pk, ()):
+            postings = self.postings[term]
+            postings.pop(pk, None)
+            if not postings:
+                del self.postings[term]
+
+    def _apply(self, pks):
+        for pk in pks:
+            self._remove(pk)
+        for pk, fields in documents(pks):
+            self._add(pk, self._frequencies(fields))
+        self._vocabulary = None
+
+    def _load(self, version):
+        self._reset()
+        docs = [(pk, self._frequencies(fields)) for pk, fields in documents()]
+        if docs:
+            self.average = sum(sum(f.values()) for pk, f in docs) / len(docs)
+        for pk, frequencies in docs:
+            self._add(pk, frequencies)
+        self.version = version
+        logger.info(f"[Search] Loaded {len(docs)} documents in memory")
+
+    def sync(self):
+        version = cache.get(VERSION_KEY, 0)
+        if version == self.version:
+            return
+        with self._lock:
+            if self.version is None or version < self.version:
+                self._load(version)
+                return
+            keys = [
+                CHANGES_KEY.format(version=v)
+                for v in range(self.version + 1, version + 1)
+            ]
+            changes = cache.get_many(keys)
+            if len(changes) != len(keys):
+                self._load(version)
+                return
+            self._apply({pk for pks in changes.values() for pk in pks})
+            self.version = version
+
+    @staticmethod
+    def _bump_version():
+        try:
+            return cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, 1, timeout=None)
+            return 1
+
+    def rebuild(self):
+        version = self._bump_version()
+        # no change log for this version, every process reloads
+        with self._lock:
+            self._load(version)
+        return len(self.terms)
+
+    def update(self, pks):
+        pks = list(pks)
+        version = self._bump_version()
+        cache.set(CHANGES_KEY.format(version=version), pks, timeout=CHANGES_TIMEOUT)
+        self.sync()
+        return len(pks)
+
+    def _expand(self, prefix):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        for term in islice(vocabulary, start, None):
+            if not term.startswith(prefix):
+                break
+            yield term
+
+    def search(self, query, limit=LIMIT, queryset=None):
+        self.sync()
+        terms = analyze(query)
+        if not terms or not self.terms:
+            return []
+
+        # postings per query term, the last one matches as a prefix
+        groups = [self.postings.get(term, {}) for term in terms[:-1]]
+        last = {}
+        for term in self._expand(terms[-1]):
+            for pk, weight in self.postings[term].items():
+                last[pk] = last.get(pk, 0.0) + weight
+        groups.append(last)
+
+        groups.sort(key=len)
+        candidates = groups[0].keys()
+        for postings in groups[1:]:
+            candidates = candidates & postings.keys()
+            if not candidates:
+                return []
+
+        total = len(self.terms)
+        scores = dict.fromkeys(candidates, 0.0)
+        for postings in groups:
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for pk in scores:
+                scores[pk] += idf * postings[pk]
+
+        def rank(pk):
+            return -scores[pk], pk
+
+        if queryset is None:
+            return heapq.nsmallest(limit, scores, key=rank)
+        # only the best ranked candidates are looked up in the queryset, a
+        # chunk at a time until the limit is reached, not the products of the
+        # whole site
+        found = []
+        ranked = sorted(scores, key=rank)
+        for start in range(0, len(ranked), CHUNK_SIZE):
+            chunk = ranked[start : start + CHUNK_SIZE]
+            allowed = set(queryset.filter(pk__in=chunk).values_list("pk", flat=True))
+            found.extend(pk for pk in chunk if pk in allowed)
+            if len(found) >= limit:
+                break
+        return found[:limit]
+
+
+def fts5_available():
+    if connection.vendor != "sqlite":
+        return False
+    return TABLE in connection.introspection.table_names()
+
+
+_backend = None
+_backend_lock = Lock()
+
+
+def get_backend():
+    """Return the configured backend, FTS5 when the database supports it."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = settings.SEARCH_BACKEND or (
+                    "fts5" if fts5_available() else "memory"
+                )
+                _backend = FTS5Backend() if name == "fts5" else MemoryBackend()
+    return _backend
@@ -0,0 +1,68 @@
+import random
+from time import perf_counter
+
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+from django.utils import translation
+
+from apps.search.autocomplete import build_suggestions
+
+
+def _percentile(timings, percent):
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(len(timings) * percent / 100))]
+
+
+class Command(BaseCommand):
+    help = "Report the autocomplete latency, in memory and through the endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queries", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--domain", help="defaults to the first configured site")
+
+    def handle(self, *args, **options):
+        sites = Site.objects.order_by("pk")
+        if options["domain"]:
+            site = sites.get(domain=options["domain"])
+        else:
+            site = sites.filter(sitesettings__isnull=False).first() or sites.first()
+        start = perf_counter()
+        suggestions = build_suggestions(site.pk)
+        self.stdout.write(
+            self.style.NOTICE(
+                f"📊 {site.domain}: {len(suggestions)} suggestions, "
+                f"{len(suggestions.keys)} keys, built in {perf_counter() - start:.2f}s"
+            )
+        )
+
+        # what people type: the first 1 to 12 characters of a key
+        rng = random.Random(options["seed"])
+        queries = [
+            key[: rng.randrange(1, 13)]
+            for key in rng.choices(suggestions.keys, k=options["queries"])
+        ]
+
+        lookups = []
+        for query in queries:
+            start = perf_counter()
+            suggestions(query)
+            lookups.append((perf_counter() - start) * 1000)
+
+        with translation.override("ro"):
+            url = reverse("webstore:autocomplete")
+        client = Client(HTTP_HOST=site.domain)
+        client.get(url, {"q": "a"})  # builds the structure of the worker
+        requests = []
+        for query in queries:
+            start = perf_counter()
+            client.get(url, {"q": query})
+            requests.append((perf_counter() - start) * 1000)
+
+        for name, timings in (("lookup", lookups), ("endpoint", requests)):
+            self.stdout.write(
+                f"  {name:<9} p50 {_percentile(timings, 50):6.3f} ms  "
+                f"p99 {_percentile(timings, 99):6.3f} ms"
+            )
@@ -0,0 +1,85 @@
+import random
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.catalog.models import Product
+from apps.search.backends import FTS5Backend, MemoryBackend, fts5_available
+from apps.search.normalize import fold
+
+
+def _percentile(timings, percent):
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(len(timings) * percent / 100))]
+
+
+class Command(BaseCommand):
+    help = "Report the p50/p99 search latency of the FTS5 and in-memory backends"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queries", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--rebuild", action="store_true")
+
+    def handle(self, *args, **options):
+        documents = Product.objects.filter(is_active=True).count()
+        if documents < 100_000:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"⚠️ Only {documents} products, run generate_catalog for 100k"
+                )
+            )
+        if not documents:
+            raise CommandError("No products to search.")
+
+        queries = self.sample_queries(
+            options["queries"], random.Random(options["seed"])
+        )
+
+        backends = [MemoryBackend()]
+        if fts5_available():
+            backends.insert(0, FTS5Backend())
+
+        self.stdout.write(
+            self.style.NOTICE(f"📊 {documents} documents, {len(queries)} queries")
+        )
+        for backend in backends:
+            start = perf_counter()
+            if options["rebuild"] or backend.name == "memory":
+                backend.rebuild()
+            loaded = perf_counter() - start
+
+            timings, hits = [], 0
+            for query in queries:
+                start = perf_counter()
+                hits += bool(backend.search(query))
+                timings.append((perf_counter() - start) * 1000)
+            self.stdout.write(
+                f"  {backend.name:<7} p50 {_percentile(timings, 50):7.2f} ms  "
+                f"p99 {_percentile(timings, 99):7.2f} ms  "
+                f"hits {hits / len(queries):.0%}  (built in {loaded:.1f}s)"
+            )
+
+    def sample_queries(self, count, rng):
+        """
+        Build queries from real titles: one or two words, typed without
+        diacritics half of the time and cut short (search as you type).
+        """
+        titles = list(
+            Product.objects.filter(is_active=True)
+            .order_by("?")
+            .values_list("title", "brand__name")[:count]
+        )
+        queries = []
+        for title, brand in titles:
+            words = [word for word in title.split() if len(word) > 2] or [brand]
+            picked = rng.sample(words, k=min(len(words), rng.choice((1, 2))))
+            if rng.random() < 0.3:
+                picked.append(brand)
+            query = " ".join(picked)
+            if rng.random() < 0.5:
+                query = fold(query)
+            if rng.random() < 0.3:
+                query = query[: max(3, len(query) - rng.randrange(1, 4))]
+            queries.append(query)
+        return queries
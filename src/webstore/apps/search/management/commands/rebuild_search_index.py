@@ -0,0 +1,20 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from apps.search.backends import get_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the product search index from scratch"
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        start = perf_counter()
+        count = backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {count} products indexed ({backend.name}) "
+                f"in {perf_counter() - start:.1f}s"
+            )
+        )
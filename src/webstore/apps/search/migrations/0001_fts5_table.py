@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_table(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if not cursor.fetchone()[0]:
+            return
+    # the columns hold the analyzed terms (folded and stemmed)
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_products "
+        "USING fts5(title, brand, category, sku, tokenize='unicode61')"
+    )
+
+
+def drop_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS search_products")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0002_product_attributes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_table, drop_table),
+    ]
@@ -0,0 +1,63 @@
+"""
+Romanian-aware text normalization shared by the indexer and the queries.
+
+Both sides go through `analyze()` so "Bormașini", "bormasina" and the
+legacy cedilla spelling "Bormaşină" end up on the same term.
+"""
+
+import re
+import unicodedata
+
+# legacy cedilla letters (ISO-8859-2 era) to the comma-below ones
+_LEGACY = str.maketrans("şŞţŢ", "șȘțȚ")
+_FOLD = str.maketrans("ăâîșțĂÂÎȘȚ", "aaistaaist")
+_TOKEN = re.compile(r"\w+")
+
+# inflection endings, longest first: plural, definite article and genitive
+_SUFFIXES = (
+    "urilor",
+    "ilor",
+    "elor",
+    "urile",
+    "ului",
+    "uri",
+    "ile",
+    "ele",
+    "lor",
+    "ul",
+    "ii",
+    "ei",
+    "le",
+    "a",
+    "e",
+    "i",
+    "u",
+)
+MIN_STEM = 3
+
+
+def fold(text):
+    """Lowercase and strip the diacritics (Romanian ones and any other)."""
+    text = text.translate(_LEGACY).lower().translate(_FOLD)
+    if text.isascii():
+        return text
+    return "".join(
+        char
+        for char in unicodedata.normalize("NFKD", text)
+        if not unicodedata.combining(char)
+    )
+
+
+def stem(token):
+    """Light suffix stripping, tokens holding digits (models, SKUs) are kept."""
+    if not token.isalpha():
+        return token
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            return token[: -len(suffix)]
+    return token
+
+
+def analyze(text):
+    """Return the index terms of `text`."""
+    return [stem(token) for token in _TOKEN.findall(fold(text or ""))]
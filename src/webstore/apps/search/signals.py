@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.brands.models import Brand
+from apps.catalog.models import Category, Product
+from apps.siteSettings.models import SiteSettings
+
+from . import autocomplete
+from .tasks import index_products
+
+
+def _schedule(pks):
+    if pks:
+        transaction.on_commit(lambda: index_products.delay(pks))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_changed(sender, instance, **kwargs):
+    _schedule([instance.pk])
+    autocomplete.invalidate()
+
+
+@receiver(post_save, sender=Brand)
+@receiver(post_save, sender=Category)
+def name_changed(sender, instance, created, **kwargs):
+    # the brand and category names are part of the product documents
+    if not created:
+        _schedule(list(instance.products.values_list("pk", flat=True)))
+
+
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+@receiver(post_save, sender=SiteSettings)
+def suggestions_changed(sender, **kwargs):
+    autocomplete.invalidate()
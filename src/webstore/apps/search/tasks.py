@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from .backends import get_backend
+
+
+@shared_task(ignore_result=True)
+def index_products(pks):
+    return get_backend().update(pks)
+
+
+@shared_task(ignore_result=True)
+def rebuild_index():
+    return get_backend().rebuild()
@@ -0,0 +1,190 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.sites.models import Site
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from apps.brands.models import Brand
+from apps.catalog.models import Category, Product
+from apps.siteSettings.models import SiteSettings
+from webstore.coordination import cache
+
+from . import autocomplete, backends, views
+
+from .backends import FTS5Backend, MemoryBackend, fts5_available, get_backend
+from .normalize import analyze, fold
+
+
+class NormalizeTests(SimpleTestCase):
+    def test_diacritics_are_folded(self):
+        # comma-below, legacy cedilla and no diacritics at all
+        self.assertEqual(fold("Șurubelniță"), "surubelnita")
+        self.assertEqual(fold("Şurubelniţă"), "surubelnita")
+        self.assertEqual(fold("ÎNCĂRCĂTOR câine"), "incarcator caine")
+
+    def test_inflections_share_a_stem(self):
+        forms = ("bormașină", "Bormaşini", "bormasinile", "bormașinii", "bormașinilor")
+        self.assertEqual({analyze(form)[0] for form in forms}, {"bormasin"})
+
+    def test_codes_are_kept(self):
+        self.assertEqual(analyze("GSR 18V-55"), ["gsr", "18v", "55"])
+
+
+class BackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        bosch = Brand.objects.create(name="Bosch")
+        stihl = Brand.objects.create(name="Stihl")
+        cls.drills = Category.objects.create(name="Scule")
+        cls.products = {
+            sku: Product.objects.create(
+                brand=brand, category=cls.drills, sku=sku, title=title, price=10
+            )
+            for sku, brand, title in (
+                ("B1", bosch, "Bormașină cu acumulator GSR 18V"),
+                ("B2", bosch, "Șurubelniță electrică"),
+                ("S1", stihl, "Drujbă pe benzină"),
+                ("S2", stihl, "Bormașină electrică cu fir"),
+            )
+        }
+
+    def setUp(self):
+        cache.clear()
+        self.backends = [MemoryBackend()]
+        if fts5_available():
+            self.backends.append(FTS5Backend())
+        for backend in self.backends:
+            backend.rebuild()
+
+    def assertFound(self, query, skus):
+        skus_by_pk = {product.pk: sku for sku, product in self.products.items()}
+        for backend in self.backends:
+            with self.subTest(backend=backend.name, query=query):
+                found = [skus_by_pk[pk] for pk in backend.search(query)]
+                self.assertEqual(found, skus)
+
+    def test_backends_are_available(self):
+        self.assertEqual(len(self.backends), 2)
+
+    def test_folded_and_inflected_queries(self):
+        self.assertFound("bormasini", ["S2", "B1"])
+        self.assertFound("şurubelniţe", ["B2"])
+        self.assertFound("stihl bormașină", ["S2"])
+
+    def test_last_term_is_a_prefix(self):
+        self.assertFound("bosch suru", ["B2"])
+
+    def test_title_outranks_brand(self):
+        # "bosch" only appears in the brand field, "electric" in titles
+        self.assertFound("electric", ["B2", "S2"])
+        Product.objects.filter(sku="S1").update(title="Drujbă Bosch")
+        for backend in self.backends:
+            backend.update([self.products["S1"].pk])
+        self.assertFound("bosch", ["S1", "B2", "B1"])
+
+    def test_updates_are_incremental(self):
+        other_process = MemoryBackend()
+        other_process.sync()
+
+        Product.objects.filter(sku="B2").update(is_active=False)
+        for backend in self.backends:
+            backend.update([self.products["B2"].pk])
+        self.assertFound("surubelnita", [])
+
+        # the other process replays the change log, without reloading
+        with self.assertNumQueries(1):
+            self.assertEqual(other_process.search("surubelnita"), [])
+
+    def test_queryset_is_filtered_before_the_limit(self):
+        stihl = Product.objects.filter(brand__name="Stihl")
+        skus_by_pk = {product.pk: sku for sku, product in self.products.items()}
+        for backend in self.backends:
+            with self.subTest(backend=backend.name):
+                # B2 outranks S2 and would take the only place
+                found = backend.search("electric", limit=1, queryset=stihl)
+                self.assertEqual([skus_by_pk[pk] for pk in found], ["S2"])
+                self.assertEqual(backend.search("surubelnita", queryset=stihl), [])
+
+    def test_memory_backend_looks_up_the_best_ranked_first(self):
+        stihl = Product.objects.filter(brand__name="Stihl")
+        backend = self.backends[0]
+        backend.search("electric")  # sync
+        with mock.patch.object(backends, "CHUNK_SIZE", 1):
+            # B2 in the first chunk, S2 in the second, the rest isn't looked up
+            with self.assertNumQueries(2):
+                found = backend.search("electric", limit=1, queryset=stihl)
+        self.assertEqual(found, [self.products["S2"].pk])
+
+    def test_signals_reindex_after_commit(self):
+        # only the configured backend follows the signals
+        self.backends = [get_backend()]
+        product = self.products["S1"]
+        with self.captureOnCommitCallbacks(execute=True):
+            product.title = "Motocoasă"
+            product.save()
+        self.assertFound("motocoasa", ["S1"])
+        self.assertFound("drujba", [])
+
+
+class AutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(domain="shop.test", name="shop")
+        SiteSettings.objects.create(
+            site=cls.site, name="shop", keywords=[{"value": "Scule electrice"}]
+        )
+        bosch = Brand.objects.create(name="Bosch")
+        bosch.sites.add(cls.site)
+        for sku, title, popularity in (
+            ("B1", "Bormașină cu acumulator", 50),
+            ("B2", "Bormașină cu fir", 80),
+            ("B3", "Drujbă pe benzină", 10),
+        ):
+            Product.objects.create(
+                brand=bosch, sku=sku, title=title, price=1, popularity=popularity
+            )
+        # not sold on the site
+        Brand.objects.create(name="Bormax")
+
+    def setUp(self):
+        autocomplete._suggestions.clear()
+        self.suggestions = autocomplete.build_suggestions(self.site.pk)
+
+    def labels(self, query):
+        return [suggestion["label"] for suggestion in self.suggestions(query)]
+
+    def test_ranked_by_popularity(self):
+        self.assertEqual(
+            self.labels("bor"), ["Bormașină cu fir", "Bormașină cu acumulator"]
+        )
+        # keywords first, then the brand with the popularity of its products
+        self.assertEqual(self.labels("s")[0], "Scule electrice")
+        self.assertEqual(self.labels("BOS"), ["Bosch"])
+
+    def test_matches_word_starts_without_diacritics(self):
+        self.assertEqual(self.labels("benzina"), ["Drujbă pe benzină"])
+        self.assertEqual(self.labels("bormasina cu a"), ["Bormașină cu acumulator"])
+        self.assertEqual(self.labels("xyz"), [])
+
+    def test_hot_prefixes_match_the_lookup(self):
+        for prefix in ("b", "bo", "bor", "borm", "scu"):
+            with self.subTest(prefix=prefix):
+                self.assertEqual(
+                    self.suggestions(prefix), self.suggestions._lookup(prefix)
+                )
+
+    def test_endpoint(self):
+        autocomplete._suggestions[self.site.pk] = self.suggestions
+        request = RequestFactory().get("/", {"q": "drujba"})
+        request.site = self.site
+        with self.assertNumQueries(0):
+            response = async_to_sync(views.autocomplete)(request)
+        self.assertEqual(
+            [s["label"] for s in json.loads(response.content)["suggestions"]],
+            ["Drujbă pe benzină"],
+        )
+        self.assertTrue(
+            reverse("webstore:autocomplete").endswith("/webstore/autocomplete/")
+        )
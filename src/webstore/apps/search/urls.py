@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import index
+
+app_name = "search"
+urlpatterns = [
+    path("", index, name="index"),
+]
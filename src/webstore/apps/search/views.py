@@ -0,0 +1,33 @@
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.views.decorators.cache import cache_control
+
+from apps.catalog.models import Product
+
+from .autocomplete import aget_suggestions
+from .backends import get_backend
+
+
+def index(request):
+    query = request.GET.get("q", "").strip()[:200]
+    products = []
+    if query:
+        sold = Product.objects.filter(is_active=True, brand__sites=request.site)
+        # the products of the other sites don't take the places of the limit
+        pks = get_backend().search(query, queryset=sold)
+        found = sold.select_related("brand").in_bulk(pks)
+        # keep the ranking of the index
+        products = [found[pk] for pk in pks if pk in found]
+
+    return render(
+        request,
+        template_name="search/index.html",
+        context={"query": query, "products": products},
+    )
+
+
+@cache_control(public=True, max_age=60)
+async def autocomplete(request):
+    query = request.GET.get("q", "")[:100]
+    suggestions = (await aget_suggestions(request.site.pk))(query)
+    return JsonResponse({"query": query, "suggestions": list(suggestions)})
@@ -1,21 +1,33 @@
 import logging
 
 from django.contrib import admin
+from django.db import transaction
+from django.utils import timezone
 from django.utils.html import format_html
+from import_export.admin import ImportExportModelAdmin
 
 from .forms import SiteSettingsForm, SocialMediaForm
+from .hosts import invalidate
+from .resources import SiteSettingsResource, SocialMediaResource
 from apps.siteSettings.models import SiteSettings, SocialMedia
 
 logger = logging.getLogger("django_file")
 
 
-class SocialMediaAdmin(admin.ModelAdmin):
+@admin.register(SocialMedia)
+class SocialMediaAdmin(ImportExportModelAdmin):
     model = SocialMedia
     form = SocialMediaForm
+    resource_classes = [SocialMediaResource]
     extra = 0
     readonly_fields = ("icon",)
+    list_display = ("siteSettings", "platform_fld", "profile_name", "icon")
+    list_filter = ("platform",)
+    list_select_related = ("siteSettings",)
 
-    fieldsets = [(None, {"fields": (("platform_fld", "profile_name", "icon"),)})]
+    fieldsets = [
+        (None, {"fields": (("siteSettings", "platform", "profile_name", "icon"),)})
+    ]
 
     class Media:
         # Add Font Awesome for icons
@@ -28,9 +40,13 @@ class SocialMediaAdmin(admin.ModelAdmin):
 
 
 @admin.register(SiteSettings)
-class SiteSettingsAdmin(admin.ModelAdmin):
+class SiteSettingsAdmin(ImportExportModelAdmin):
     form = SiteSettingsForm
+    resource_classes = [SiteSettingsResource]
     # inlines = (SocialMediaAdmin,)
+    actions = ("enable_maintenance", "disable_maintenance")
+    list_filter = ("maintenance_mode",)
+    list_select_related = ("site",)
 
     list_display = (
         "site",
@@ -43,6 +59,7 @@ class SiteSettingsAdmin(admin.ModelAdmin):
         "copyright",
         "theme_color_fld",
         "background_color_fld",
+        "maintenance_mode",
     )
 
     fieldsets = [
@@ -75,6 +92,24 @@ class SiteSettingsAdmin(admin.ModelAdmin):
         form.base_fields["site"].widget.can_view_related = False
         return form
 
+    @admin.action(description="Turn the maintenance mode on")
+    def enable_maintenance(self, request, queryset):
+        self.set_maintenance(request, queryset, True)
+
+    @admin.action(description="Turn the maintenance mode off")
+    def disable_maintenance(self, request, queryset):
+        self.set_maintenance(request, queryset, False)
+
+    def set_maintenance(self, request, queryset, enabled):
+        # one UPDATE and one reload of the host tables for all the sites
+        with transaction.atomic():
+            updated = queryset.update(maintenance_mode=enabled, modified=timezone.now())
+            transaction.on_commit(invalidate)
+        self.message_user(
+            request,
+            f"Maintenance mode {'on' if enabled else 'off'} for {updated} site(s)",
+        )
+
     def theme_color_fld(self, obj):
         return format_html(
             f'<span class="admin-color-box" style="background-color:{obj.theme_color};font-size:1.3em;"></span>'
@@ -7,4 +7,18 @@ class SitesettingsConfig(AppConfig):
     verbose_name = "Site Settings"
 
     def ready(self):
-        pass
+        # reload the host tables when the sites change
+        from . import signals  # noqa: F401
+
+    def warmup(self):
+        from webstore.context_processors.settings import build_exported_settings
+        from webstore.utils.domains import split_domain
+
+        from .hosts import get_table
+        from .models import SiteSettings
+
+        build_exported_settings()
+        for host in get_table().hosts.values():
+            split_domain(host.site.domain)
+        # opens the connection of the worker and loads the model metadata
+        list(SiteSettings.objects.select_related("site"))
@@ -1,26 +1,36 @@
 import logging
-from tldextract import extract as domain_extract
 
 from django.conf import settings
-from django.contrib.sites.models import Site
 
-from ..models import SiteSettings
+from packages.opengraph import static_image_dimensions
+from webstore.context_processors.lazy import lazy_context
+from webstore.utils.domains import domain_name
+
+from ..hosts import get_table, raw_host
 
 logger = logging.getLogger("django")
 
 
+@lazy_context("global_seo")
 def global_seo(request):
     overwrite = request.session.get("seo", {})
 
-    try:
-        seo = SiteSettings.objects.get(site__domain=request.site)
-    except SiteSettings.DoesNotExist:
-        seo = None
+    # resolved by HostCanonicalMiddleware, the settings and social profiles
+    # of the site are loaded with the host table
+    host = getattr(request, "host", None) or get_table().lookup(raw_host(request))
+    site_seo = host.seo if host else None
+    seo = site_seo.settings if site_seo else None
 
     defaults = settings.DEFAULT_SEO
 
-    image = f'{request.build_absolute_uri()}{overwrite.get("image", getattr(seo, "image", defaults.get("IMAGE")))[1:]}'
-    domain = domain_extract(request.site.domain).domain
+    image = overwrite.get("image", getattr(seo, "image", defaults.get("IMAGE")))
+    # read once per process
+    image_width, image_height = (
+        static_image_dimensions(image)
+        if image.startswith(settings.STATIC_URL)
+        else (None, None)
+    )
+    domain = domain_name(request.site.domain)
 
     return {
         "global_seo": {
@@ -61,7 +71,7 @@ def global_seo(request):
             ),
             "twitter_handle": overwrite.get(
                 "twitter_handle",
-                getattr(seo, "twitter_handle", defaults.get("twitter_handle")),
+                getattr(seo, "twitter_handle", defaults.get("TWITTER_SITE")),
             ),
             "absolut_url": request.build_absolute_uri(),
             "theme_color": overwrite.get(
@@ -71,7 +81,14 @@ def global_seo(request):
                 "og_site_name",
                 getattr(seo, "og_site_name", defaults.get("OG_SITE_NAME")),
             ),
-            "image": image,
+            "image": request.build_absolute_uri(image),
+            "image_width": image_width,
+            "image_height": image_height,
             "domain": domain,
+            "social": site_seo.social if site_seo else (),
+            "same_as": site_seo.same_as if site_seo else (),
+            "organization": site_seo.organization if site_seo else "",
+            "website": site_seo.website if site_seo else "",
+            "social_links": site_seo.social_links if site_seo else "",
         }
     }
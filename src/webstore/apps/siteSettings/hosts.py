@@ -0,0 +1,120 @@
+"""
+The hosts served by the process, resolved without a query.
+
+The table maps every site domain and its www/non-www alias to the `Site`,
+its maintenance state (SiteSettings.maintenance_mode, on for the sites
+without settings, like the maintenance backend always did), its SEO payload
+(`seo.SiteSEO`) and, for the alias, the canonical domain to redirect to. It
+is loaded once per process and reloaded when a Site, SiteSettings or
+SocialMedia changed: the version is kept in the coordination cache, shared
+by the processes (webstore.coordination), and checked at most every
+HOST_TABLE_REFRESH seconds, so a change made in one process (the admin, an
+import) reaches the others within that delay.
+"""
+
+import logging
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic, time_ns
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sites.models import Site
+
+from webstore.coordination import cache
+
+from . import seo as site_seo
+
+logger = logging.getLogger("django")
+
+VERSION_KEY = "siteSettings:hosts:version"
+
+
+@dataclass(frozen=True)
+class Host:
+    site: Site
+    maintenance: bool
+    # the canonical domain of an alias
+    redirect: str | None = None
+    # None for the sites without settings
+    seo: site_seo.SiteSEO | None = None
+
+
+class HostTable:
+    def __init__(self, sites, seo, version=None):
+        """`seo` is {site id: `SiteSEO`} of the sites with settings."""
+        self.version = version
+        self.checked = monotonic()
+        self.hosts = {}
+        for site in sites:
+            domain = site.domain.lower()
+            payload = seo.get(site.pk)
+            in_maintenance = payload.settings.maintenance_mode if payload else True
+            self.hosts[domain] = Host(site, in_maintenance, seo=payload)
+            alias = domain[4:] if domain.startswith("www.") else f"www.{domain}"
+            # a site may be configured with both names
+            self.hosts.setdefault(alias, Host(site, in_maintenance, domain, payload))
+
+    @classmethod
+    def load(cls, version=None):
+        table = cls(Site.objects.all(), site_seo.load(), version)
+        logger.info(f"[Hosts] Loaded {len(table.hosts)} hosts")
+        return table
+
+    def lookup(self, host):
+        """The `Host` of a lower-cased Host header, with or without its port."""
+        found = self.hosts.get(host)
+        if found is None:
+            name, _, port = host.rpartition(":")
+            if port.isdigit():
+                found = self.hosts.get(name)
+        return found
+
+    def __len__(self):
+        return len(self.hosts)
+
+
+def raw_host(request):
+    """The Host header as sent (lower-cased), before the ALLOWED_HOSTS checks."""
+    if settings.USE_X_FORWARDED_HOST and "HTTP_X_FORWARDED_HOST" in request.META:
+        return request.META["HTTP_X_FORWARDED_HOST"].lower()
+    return request.META.get("HTTP_HOST", "").lower()
+
+
+def invalidate():
+    """Reload the tables of all the processes, called when the sites change."""
+    global _table
+    # a new value, never one a process may still hold (a counter restarts
+    # from 1 when the key is lost)
+    cache.set(VERSION_KEY, time_ns(), timeout=None)
+    _table = None
+
+
+_table = None
+_lock = Lock()
+
+
+def get_table():
+    """Return the process wide `HostTable`, loaded on the first call."""
+    global _table
+    table = _table
+    if table is not None and monotonic() - table.checked < settings.HOST_TABLE_REFRESH:
+        return table
+
+    with _lock:
+        # a lost key (evicted, the cache flushed) gets a new version as well:
+        # every process reloads rather than keep a table it can't check
+        version = cache.get_or_set(VERSION_KEY, time_ns, timeout=None)
+        if _table is None or _table.version != version:
+            _table = HostTable.load(version)
+        else:
+            _table.checked = monotonic()
+        return _table
+
+
+async def aget_table():
+    """`get_table` for the async middlewares, the checks and loads in a thread."""
+    table = _table
+    if table is not None and monotonic() - table.checked < settings.HOST_TABLE_REFRESH:
+        return table
+    return await sync_to_async(get_table)()
@@ -1,12 +1,10 @@
 import logging
 
-from django.contrib.sites.models import Site
-
 from maintenance_mode.backends import AbstractStateBackend
 
 from webstore.threadlocals import get_current_request
 
-from .models import SiteSettings
+from .hosts import get_table, raw_host
 
 logger = logging.getLogger("django")
 
@@ -18,13 +16,8 @@ class MaintenanceBackend(AbstractStateBackend):
         if request is None:
             return True
 
-        try:
-            current_site = Site.objects.get(domain=request.get_host())
-        except Site.DoesNotExist:
-            return True
-
-        try:
-            site_settings = SiteSettings.objects.get(site=current_site)
-            return site_settings.get_maintenance
-        except SiteSettings.DoesNotExist:
+        # resolved by HostCanonicalMiddleware
+        host = getattr(request, "host", None) or get_table().lookup(raw_host(request))
+        if host is None:
             return True
+        return host.maintenance
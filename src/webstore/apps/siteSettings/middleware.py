@@ -1,9 +1,74 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.contrib.sites.shortcuts import get_current_site
+from django.http import HttpResponsePermanentRedirect
+
+from .hosts import aget_table, get_table, raw_host
+
+
+class HostCanonicalMiddleware:
+    """
+    Resolve the host of the request from the host table (`hosts.py`): the
+    www/non-www alias of a site is redirected to its domain, the others get
+    `request.site` (CurrentSiteMiddleware without the lookup) and
+    `request.host`. The unknown hosts go through the usual validation and
+    site lookup.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.resolve(request, get_table())
+        if response is None and not hasattr(request, "site"):
+            request.site = get_current_site(request)
+        return response or self.get_response(request)
+
+    async def __acall__(self, request):
+        response = self.resolve(request, await aget_table())
+        if response is None and not hasattr(request, "site"):
+            request.site = await sync_to_async(get_current_site)(request)
+        return response or await self.get_response(request)
+
+    def resolve(self, request, table):
+        host = raw_host(request)
+        found = table.lookup(host)
+        if found is None:
+            return None
+        if found.redirect:
+            name, _, port = host.rpartition(":")
+            port = f":{port}" if name and port.isdigit() else ""
+            return HttpResponsePermanentRedirect(
+                f"{request.scheme}://{found.redirect}{port}{request.get_full_path()}"
+            )
+        request.site = found.site
+        request.host = found
+
+
 class SEOMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        response = self.get_response(request)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process(self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process(await self.get_response(request))
+
+    def process(self, response):
         if hasattr(response, "context_data"):
             response.context_data.setdefault("seo", {})
         return response
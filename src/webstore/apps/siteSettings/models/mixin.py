@@ -1,19 +1,56 @@
+from django.core.files.images import get_image_dimensions
 from django.db import models
 
 
+def read_image_dimensions(image):
+    """(width, height) of an image file, 0 when it is missing or unreadable."""
+    try:
+        width, height = get_image_dimensions(image)
+    except OSError:
+        width = height = None
+    finally:
+        # a stored file opened for the header only
+        if getattr(image, "_committed", False):
+            image.close()
+    return width or 0, height or 0
+
+
 class SEOMixin(models.Model):
     meta_title = models.CharField("Meta Title", max_length=255, blank=True)
     meta_description = models.TextField("Meta Description", max_length=300, blank=True)
     meta_image = models.ImageField(
         "Meta Image (OG/Twitter)", upload_to="seo/", blank=True, null=True
     )
+    # read from the file when the image is set (not with width_field and
+    # height_field, that open the file on every load of a row without them);
+    # 0 when it couldn't be read
+    meta_image_width = models.PositiveIntegerField(null=True, editable=False)
+    meta_image_height = models.PositiveIntegerField(null=True, editable=False)
 
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        fields = {"meta_image", "meta_image_width", "meta_image_height"}
+        if not fields & self.get_deferred_fields():
+            image = self.meta_image
+            if not image:
+                self.meta_image_width = self.meta_image_height = None
+            elif not image._committed or self.meta_image_width is None:
+                # a new upload, or one stored before the dimensions
+                size = read_image_dimensions(image)
+                self.meta_image_width, self.meta_image_height = size
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "meta_image" in update_fields:
+                kwargs["update_fields"] = {*update_fields, *fields}
+        super().save(*args, **kwargs)
+
     def get_seo(self):
         return {
             "title": self.meta_title,
             "description": self.meta_description,
             "image": self.meta_image.url if self.meta_image else None,
+            # None when unknown
+            "image_width": self.meta_image_width or None,
+            "image_height": self.meta_image_height or None,
         }
@@ -1,7 +1,38 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.html import format_html
 from .siteSettings import SiteSettings
 
+# Font Awesome class of a platform
+ICON = "fa-brands fa-{}"
+
+
+def fill_icons(objs):
+    """Set the `icon` of SocialMedia objects from their platform, before a save."""
+    for obj in objs:
+        obj.icon = ICON.format(obj.platform)
+    return objs
+
+
+def hosts_changed():
+    """The bulk writes send no signal, reload the host tables (and the SEO)."""
+    from ..hosts import invalidate
+
+    transaction.on_commit(invalidate)
+
+
+class SocialMediaQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(fill_icons(list(objs)), *args, **kwargs)
+        hosts_changed()
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if "platform" in fields and "icon" not in fields:
+            fields = [*fields, "icon"]
+        updated = super().bulk_update(fill_icons(list(objs)), fields, *args, **kwargs)
+        hosts_changed()
+        return updated
+
 
 class SocialMedia(models.Model):
     # Choices for social platforms (icon + name)
@@ -13,6 +44,15 @@ class SocialMedia(models.Model):
         ("youtube", "YouTube"),
     ]
 
+    # profile URL of a username
+    PROFILE_URLS = {
+        "facebook": "https://www.facebook.com/{}",
+        "twitter": "https://x.com/{}",
+        "instagram": "https://www.instagram.com/{}",
+        "linkedin": "https://www.linkedin.com/company/{}",
+        "youtube": "https://www.youtube.com/@{}",
+    }
+
     siteSettings = models.ForeignKey(SiteSettings, on_delete=models.CASCADE)
 
     platform = models.CharField(
@@ -25,6 +65,8 @@ class SocialMedia(models.Model):
         max_length=50, blank=True, help_text="Auto-filled based on platform selection"
     )
 
+    objects = SocialMediaQuerySet.as_manager()
+
     class Meta:
         db_table = "socialMedia"
         verbose_name = "Social Media"
@@ -33,7 +75,13 @@ class SocialMedia(models.Model):
     def __str__(self):
         return f"{self.get_platform_display()}: {self.profile_name}"
 
+    @property
+    def url(self):
+        if self.profile_name.startswith(("https://", "http://")):
+            return self.profile_name
+        return self.PROFILE_URLS[self.platform].format(self.profile_name.lstrip("@"))
+
     def save(self, *args, **kwargs):
         # Auto-set icon class (e.g., using Font Awesome)
-        self.icon = f"fa-brands fa-{self.platform}"
+        fill_icons([self])
         super().save(*args, **kwargs)
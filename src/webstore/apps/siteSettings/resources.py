@@ -0,0 +1,144 @@
+"""
+django-import-export resources of the site settings, for the multistore
+setups: the rows are validated one by one (`full_clean`, reported per row)
+and written with bulk_create/bulk_update in the import transaction, the
+related sites are looked up once per import.
+"""
+
+from django.contrib.sites.models import Site
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from import_export import fields, resources, widgets
+from import_export.instance_loaders import ModelInstanceLoader
+
+from .hosts import invalidate
+from .models import SiteSettings, SocialMedia
+
+
+class CachedForeignKeyWidget(widgets.ForeignKeyWidget):
+    """ForeignKeyWidget resolving the values of an import with one query."""
+
+    _instances = None
+
+    def reset(self):
+        """Forget the instances, the widgets are shared by the imports."""
+        self._instances = None
+
+    def get_instance_by_lookup_fields(self, value, row, **kwargs):
+        if self._instances is None:
+            queryset = self.get_queryset(value, row, **kwargs)
+            self._instances = {
+                str(obj.lookup_key): obj
+                for obj in queryset.annotate(lookup_key=F(self.field))
+            }
+        try:
+            return self._instances[str(value)]
+        except KeyError:
+            # a validation error of the row
+            raise ValueError(f"{self.model._meta.verbose_name} {value!r} not found")
+
+
+class CachedKeyInstanceLoader(ModelInstanceLoader):
+    """
+    CachedInstanceLoader for one or several `import_id_fields`: the existing
+    rows are loaded in one query and looked up on all the fields, a key
+    that doesn't clean is a validation error of its row.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.key_fields = [
+            self.resource.fields[name] for name in self.resource.get_import_id_fields()
+        ]
+        self.all_instances = {
+            self.key(field.get_value(instance) for field in self.key_fields): instance
+            for instance in self.get_queryset()
+        }
+
+    @staticmethod
+    def key(values):
+        return tuple(getattr(value, "pk", value) for value in values)
+
+    def get_instance(self, row):
+        values = []
+        for field in self.key_fields:
+            try:
+                values.append(field.clean(row))
+            except ValueError as e:
+                raise ValidationError({field.attribute: str(e)}, code="invalid")
+        return self.all_instances.get(self.key(values))
+
+
+class BulkResource(resources.ModelResource):
+    def before_import(self, dataset, **kwargs):
+        super().before_import(dataset, **kwargs)
+        for field in self.get_import_fields():
+            if isinstance(field.widget, CachedForeignKeyWidget):
+                field.widget.reset()
+
+
+class SiteSettingsResource(BulkResource):
+    site = fields.Field(
+        attribute="site",
+        column_name="site",
+        widget=CachedForeignKeyWidget(Site, field="domain"),
+    )
+    keywords = fields.Field(
+        attribute="keywords", column_name="keywords", widget=widgets.JSONWidget()
+    )
+
+    class Meta:
+        model = SiteSettings
+        fields = (
+            "site",
+            "name",
+            "short_name",
+            "description",
+            "keywords",
+            "publisher",
+            "owner",
+            "copyright",
+            "theme_color",
+            "background_color",
+            "maintenance_mode",
+        )
+        import_id_fields = ("site",)
+        instance_loader_class = CachedKeyInstanceLoader
+        use_bulk = True
+        batch_size = 500
+        use_transactions = True
+        skip_unchanged = True
+        clean_model_instances = True
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("site")
+
+    def after_import(self, dataset, result, **kwargs):
+        super().after_import(dataset, result, **kwargs)
+        # bulk writes send no signal, the host tables (and the SEO) reload once;
+        # the SocialMedia bulk writes reload them themselves (the queryset)
+        if not kwargs.get("dry_run"):
+            transaction.on_commit(invalidate)
+
+
+class SocialMediaResource(BulkResource):
+    siteSettings = fields.Field(
+        attribute="siteSettings",
+        column_name="site",
+        widget=CachedForeignKeyWidget(SiteSettings, field="site__domain"),
+    )
+
+    class Meta:
+        model = SocialMedia
+        fields = ("siteSettings", "platform", "profile_name")
+        import_id_fields = ("siteSettings", "platform")
+        instance_loader_class = CachedKeyInstanceLoader
+        use_bulk = True
+        batch_size = 500
+        use_transactions = True
+        skip_unchanged = True
+        clean_model_instances = True
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("siteSettings__site")
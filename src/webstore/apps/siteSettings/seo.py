@@ -0,0 +1,73 @@
+"""
+The SEO payload of a site, built with the host table.
+
+The settings of all the sites and their social profiles are loaded in two
+queries (`prefetch_related`) when the hosts load and reload with them, a
+Site, SiteSettings or SocialMedia change reloads the table of every process
+(the version shared through the coordination cache, see `hosts`). The JSON-LD
+Organization (`sameAs` the profiles) and WebSite (the search box) and the
+footer links are serialized once per load, so the pages render them without
+a query.
+"""
+
+from dataclasses import dataclass
+
+from django.urls import reverse
+from django.utils.html import format_html_join
+
+from packages.opengraph import ld_json, organization, website
+
+from .models import SiteSettings
+
+
+@dataclass(frozen=True)
+class SiteSEO:
+    settings: SiteSettings
+    social: tuple
+    same_as: tuple
+    # <script type="application/ld+json">
+    organization: str
+    website: str
+    # the <a> of the profiles, in the footer
+    social_links: str
+
+    @classmethod
+    def build(cls, site_settings):
+        social = tuple(site_settings.socialmedia_set.all())
+        same_as = tuple(profile.url for profile in social)
+        url = f"https://{site_settings.site.domain}/"
+        return cls(
+            settings=site_settings,
+            social=social,
+            same_as=same_as,
+            organization=ld_json(
+                organization(site_settings.name, url, same_as=same_as)
+            ),
+            website=ld_json(
+                website(
+                    site_settings.name,
+                    url,
+                    f"{url.rstrip('/')}{reverse('search:index')}",
+                )
+            ),
+            social_links=format_html_join(
+                "\n",
+                '<a href="{}" title="{}" rel="me noopener" target="_blank">'
+                '<i class="{}" aria-hidden="true"></i></a>',
+                (
+                    (profile.url, profile.get_platform_display(), profile.icon)
+                    for profile in social
+                ),
+            ),
+        )
+
+
+def load():
+    """{site id: `SiteSEO`} of the sites with settings."""
+    queryset = SiteSettings.objects.select_related("site").prefetch_related(
+        "socialmedia_set"
+    )
+    return {
+        site_settings.site_id: SiteSEO.build(site_settings)
+        for site_settings in queryset
+    }
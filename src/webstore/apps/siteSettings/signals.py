@@ -0,0 +1,17 @@
+from django.contrib.sites.models import Site
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .hosts import invalidate
+from .models import SiteSettings, SocialMedia
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+@receiver(post_save, sender=SocialMedia)
+@receiver(post_delete, sender=SocialMedia)
+def hosts_changed(sender, instance, **kwargs):
+    transaction.on_commit(invalidate)
@@ -1,3 +1,466 @@
-from django.test import TestCase
+import asyncio
+import tracemalloc
+from unittest import mock
 
-# Create your tests here.
+import tablib
+from django.conf import settings
+from django.contrib.admin.sites import AdminSite
+from django.contrib.sites.models import Site
+from django.core.exceptions import DisallowedHost
+from django.db import connection
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import (
+    AsyncRequestFactory,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+
+from webstore import routers
+from webstore.middleware import PrimaryPinMiddleware
+
+from webstore.context_processors.lazy import get_stats, lazy_context, reset_stats
+from webstore.context_processors.settings import (
+    UndefinedSettingError,
+    build_exported_settings,
+    settings_export,
+)
+from webstore.coordination import cache
+from webstore.utils import domains
+
+from . import hosts
+from .context_processors import global_seo
+from .admin import SiteSettingsAdmin
+from .maintenanceBackend import MaintenanceBackend
+from .middleware import HostCanonicalMiddleware
+from .models import SiteSettings, SocialMedia
+from .resources import SiteSettingsResource, SocialMediaResource
+
+
+def _peak_allocation(processor, request, rounds=50):
+    """Return the largest allocation peak of a single context processor call."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(rounds):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            processor(request)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+class ContextProcessorTests(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+
+    @override_settings(SETTINGS_EXPORT=["DEBUG", "LANGUAGE_CODE"])
+    def test_settings_export_is_shared(self):
+        first = settings_export(self.request)
+        self.assertIs(first, settings_export(self.request))
+        self.assertEqual(first["settings"]["LANGUAGE_CODE"], settings.LANGUAGE_CODE)
+
+    @override_settings(SETTINGS_EXPORT=["DEBUG"])
+    def test_settings_export_is_read_only(self):
+        exported = settings_export(self.request)["settings"]
+        with self.assertRaises(TypeError):
+            exported["SECRET_KEY"] = "leak"
+        with self.assertRaises(TypeError):
+            exported.update(SECRET_KEY="leak")
+
+    @override_settings(SETTINGS_EXPORT=["NOT_A_REAL_SETTING"])
+    def test_undefined_setting_fails_at_build(self):
+        with self.assertRaises(UndefinedSettingError):
+            build_exported_settings()
+
+    def test_no_per_request_allocation_proportional_to_settings(self):
+        every_setting = [name for name in dir(settings) if name.isupper()]
+
+        with override_settings(SETTINGS_EXPORT=every_setting[:1]):
+            settings_export(self.request)
+            small = _peak_allocation(settings_export, self.request)
+
+        with override_settings(SETTINGS_EXPORT=every_setting):
+            settings_export(self.request)
+            large = _peak_allocation(settings_export, self.request)
+
+        # a few bytes of noise are fine, copying the settings on every call is not
+        self.assertLess(large - small, 1024)
+
+
+calls = []
+
+
+@lazy_context("expensive")
+def expensive(request):
+    calls.append(request)
+    return {"expensive": {"title": "computed"}}
+
+
+class DomainTests(SimpleTestCase):
+    def test_parsed_offline_and_once(self):
+        domains.split_domain.cache_clear()
+        # the bundled snapshot, no download
+        with mock.patch("socket.socket.connect", side_effect=OSError) as connect:
+            self.assertEqual(domains.domain_name("www.shop.co.uk"), "shop")
+            self.assertEqual(domains.split_domain("shop.ro").suffix, "ro")
+            domains.split_domain("shop.ro")
+        connect.assert_not_called()
+        self.assertEqual(domains.split_domain.cache_info().hits, 1)
+
+
+class LazyContextTests(SimpleTestCase):
+    def setUp(self):
+        calls.clear()
+        reset_stats()
+        self.request = RequestFactory().get("/")
+
+    def render(self, source):
+        context = Context(expensive(self.request))
+        return Template(source).render(context)
+
+    def test_not_evaluated_when_unused(self):
+        self.assertEqual(self.render("robots"), "robots")
+        self.assertEqual(calls, [])
+
+    def test_evaluated_once_per_request(self):
+        self.assertEqual(
+            self.render("{{ expensive.title }} {{ expensive.title }}"),
+            "computed computed",
+        )
+        self.render("{{ expensive.title }}")
+        self.assertEqual(len(calls), 1)
+
+    def test_stats(self):
+        self.render("")
+        self.render("{{ expensive.title }}")
+        stats = get_stats()[f"{__name__}.expensive"]
+        self.assertEqual((stats["offered"], stats["evaluated"]), (2, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = routers.PrimaryReplicaRouter()
+        self.lag = 0
+        patcher = mock.patch.object(
+            routers, "replica_lag", side_effect=lambda alias: self.lag
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(routers.pin_primary, False)
+        routers.pin_primary(False)
+
+    def test_reads_go_to_the_replica_and_writes_to_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Site), "replica")
+        self.assertEqual(self.router.db_for_write(Site), "default")
+        # read-your-writes for the rest of the request
+        self.assertEqual(self.router.db_for_read(Site), "default")
+
+    @override_settings(REPLICA_CHECK_INTERVAL=0)
+    def test_lagging_replica_is_skipped(self):
+        self.lag = settings.REPLICA_MAX_LAG + 1
+        with self.assertLogs("django", "WARNING") as logs:
+            self.assertEqual(self.router.db_for_read(Site), "default")
+        self.assertIn(f"lags behind ({self.lag}s)", logs.output[0])
+        self.lag = None  # replication stopped
+        with self.assertLogs("django", "WARNING") as logs:
+            self.assertEqual(self.router.db_for_read(Site), "default")
+        self.assertIn("replica lag unknown", logs.output[0])
+        self.lag = 0
+        self.assertEqual(self.router.db_for_read(Site), "replica")
+
+    def test_database_cache_stays_on_the_primary(self):
+        from django.core.cache.backends.db import DatabaseCache
+
+        entry = DatabaseCache("cache_coordination", {}).cache_model_class
+        self.assertEqual(self.router.db_for_write(entry), "default")
+        self.assertFalse(routers.is_pinned())
+        self.assertEqual(self.router.db_for_read(entry), "default")
+
+    def test_replicas_are_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica", "catalog"))
+        self.assertIsNone(self.router.allow_migrate("default", "catalog"))
+
+    def test_writes_pin_the_client(self):
+        def view(request):
+            reads = self.router.db_for_read(Site)
+            if request.method == "POST":
+                self.router.db_for_write(Site)
+            return HttpResponse(reads)
+
+        middleware = PrimaryPinMiddleware(view)
+        factory = RequestFactory()
+
+        response = middleware(factory.get("/"))
+        self.assertEqual(response.content, b"replica")
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+        response = middleware(factory.post("/"))
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], settings.REPLICA_PIN_SECONDS)
+
+        request = factory.get("/")
+        request.COOKIES[settings.REPLICA_PIN_COOKIE] = cookie.value
+        self.assertEqual(middleware(request).content, b"default")
+        # nothing leaks to the next request of the thread
+        self.assertFalse(routers.is_pinned())
+
+
+class HostCanonicalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.shop = Site.objects.create(domain="shop.test", name="shop")
+        cls.www = Site.objects.create(domain="www.other.test", name="other")
+        SiteSettings.objects.create(site=cls.shop, name="shop")
+        SiteSettings.objects.create(site=cls.www, name="other", maintenance_mode=True)
+
+    def setUp(self):
+        hosts._table = None
+        self.middleware = HostCanonicalMiddleware(lambda request: HttpResponse())
+
+    def get(self, host, path="/"):
+        request = RequestFactory().get(path, HTTP_HOST=host)
+        return request, self.middleware(request)
+
+    def test_aliases_redirect_to_the_domain(self):
+        hosts.get_table()
+        with self.assertNumQueries(0):
+            request, response = self.get("www.shop.test:8000", "/ro/?q=1")
+            self.assertEqual(response.status_code, 301)
+            self.assertEqual(response["Location"], "http://shop.test:8000/ro/?q=1")
+
+            request, response = self.get("OTHER.test")
+            self.assertEqual(response["Location"], "http://www.other.test/")
+
+    def test_site_and_maintenance_from_the_table(self):
+        hosts.get_table()
+        with self.assertNumQueries(0):
+            request, response = self.get("shop.test:8000")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.site, self.shop)
+
+        backend = MaintenanceBackend()
+        with mock.patch(
+            "apps.siteSettings.maintenanceBackend.get_current_request",
+            return_value=request,
+        ):
+            self.assertFalse(backend.get_value())
+            request.host = hosts.get_table().lookup("www.other.test")
+            self.assertTrue(backend.get_value())
+
+    def test_unknown_hosts_are_validated_and_looked_up(self):
+        with override_settings(ALLOWED_HOSTS=["shop.test"]):
+            with self.assertRaises(DisallowedHost):
+                self.get("unknown.test")
+        with override_settings(ALLOWED_HOSTS=["unknown.test"]):
+            with self.assertRaises(Site.DoesNotExist):
+                self.get("unknown.test")
+
+    def test_reloaded_when_a_site_changes(self):
+        table = hosts.get_table()
+        with self.captureOnCommitCallbacks(execute=True):
+            Site.objects.filter(pk=self.shop.pk).update(domain="new.test")
+            Site.objects.get(pk=self.shop.pk).save()
+        self.assertIsNot(hosts.get_table(), table)
+        self.assertEqual(hosts.get_table().lookup("new.test").site, self.shop)
+        self.assertIsNone(hosts.get_table().lookup("shop.test"))
+
+    @override_settings(HOST_TABLE_REFRESH=0)
+    def test_reloaded_when_another_process_changes_a_site(self):
+        table = hosts.get_table()
+        Site.objects.filter(pk=self.shop.pk).update(domain="new.test")
+        # the version bumped by the other process, in the shared cache
+        cache.set(hosts.VERSION_KEY, table.version + 1, timeout=None)
+        self.assertIs(hosts._table, table)
+        self.assertEqual(hosts.get_table().lookup("new.test").site, self.shop)
+
+    @override_settings(HOST_TABLE_REFRESH=0)
+    def test_reloaded_when_the_version_is_lost(self):
+        table = hosts.get_table()
+        Site.objects.filter(pk=self.shop.pk).update(domain="new.test")
+        # evicted or flushed, maybe with the bump of another process
+        cache.delete(hosts.VERSION_KEY)
+        self.assertEqual(hosts.get_table().lookup("new.test").site, self.shop)
+        self.assertNotEqual(cache.get(hosts.VERSION_KEY), table.version)
+
+    def test_async(self):
+        hosts.get_table()
+
+        async def view(request):
+            return HttpResponse(request.site.domain)
+
+        request = AsyncRequestFactory().get("/")
+        request.META["HTTP_HOST"] = "shop.test"
+        response = asyncio.run(HostCanonicalMiddleware(view)(request))
+        self.assertEqual(response.content, b"shop.test")
+
+
+@override_settings(ALLOWED_HOSTS=[".test"])
+class SiteSEOTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.shop = Site.objects.create(domain="shop.test", name="shop")
+        cls.settings = SiteSettings.objects.create(site=cls.shop, name="Shop")
+        SocialMedia.objects.create(
+            siteSettings=cls.settings, platform="facebook", profile_name="shop"
+        )
+        SocialMedia.objects.create(
+            siteSettings=cls.settings,
+            platform="youtube",
+            profile_name="https://www.youtube.com/@shop</script>",
+        )
+
+    def setUp(self):
+        hosts._table = None
+
+    def context(self, host="shop.test"):
+        request = RequestFactory().get("/", HTTP_HOST=host)
+        request.session = {}
+        request.site = self.shop
+        return global_seo.eager(request)["global_seo"]
+
+    def test_loaded_with_the_hosts(self):
+        with self.assertNumQueries(3):
+            hosts.get_table()
+        with self.assertNumQueries(0):
+            seo = self.context()
+            footer = Template(
+                '{% include "inc/footer.html" %}{{ global_seo.organization }}'
+            ).render(Context({"global_seo": seo}))
+
+        self.assertEqual(seo["name"], "Shop")
+        self.assertEqual(
+            seo["same_as"],
+            ("https://www.facebook.com/shop", "https://www.youtube.com/@shop</script>"),
+        )
+        self.assertIn('<i class="fa-brands fa-facebook"', footer)
+        self.assertNotIn("@shop</script>", footer)
+        self.assertIn('"sameAs": ["https://www.facebook.com/shop"', footer)
+
+    def test_sites_without_settings(self):
+        Site.objects.create(domain="other.test", name="other")
+        seo = self.context("other.test")
+        self.assertEqual(seo["social"], ())
+        self.assertEqual(seo["organization"], "")
+
+    def test_reloaded_when_a_profile_changes(self):
+        hosts.get_table()
+        with self.captureOnCommitCallbacks(execute=True):
+            SocialMedia.objects.filter(platform="youtube").delete()
+        self.assertEqual(self.context()["same_as"], ("https://www.facebook.com/shop",))
+
+    @override_settings(HOST_TABLE_REFRESH=0)
+    def test_reloaded_when_another_process_changes_a_profile(self):
+        table = hosts.get_table()
+        SocialMedia.objects.filter(platform="facebook").update(profile_name="new")
+        self.assertEqual(self.context()["same_as"][0], "https://www.facebook.com/shop")
+        # the version bumped by the other process, in the shared cache
+        cache.set(hosts.VERSION_KEY, table.version + 1, timeout=None)
+        self.assertEqual(self.context()["same_as"][0], "https://www.facebook.com/new")
+
+
+class BulkImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.sites = [
+            Site.objects.create(domain=f"shop{n}.test", name=f"shop{n}")
+            for n in range(10)
+        ]
+        cls.settings = SiteSettings.objects.create(
+            site=cls.sites[0],
+            name="shop0",
+            short_name="shop0",
+            description="A shop",
+            keywords=[{"value": "shop"}],
+            publisher="Publisher",
+            owner="Owner",
+            copyright="Copyright",
+            theme_color="#ffffff",
+            background_color="#ffffff",
+        )
+
+    def test_bulk_operations_fill_the_icons(self):
+        facebook, twitter = SocialMedia.objects.bulk_create(
+            SocialMedia(siteSettings=self.settings, platform=platform, profile_name="s")
+            for platform in ("facebook", "twitter")
+        )
+        self.assertEqual(facebook.icon, "fa-brands fa-facebook")
+
+        twitter.platform = "youtube"
+        SocialMedia.objects.bulk_update([twitter], ["platform"])
+        twitter.refresh_from_db()
+        self.assertEqual(twitter.icon, "fa-brands fa-youtube")
+
+    def test_bulk_operations_reload_the_hosts(self):
+        version = cache.get(hosts.VERSION_KEY, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            (facebook,) = SocialMedia.objects.bulk_create(
+                [SocialMedia(siteSettings=self.settings, platform="facebook")]
+            )
+        self.assertGreater(cache.get(hosts.VERSION_KEY), version)
+
+        version = cache.get(hosts.VERSION_KEY)
+        facebook.profile_name = "shop"
+        with self.captureOnCommitCallbacks(execute=True):
+            SocialMedia.objects.bulk_update([facebook], ["profile_name"])
+        self.assertGreater(cache.get(hosts.VERSION_KEY), version)
+
+    def test_import_in_bulk(self):
+        dataset = SiteSettingsResource().export()
+        dataset.dict = [
+            {**dataset.dict[0], "owner": "Changed"},
+            *(
+                {**dataset.dict[0], "site": site.domain, "name": site.name}
+                for site in self.sites[1:]
+            ),
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            result = SiteSettingsResource().import_data(dataset)
+        self.assertFalse(result.has_errors() or result.has_validation_errors())
+        self.assertEqual(result.totals["new"], 9)
+        self.assertEqual(result.totals["update"], 1)
+        statements = [query["sql"].split()[0] for query in queries]
+        self.assertEqual(statements.count("INSERT"), 1)
+        self.assertEqual(statements.count("UPDATE"), 1)
+        self.assertEqual(SiteSettings.objects.get(site=self.sites[0]).owner, "Changed")
+
+    def test_invalid_rows_are_reported(self):
+        dataset = SocialMediaResource().export()
+        dataset.dict = [
+            {"site": "shop0.test", "platform": "facebook", "profile_name": "s"},
+            {"site": "unknown.test", "platform": "facebook", "profile_name": "s"},
+            {"site": "shop0.test", "platform": "myspace", "profile_name": "s"},
+        ]
+        result = SocialMediaResource().import_data(dataset, dry_run=True)
+        self.assertEqual([row.number for row in result.invalid_rows], [2, 3])
+
+        # a site added after the previous import
+        site = Site.objects.create(domain="unknown.test", name="unknown")
+        SiteSettings.objects.create(site=site, name="unknown")
+        result = SocialMediaResource().import_data(dataset, dry_run=True)
+        self.assertEqual([row.number for row in result.invalid_rows], [3])
+
+        dataset = tablib.Dataset(dataset[0], headers=dataset.headers)
+        result = SocialMediaResource().import_data(dataset)
+        self.assertFalse(result.has_validation_errors())
+        self.assertEqual(SocialMedia.objects.get().icon, "fa-brands fa-facebook")
+
+    def test_maintenance_action_reloads_the_hosts_once(self):
+        for site in self.sites[1:3]:
+            SiteSettings.objects.create(site=site, name=site.name)
+        model_admin = SiteSettingsAdmin(SiteSettings, AdminSite())
+        with (
+            mock.patch("apps.siteSettings.admin.invalidate") as invalidate,
+            mock.patch.object(model_admin, "message_user"),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            model_admin.enable_maintenance(None, SiteSettings.objects.all())
+        invalidate.assert_called_once_with()
+        self.assertEqual(SiteSettings.objects.filter(maintenance_mode=True).count(), 3)
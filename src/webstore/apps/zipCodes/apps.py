@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class ZipCodesConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.zipCodes"
+    verbose_name = "Zip codes"
+
+    def warmup(self):
+        # load the in-memory index in the workers instead of on the first
+        # keystroke of a checkout form, not in every process loading Django
+        # (management commands, Celery, the startup probes)
+        if settings.ZIP_CODES_PRELOAD:
+            from .lookup import get_index
+
+            get_index()
@@ -0,0 +1,133 @@
+"""
+In-memory postal code lookups for the address forms.
+
+The reference file is read once with the stdlib sqlite3 module, opened as
+an immutable read-only URI (no locks, no journal checks), into two sorted
+arrays searched with bisect: the postal codes and the folded
+"locality county" names.
+"""
+
+import logging
+import sqlite3
+from bisect import bisect_left
+from pathlib import Path
+from threading import Lock
+from urllib.request import pathname2url
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.search.normalize import fold
+
+from .models import ZipCode
+from .routers import DATABASE
+
+logger = logging.getLogger("django")
+
+LIMIT = 10
+
+
+def database_uri(name=None):
+    """Return the read-only, immutable URI of the zip codes database."""
+    name = str(name or settings.DATABASES[DATABASE]["NAME"])
+    if name.startswith("file:"):
+        return name
+    return f"file:{pathname2url(str(Path(name).resolve()))}?mode=ro&immutable=1"
+
+
+class ZipCodeIndex:
+    def __init__(self, rows):
+        """`rows` are `(code, county, locality, street)` tuples."""
+        self.rows = sorted(rows)
+        self.codes = [row[0] for row in self.rows]
+
+        # one entry per locality, pointing to its first (lowest) code
+        localities = {}
+        for position, (code, county, locality, street) in enumerate(self.rows):
+            localities.setdefault((fold(locality), fold(county)), position)
+        self.localities = sorted(
+            (f"{locality} {county}", position)
+            for (locality, county), position in localities.items()
+        )
+        self.locality_keys = [key for key, position in self.localities]
+
+    @classmethod
+    def load(cls, name=None):
+        table = ZipCode._meta.db_table
+        columns = ", ".join(
+            ZipCode._meta.get_field(field).column
+            for field in ("code", "county", "locality", "street")
+        )
+        connection = sqlite3.connect(database_uri(name), uri=True)
+        try:
+            rows = connection.execute(f"SELECT {columns} FROM {table}").fetchall()
+        finally:
+            connection.close()
+        return cls(
+            (code, county, locality, street or "")
+            for code, county, locality, street in rows
+        )
+
+    def __len__(self):
+        return len(self.rows)
+
+    @staticmethod
+    def _as_dict(row):
+        code, county, locality, street = row
+        return {"code": code, "county": county, "locality": locality, "street": street}
+
+    def by_code(self, prefix, limit=LIMIT):
+        """Rows whose postal code starts with `prefix`."""
+        start = bisect_left(self.codes, prefix)
+        results = []
+        for row in self.rows[start : start + limit]:
+            if not row[0].startswith(prefix):
+                break
+            results.append(self._as_dict(row))
+        return results
+
+    def by_locality(self, prefix, limit=LIMIT):
+        """Localities starting with `prefix` (diacritics optional)."""
+        prefix = " ".join(fold(prefix).split())
+        start = bisect_left(self.locality_keys, prefix)
+        results = []
+        for key, position in self.localities[start : start + limit]:
+            if not key.startswith(prefix):
+                break
+            results.append(self._as_dict(self.rows[position]))
+        return results
+
+    def search(self, query, limit=LIMIT):
+        query = query.strip()
+        if not query:
+            return []
+        if query.isdigit():
+            return self.by_code(query, limit)
+        return self.by_locality(query, limit)
+
+
+_index = None
+_lock = Lock()
+
+
+def get_index():
+    """Return the process wide index, empty when the database is missing."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                try:
+                    _index = ZipCodeIndex.load()
+                except sqlite3.Error as e:
+                    logger.error(f"[ZipCodes] Can't load the zip codes: {e}")
+                    _index = ZipCodeIndex(())
+                else:
+                    logger.info(f"[ZipCodes] Loaded {len(_index)} zip codes")
+    return _index
+
+
+async def aget_index():
+    """`get_index` for the async views, the file is loaded in a thread."""
+    if _index is not None:
+        return _index
+    return await sync_to_async(get_index)()
@@ -0,0 +1,117 @@
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from apps.zipCodes import lookup as zip_lookup
+from apps.zipCodes.lookup import ZipCodeIndex, database_uri
+from apps.zipCodes.views import lookup
+
+COUNTIES = ("Alba", "Argeș", "Bacău", "Bihor", "Brașov", "Cluj", "Constanța", "Iași")
+SYLLABLES = ("ba", "cu", "ră", "ti", "mo", "șe", "ni", "lo", "vă", "ța", "dor", "sat")
+
+
+def _percentile(timings, percent):
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(len(timings) * percent / 100))]
+
+
+def generate(path, rows, rng):
+    """Write a synthetic zip codes database with the reference schema."""
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE zip_codes (id INTEGER PRIMARY KEY, code TEXT, county TEXT, "
+        "locality TEXT, street TEXT)"
+    )
+    connection.executemany(
+        "INSERT INTO zip_codes (code, county, locality, street) VALUES (?, ?, ?, ?)",
+        (
+            (
+                f"{rng.randrange(10_000, 999_999):06d}",
+                rng.choice(COUNTIES),
+                "".join(rng.choices(SYLLABLES, k=rng.randrange(2, 5))).capitalize(),
+                "",
+            )
+            for _ in range(rows)
+        ),
+    )
+    connection.execute("CREATE INDEX zip_codes_locality ON zip_codes (locality)")
+    connection.commit()
+    connection.close()
+
+
+class Command(BaseCommand):
+    help = "Compare the in-memory zip code lookups with SQL LIKE queries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--generate",
+            type=int,
+            metavar="ROWS",
+            help="benchmark a synthetic database instead of the configured one",
+        )
+        parser.add_argument("--queries", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        with tempfile.TemporaryDirectory() as directory:
+            name = None
+            if options["generate"]:
+                name = Path(directory, "zip_codes.sqlite")
+                generate(name, options["generate"], rng)
+
+            start = perf_counter()
+            index = ZipCodeIndex.load(name)
+            self.stdout.write(
+                self.style.NOTICE(
+                    f"📊 {len(index)} zip codes loaded in "
+                    f"{(perf_counter() - start) * 1000:.0f} ms"
+                )
+            )
+
+            # half postal code prefixes, half locality prefixes (keystrokes)
+            queries = []
+            for code, county, locality, street in rng.choices(
+                index.rows, k=options["queries"]
+            ):
+                value = code if rng.random() < 0.5 else locality
+                queries.append(value[: rng.randrange(2, len(value) + 1)])
+
+            timings = {"index": [], "sqlite": []}
+            for query in queries:
+                start = perf_counter()
+                index.search(query)
+                timings["index"].append((perf_counter() - start) * 1000)
+
+            connection = sqlite3.connect(database_uri(name), uri=True)
+            for query in queries:
+                column = "code" if query.isdigit() else "locality"
+                start = perf_counter()
+                connection.execute(
+                    f"SELECT code, county, locality, street FROM zip_codes "
+                    f"WHERE {column} LIKE ? ORDER BY {column} LIMIT 10",
+                    [f"{query}%"],
+                ).fetchall()
+                timings["sqlite"].append((perf_counter() - start) * 1000)
+            connection.close()
+
+        # the endpoint answers from the index benchmarked above
+        zip_lookup._index = index
+        factory = RequestFactory()
+        timings["endpoint"] = []
+        for query in queries:
+            request = factory.get("/", {"q": query})
+            start = perf_counter()
+            lookup(request)
+            timings["endpoint"].append((perf_counter() - start) * 1000)
+
+        for name, values in timings.items():
+            self.stdout.write(
+                f"  {name:<9} p50 {_percentile(values, 50):6.3f} ms  "
+                f"p99 {_percentile(values, 99):6.3f} ms"
+            )
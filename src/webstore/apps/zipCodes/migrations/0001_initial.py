@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ZipCode",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("code", models.CharField(max_length=6)),
+                ("county", models.CharField(max_length=64)),
+                ("locality", models.CharField(max_length=128)),
+                ("street", models.CharField(blank=True, default="", max_length=255)),
+            ],
+            options={
+                "verbose_name": "Zip code",
+                "verbose_name_plural": "Zip codes",
+                "db_table": "zip_codes",
+                "managed": False,
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class ZipCode(models.Model):
+    """
+    One row of the Romanian postal code reference database (the `zipCodes`
+    alias). The file is shipped read-only, Django never migrates it.
+    """
+
+    code = models.CharField(max_length=6)
+    county = models.CharField(max_length=64)
+    locality = models.CharField(max_length=128)
+    # big cities have one code per street (segment), empty elsewhere
+    street = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        managed = False
+        db_table = "zip_codes"
+        verbose_name = "Zip code"
+        verbose_name_plural = "Zip codes"
+
+    def __str__(self):
+        return f"{self.code} {self.locality}, {self.county}"
@@ -0,0 +1,26 @@
+DATABASE = "zipCodes"
+
+
+class ZipCodesRouter:
+    """Send the zipCodes app to its own read-only database."""
+
+    app_label = "zipCodes"
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == self.app_label:
+            return DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == self.app_label:
+            return DATABASE
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # the reference file is never migrated, nor is anything migrated on it
+        if app_label == self.app_label or db == DATABASE:
+            return False
+        return None
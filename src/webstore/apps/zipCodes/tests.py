@@ -0,0 +1,91 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.contrib.sites.models import Site
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase
+
+from webstore.settings.components.database import sqlite_reference
+
+from .lookup import ZipCodeIndex, database_uri
+from .models import ZipCode
+from .routers import ZipCodesRouter
+
+ROWS = (
+    ("010011", "București", "București", "Strada Academiei"),
+    ("010012", "București", "București", "Strada Brezoianu"),
+    ("400001", "Cluj", "Cluj-Napoca", ""),
+    ("507190", "Brașov", "Săcele", ""),
+    ("517025", "Alba", "Săliștea", ""),
+)
+
+
+class ZipCodeIndexTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        cls.path = Path(directory.name, "zip codes.sqlite")
+        connection = sqlite3.connect(cls.path)
+        connection.execute(
+            "CREATE TABLE zip_codes (id INTEGER PRIMARY KEY, code TEXT, "
+            "county TEXT, locality TEXT, street TEXT)"
+        )
+        connection.executemany(
+            "INSERT INTO zip_codes (code, county, locality, street) "
+            "VALUES (?, ?, ?, ?)",
+            ROWS,
+        )
+        connection.commit()
+        connection.close()
+        cls.index = ZipCodeIndex.load(cls.path)
+
+    def test_loaded_read_only(self):
+        self.assertEqual(len(self.index), len(ROWS))
+        uri = database_uri(self.path)
+        self.assertTrue(uri.endswith("?mode=ro&immutable=1"))
+        self.assertIn("zip%20codes.sqlite", uri)
+        with self.assertRaises(sqlite3.OperationalError):
+            sqlite3.connect(uri, uri=True).execute("DELETE FROM zip_codes")
+
+    def test_code_prefix(self):
+        self.assertEqual(
+            [row["street"] for row in self.index.search("0100")],
+            ["Strada Academiei", "Strada Brezoianu"],
+        )
+        self.assertEqual(self.index.search("9"), [])
+
+    def test_locality_prefix_without_diacritics(self):
+        # one result per locality, ordered by name
+        self.assertEqual(
+            [row["locality"] for row in self.index.search("sa")],
+            ["Săcele", "Săliștea"],
+        )
+        self.assertEqual(self.index.search("saliștea alba")[0]["code"], "517025")
+        self.assertEqual(len(self.index.search("bucuresti")), 1)
+
+    def test_router(self):
+        router = ZipCodesRouter()
+        self.assertEqual(router.db_for_read(ZipCode), "zipCodes")
+        self.assertIsNone(router.db_for_read(Site))
+        self.assertFalse(router.allow_migrate("default", "zipCodes"))
+        self.assertFalse(router.allow_migrate("zipCodes", "catalog"))
+        self.assertIsNone(router.allow_migrate("default", "catalog"))
+
+    def test_reference_connection_profile(self):
+        wrapper = DatabaseWrapper(
+            {**connections["zipCodes"].settings_dict, **sqlite_reference(self.path)}
+        )
+        # the raw connection, with the profile's init commands applied
+        connection = wrapper.get_new_connection(wrapper.get_connection_params())
+        self.addCleanup(connection.close)
+        self.assertEqual(
+            connection.execute("SELECT COUNT(*) FROM zip_codes").fetchone(),
+            (len(ROWS),),
+        )
+        self.assertEqual(connection.execute("PRAGMA query_only").fetchone(), (1,))
+        with self.assertRaises(sqlite3.OperationalError):
+            connection.execute("DELETE FROM zip_codes")
@@ -0,0 +1,11 @@
+from django.http import JsonResponse
+from django.views.decorators.cache import cache_control
+
+from .lookup import aget_index
+
+
+@cache_control(public=True, max_age=60 * 60 * 24)
+async def lookup(request):
+    query = request.GET.get("q", "")[:64]
+    index = await aget_index()
+    return JsonResponse({"query": query, "results": index.search(query)})
@@ -0,0 +1,83 @@
+"""
+gunicorn settings, loaded from the working directory (src/webstore), the
+supervisor program written by tools/web_server.sh passes its values through
+the GUNICORN_* environment variables.
+
+The workers run the warmup (webstore/warmup.py) once the application is
+loaded, before they take traffic (post_fork runs before the Django setup),
+and mark themselves ready for `manage.py reload_workers`. They run with the
+lean settings profile, without the apps only needed by the commands
+(`manage.py profile_startup` compares both).
+
+GUNICORN_PRELOAD=1 loads the application in the master, which builds the
+read-only structures and freezes them before forking (webstore/warmup.py,
+`manage.py worker_memory --compare` measures the saving). A HUP then forks
+the new workers from the same master: the translations, templates and
+manifests are rebuilt (on_reload) but not the Python code, a deploy has to
+restart gunicorn.
+
+GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker serves webstore.asgi with
+an event loop per worker (the hooks are the same, `threads` is unused): the
+async views (autocomplete, zip codes, stock) wait on the database without
+holding a thread. `manage.py load_test` compares both at the same worker
+count.
+"""
+
+import os
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+os.environ.setdefault("WORKER_PROFILE", "lean")
+
+bind = os.getenv(
+    "GUNICORN_BIND", f"unix:{ROOT_DIR.joinpath('var', 'run', 'gunicorn.sock')}"
+)
+workers = int(os.getenv("GUNICORN_WORKERS", os.cpu_count() * 2))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+timeout = 60
+pidfile = os.getenv(
+    "GUNICORN_PIDFILE", str(ROOT_DIR.joinpath("var", "run", "gunicorn.pid"))
+)
+# old workers finish their requests during a reload
+graceful_timeout = 30
+preload_app = os.getenv("GUNICORN_PRELOAD") == "1"
+
+
+def on_starting(server):
+    from apps.internal.reload import ready_dir
+
+    directory = ready_dir(pidfile)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.iterdir():
+        path.unlink()
+
+
+def when_ready(server):
+    if preload_app:
+        from webstore.warmup import run_preload
+
+        run_preload()
+
+
+def on_reload(server):
+    if preload_app:
+        from webstore.warmup import reset_preload, run_preload
+
+        reset_preload()
+        run_preload()
+
+
+def post_worker_init(worker):
+    from apps.internal.reload import mark_ready
+    from webstore.warmup import run_warmups
+
+    run_warmups()
+    mark_ready(pidfile, worker.pid)
+
+
+def worker_exit(server, worker):
+    from apps.internal.reload import unmark_ready
+
+    unmark_ready(pidfile, worker.pid)
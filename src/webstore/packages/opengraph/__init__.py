@@ -0,0 +1,29 @@
+"""
+Open Graph, Twitter Card and JSON-LD structured data.
+
+`builders` turns the SEOMixin models into data, `render` into cached HTML,
+the templates use `{% load opengraph %}{% opengraph_tags obj %}`.
+"""
+
+from .builders import (
+    breadcrumb_list,
+    open_graph,
+    organization,
+    product,
+    twitter_card,
+    website,
+)
+from .render import cached, ld_json, meta_tags, static_image_dimensions
+
+__all__ = [
+    "breadcrumb_list",
+    "cached",
+    "ld_json",
+    "meta_tags",
+    "open_graph",
+    "organization",
+    "product",
+    "static_image_dimensions",
+    "twitter_card",
+    "website",
+]
@@ -0,0 +1,105 @@
+"""
+The Open Graph, Twitter Card and schema.org JSON-LD of the pages, as data.
+
+The builders take the `SEOMixin.get_seo()` dict of a model and absolute
+URLs, and return the (name, content) pairs of the <meta> tags or the JSON-LD
+dict, `render` serializes them. The empty values are left out.
+"""
+
+SCHEMA = "https://schema.org"
+
+
+def _present(tags):
+    return [(name, str(content)) for name, content in tags if content]
+
+
+def open_graph(seo, url, site_name, type="website"):
+    tags = [
+        ("og:type", type),
+        ("og:title", seo.get("title")),
+        ("og:description", seo.get("description")),
+        ("og:url", url),
+        ("og:site_name", site_name),
+        ("og:image", seo.get("image")),
+    ]
+    # the stored dimensions, the image isn't opened
+    if seo.get("image") and seo.get("image_width") and seo.get("image_height"):
+        tags += [
+            ("og:image:width", seo["image_width"]),
+            ("og:image:height", seo["image_height"]),
+        ]
+    return _present(tags)
+
+
+def twitter_card(seo, site=None):
+    card = "summary_large_image" if seo.get("image") else "summary"
+    return _present(
+        [
+            ("twitter:card", card),
+            ("twitter:site", site),
+            ("twitter:title", seo.get("title")),
+            ("twitter:description", seo.get("description")),
+            ("twitter:image", seo.get("image")),
+        ]
+    )
+
+
+def organization(name, url, logo=None, same_as=()):
+    data = {"@context": SCHEMA, "@type": "Organization", "name": name, "url": url}
+    if logo:
+        data["logo"] = logo
+    if same_as:
+        data["sameAs"] = list(same_as)
+    return data
+
+
+def website(name, url, search_url=None):
+    """WebSite, with the SearchAction of `search_url?q=` (the sitelinks search box)."""
+    data = {"@context": SCHEMA, "@type": "WebSite", "name": name, "url": url}
+    if search_url:
+        data["potentialAction"] = {
+            "@type": "SearchAction",
+            "target": {
+                "@type": "EntryPoint",
+                "urlTemplate": f"{search_url}?q={{search_term_string}}",
+            },
+            "query-input": "required name=search_term_string",
+        }
+    return data
+
+
+def product(product, url, currency, image=None):
+    """Product with its Offer, `product.brand` is read (select it)."""
+    seo = product.get_seo()
+    data = {
+        "@context": SCHEMA,
+        "@type": "Product",
+        "name": seo["title"] or product.title,
+        "sku": product.sku,
+        "url": url,
+        "brand": {"@type": "Brand", "name": product.brand.name},
+        "offers": {
+            "@type": "Offer",
+            "url": url,
+            "price": f"{product.price:.2f}",
+            "priceCurrency": currency,
+            "availability": f"{SCHEMA}/{'InStock' if product.stock > 0 else 'OutOfStock'}",
+        },
+    }
+    if seo["description"]:
+        data["description"] = seo["description"]
+    if image:
+        data["image"] = image
+    return data
+
+
+def breadcrumb_list(items):
+    """BreadcrumbList of the (name, absolute URL) `items`, from the home page."""
+    return {
+        "@context": SCHEMA,
+        "@type": "BreadcrumbList",
+        "itemListElement": [
+            {"@type": "ListItem", "position": position, "name": name, "item": url}
+            for position, (name, url) in enumerate(items, 1)
+        ],
+    }
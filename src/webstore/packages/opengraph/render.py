@@ -0,0 +1,69 @@
+"""
+The HTML of the builders and its cache.
+
+The tags of a model are serialized once per version of the object (its
+`modified` time) and URL, and kept in the cache for OPENGRAPH_CACHE_TIMEOUT
+seconds; a save changes the version, the old entries expire.
+"""
+
+import json
+from functools import lru_cache
+from hashlib import md5
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.files.images import get_image_dimensions
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+# json_script, for a <script> of another type
+_JSON_ESCAPES = {ord("<"): "\\u003C", ord(">"): "\\u003E", ord("&"): "\\u0026"}
+
+
+def meta_tags(tags, attribute="property"):
+    """<meta> of the (name, content) `tags`; Twitter Cards use `name`."""
+    return format_html_join(
+        "\n",
+        '<meta {}="{}" content="{}">',
+        ((attribute, name, content) for name, content in tags),
+    )
+
+
+def ld_json(data):
+    """`data` in a JSON-LD <script>, safe to output in the HTML."""
+    serialized = json.dumps(data, ensure_ascii=False).translate(_JSON_ESCAPES)
+    return format_html(
+        '<script type="application/ld+json">{}</script>', mark_safe(serialized)
+    )
+
+
+def cache_key(obj, *parts):
+    version = int(obj.modified.timestamp() * 1_000_000)
+    digest = md5("\n".join(map(str, parts)).encode()).hexdigest()
+    return f"opengraph:{obj._meta.label_lower}:{obj.pk}:{version}:{digest}"
+
+
+def cached(obj, build, *parts):
+    """The HTML of `build()` for this version of `obj` and the `parts` (URLs)."""
+    key = cache_key(obj, *parts)
+    html = cache.get(key)
+    if html is None:
+        html = str(build())
+        cache.set(key, html, timeout=settings.OPENGRAPH_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+@lru_cache(maxsize=None)
+def static_image_dimensions(url):
+    """(width, height) of a static image, read once per process."""
+    path = url.removeprefix(settings.STATIC_URL)
+    try:
+        with staticfiles_storage.open(path) as image:
+            return get_image_dimensions(image)
+    except OSError:
+        pass
+    # not collected (development)
+    found = finders.find(path)
+    return get_image_dimensions(found) if found else (None, None)
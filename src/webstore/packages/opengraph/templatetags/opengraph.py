@@ -0,0 +1,70 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from ..builders import breadcrumb_list, open_graph, twitter_card
+from ..render import cached, ld_json, meta_tags
+
+register = template.Library()
+
+
+def _render(seo, url, site, breadcrumbs=None):
+    parts = [
+        meta_tags(open_graph(seo, url, site["og_site_name"])),
+        meta_tags(twitter_card(seo, site["twitter_handle"]), "name"),
+    ]
+    if breadcrumbs:
+        parts.append(ld_json(breadcrumb_list(breadcrumbs)))
+    return mark_safe("\n".join(parts))
+
+
+@register.simple_tag(takes_context=True)
+def opengraph_tags(context, obj=None):
+    """
+    Usage: {% opengraph_tags brand %}
+
+    The Open Graph and Twitter Card <meta> of a SEOMixin model (with
+    `get_absolute_url`) and the JSON-LD BreadcrumbList of its
+    `get_breadcrumbs()`, cached per version of the object. The values it
+    leaves empty and the pages without `obj` use the site `global_seo`.
+    """
+    request = context["request"]
+    site = context["global_seo"]
+    defaults = {
+        "title": site["title"],
+        "description": site["description"],
+        "image": site["image"],
+        "image_width": site["image_width"],
+        "image_height": site["image_height"],
+    }
+    if not obj:
+        return _render(defaults, request.build_absolute_uri(), site)
+
+    url = request.build_absolute_uri(obj.get_absolute_url())
+
+    def build():
+        seo = obj.get_seo()
+        seo["title"] = seo["title"] or str(obj)
+        seo["description"] = seo["description"] or defaults["description"]
+        if seo["image"]:
+            seo["image"] = request.build_absolute_uri(seo["image"])
+        else:
+            seo.update(
+                image=defaults["image"],
+                image_width=defaults["image_width"],
+                image_height=defaults["image_height"],
+            )
+        breadcrumbs = [(site["name"], request.build_absolute_uri("/"))]
+        for name, path in getattr(obj, "get_breadcrumbs", list)():
+            breadcrumbs.append((name, request.build_absolute_uri(path)))
+        return _render(seo, url, site, breadcrumbs)
+
+    # the site values are part of the output
+    return cached(
+        obj,
+        build,
+        url,
+        *sorted(defaults.items()),
+        site["name"],
+        site["og_site_name"],
+        site["twitter_handle"],
+    )
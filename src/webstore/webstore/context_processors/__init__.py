@@ -1,4 +1,5 @@
+from .lazy import lazy_context
 from .settings import settings_export
 from .template_preloads import set_request, clear_request
 
-__all__ = [settings_export, set_request, clear_request]
+__all__ = [lazy_context, settings_export, set_request, clear_request]
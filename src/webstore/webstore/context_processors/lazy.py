@@ -0,0 +1,84 @@
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+
+from django.utils.functional import SimpleLazyObject
+
+# Per-process counters, keyed by the dotted path of the wrapped processor
+_stats = {}
+_stats_lock = Lock()
+
+# Request attribute holding the memoized results of the lazy processors
+REQUEST_CACHE_ATTR = "_lazy_context"
+
+
+def _record(name, evaluated=False, elapsed=0.0):
+    with _stats_lock:
+        stats = _stats.setdefault(name, {"offered": 0, "evaluated": 0, "seconds": 0.0})
+        if evaluated:
+            stats["evaluated"] += 1
+            stats["seconds"] += elapsed
+        else:
+            stats["offered"] += 1
+
+
+def get_stats():
+    """
+    Return a snapshot of the lazy processors counters for this process:
+    how many renders offered the values, how many evaluated them, the hit
+    rate and the average evaluation time in milliseconds.
+    """
+    with _stats_lock:
+        snapshot = {name: dict(stats) for name, stats in _stats.items()}
+
+    for stats in snapshot.values():
+        offered, evaluated = stats["offered"], stats["evaluated"]
+        stats["hit_rate"] = evaluated / offered if offered else 0.0
+        stats["avg_ms"] = stats["seconds"] * 1000 / evaluated if evaluated else 0.0
+    return snapshot
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def lazy_context(*keys):
+    """
+    Turn a context processor into a lazy one.
+
+    The wrapped processor only runs when a template first touches one of the
+    declared `keys`, and its result is memoized on the request so includes
+    and multiple renders during the same request share a single evaluation.
+
+        @lazy_context("global_seo")
+        def global_seo(request):
+            ...
+
+    The original function stays available as `processor.eager`.
+    """
+
+    def decorator(processor):
+        name = f"{processor.__module__}.{processor.__name__}"
+
+        def evaluate(request):
+            cache = request.__dict__.setdefault(REQUEST_CACHE_ATTR, {})
+            if name not in cache:
+                start = perf_counter()
+                cache[name] = processor(request)
+                _record(name, evaluated=True, elapsed=perf_counter() - start)
+            return cache[name]
+
+        @wraps(processor)
+        def wrapper(request):
+            _record(name)
+            return {
+                key: SimpleLazyObject(lambda key=key: evaluate(request)[key])
+                for key in keys
+            }
+
+        wrapper.eager = processor
+        wrapper.lazy_keys = keys
+        return wrapper
+
+    return decorator
@@ -1,8 +1,10 @@
+from threading import Lock
+from types import MappingProxyType
+
 from django.conf import settings as django_settings
 from django.core.exceptions import ImproperlyConfigured
-
-
-VARIABLE_NAME = getattr(django_settings, "SETTINGS_EXPORT_VARIABLE_NAME", "settings")
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 
 class SettingsExportError(ImproperlyConfigured):
@@ -23,11 +25,10 @@ def settings_export(request):
     `SETTINGS_EXPORT` to the context. If SETTINGS_EXPORT_VARIABLE_NAME is not
     set, the context variable will be `settings`.
 
+    The exported settings are built once (see `build_exported_settings`) and
+    the same read-only mapping is returned for every request.
     """
-    variable_name = getattr(
-        django_settings, "SETTINGS_EXPORT_VARIABLE_NAME", "settings"
-    )
-    return {variable_name: _get_exported_settings()}
+    return _exported_context or build_exported_settings()
 
 
 class ExportedSettings(dict):
@@ -47,9 +48,20 @@ class ExportedSettings(dict):
                 " `settings.SETTINGS_EXPORT` to change that.".format(key=item)
             )
 
+    def _readonly(self, *args, **kwargs):
+        """The exported settings are shared between requests, never mutate them."""
+        raise TypeError("ExportedSettings is read-only.")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+_exported_context = None
+_exported_lock = Lock()
+
 
 def _get_exported_settings():
-    exported_settings = ExportedSettings()
+    exported_settings = {}
     for key in getattr(django_settings, "SETTINGS_EXPORT", []):
         try:
             value = getattr(django_settings, key)
@@ -59,4 +71,37 @@ def _get_exported_settings():
                 "but it does not exist. " % key
             )
         exported_settings[key] = value
-    return exported_settings
+    return ExportedSettings(exported_settings)
+
+
+def build_exported_settings():
+    """
+    Build and validate the exported settings context once per process.
+
+    Called from `InternalConfig.ready()` so a bad `SETTINGS_EXPORT` raises
+    `UndefinedSettingError` at boot, not at the first render.
+    """
+    global _exported_context
+    if _exported_context is None:
+        with _exported_lock:
+            if _exported_context is None:
+                variable_name = getattr(
+                    django_settings, "SETTINGS_EXPORT_VARIABLE_NAME", "settings"
+                )
+                _exported_context = MappingProxyType(
+                    {variable_name: _get_exported_settings()}
+                )
+    return _exported_context
+
+
+@receiver(setting_changed)
+def reset_exported_settings(*, setting, **kwargs):
+    """Drop the prebuilt context when the settings change (override_settings)."""
+    global _exported_context
+    if _exported_context is None:
+        return
+    exported = next(iter(_exported_context.values()))
+    if setting in ("SETTINGS_EXPORT", "SETTINGS_EXPORT_VARIABLE_NAME") or (
+        setting in exported
+    ):
+        _exported_context = None
@@ -0,0 +1,18 @@
+"""
+The cache the processes coordinate through.
+
+The gunicorn workers and the Celery processes each hold their own copy of
+the host table, the search index, the suggestions and the listing counts;
+they learn about the changes made by the others from the versions kept in
+the "coordination" cache, with the snapshots, change logs, pending tasks
+and rate limits. Unlike the default cache it is never culled, a lost version
+would leave the processes serving stale data.
+"""
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+ALIAS = "coordination"
+
+# like django.core.cache.cache, an instance per thread
+cache = ConnectionProxy(caches, ALIAS)
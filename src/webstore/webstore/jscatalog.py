@@ -0,0 +1,119 @@
+"""
+Precompiled JavaScript translation catalogs.
+
+`compile_catalogs` renders the JavaScriptCatalog of every language at deploy
+time into STATIC_ROOT/i18n/system.<language>.<hash>.js (plus a .gz for
+nginx's gzip_static) and lists them in STATIC_ROOT/i18n/catalog.json. The
+pages load them through `{% javascript_catalog %}`, immutable for the
+browsers; the `javascript-catalog` view is only the fallback when the
+files are missing (development).
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from threading import Lock
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.templatetags.static import static
+from django.utils import translation
+from django.views.i18n import JavaScriptCatalog
+
+logger = logging.getLogger("django")
+
+CATALOG_DIR = "i18n"
+MANIFEST_NAME = "catalog.json"
+
+# arguments of the JavaScriptCatalog view
+JS_INFO_DICT = {
+    "domain": "django",
+    "packages": settings.PROJECT_APPS,
+}
+
+
+def manifest_path():
+    return Path(settings.STATIC_ROOT, CATALOG_DIR, MANIFEST_NAME)
+
+
+def render_catalog(language):
+    request = HttpRequest()
+    request.method = "GET"
+    with translation.override(language):
+        response = JavaScriptCatalog.as_view(**JS_INFO_DICT)(request)
+    return response.content
+
+
+def _write(path, content):
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_bytes(content)
+    os.replace(temporary, path)
+
+
+def compile_catalogs():
+    """Write the catalog files of all LANGUAGES, return the new manifest."""
+    directory = Path(settings.STATIC_ROOT, CATALOG_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    previous = {}
+    if manifest_path().exists():
+        previous = json.loads(manifest_path().read_text())
+
+    manifest = {}
+    for language, name in settings.LANGUAGES:
+        content = render_catalog(language)
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        path = directory.joinpath(f"system.{language}.{digest}.js")
+        if not path.exists():
+            _write(path, content)
+            # mtime=0: the same catalog always gives the same file
+            _write(
+                path.with_name(f"{path.name}.gz"),
+                gzip.compress(content, compresslevel=9, mtime=0),
+            )
+        manifest[language] = f"{CATALOG_DIR}/{path.name}"
+
+    _write(manifest_path(), json.dumps(manifest, indent=2).encode())
+
+    # the pages cached with the previous catalogs still load them
+    keep = {Path(name).name for name in [*manifest.values(), *previous.values()]}
+    for path in directory.glob("system.*.js"):
+        if path.name not in keep:
+            path.unlink()
+            path.with_name(f"{path.name}.gz").unlink(missing_ok=True)
+
+    reset_manifest()
+    return manifest
+
+
+_manifest = None
+_lock = Lock()
+
+
+def load_manifest():
+    global _manifest
+    if _manifest is None:
+        with _lock:
+            if _manifest is None:
+                try:
+                    _manifest = json.loads(manifest_path().read_text())
+                except (OSError, ValueError) as e:
+                    logger.warning(f"[I18n] No precompiled JavaScript catalogs: {e}")
+                    _manifest = {}
+    return _manifest
+
+
+def reset_manifest():
+    global _manifest
+    _manifest = None
+
+
+def catalog_url(language=None):
+    """Static URL of the precompiled catalog of `language`, None if missing."""
+    language = language or translation.get_language() or settings.LANGUAGE_CODE
+    manifest = load_manifest()
+    name = manifest.get(language) or manifest.get(language.split("-")[0])
+    return static(name) if name else None
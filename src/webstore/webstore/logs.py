@@ -0,0 +1,142 @@
+"""
+Logging handlers and formatters.
+
+`QueueListenerHandler` is the only handler attached to the loggers: the
+request threads put the records on a queue and a background thread hands
+them to the real (file, console, email) handlers, so a slow disk or SMTP
+server never blocks a response.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+
+from django.conf import settings
+from django.utils.log import AdminEmailHandler
+
+from webstore.coordination import cache
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Queue the records for `handlers`, handled by a QueueListener thread.
+
+    The handlers are given as "cfg://handlers.<name>" references, so they
+    must be configured before this one (dictConfig goes in name order).
+    """
+
+    def __init__(self, handlers, maxsize=10_000, respect_handler_level=True):
+        super().__init__(Queue(maxsize))
+        # indexing resolves the cfg:// references of dictConfig's list
+        self.handlers = [handlers[i] for i in range(len(handlers))]
+        self.respect_handler_level = respect_handler_level
+        self.dropped = 0
+        self.listener = None
+        self.start()
+        atexit.register(self.stop)
+        # threads don't survive fork, the gunicorn workers start their own
+        os.register_at_fork(after_in_child=self.restart)
+
+    def start(self):
+        self.listener = QueueListener(
+            self.queue,
+            *self.handlers,
+            respect_handler_level=self.respect_handler_level,
+        )
+        self.listener.start()
+
+    def restart(self):
+        # the queue of the parent still lists its listener thread as waiting
+        # and would wake it instead of ours
+        self.queue = Queue(self.queue.maxsize)
+        self.start()
+
+    def stop(self):
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+    def prepare(self, record):
+        # same process, nothing to pickle: keep exc_info and request for the
+        # admin emails, only freeze the message
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            # better lose records than block the requests
+            self.dropped += 1
+
+
+class RateLimitedAdminEmailHandler(AdminEmailHandler):
+    """
+    AdminEmailHandler sending one email per error signature (the exception
+    type and traceback frames, or the logging call site) and per
+    ADMIN_EMAIL_RATE_WINDOW seconds.
+
+    The signatures sent are marked in the coordination cache, so the dedup
+    spans all the processes sharing it (the workers and hosts using the same
+    database or Redis server). A per-process cache (tests) only dedups
+    within the process.
+    """
+
+    def signature(self, record):
+        if record.exc_info and record.exc_info[0]:
+            exc_type, exc, tb = record.exc_info
+            frames = [
+                (frame.filename, frame.lineno, frame.name)
+                for frame in traceback.extract_tb(tb)
+            ]
+            key = repr((exc_type.__qualname__, frames))
+        else:
+            key = repr((record.pathname, record.lineno, record.levelno))
+        return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+    def emit(self, record):
+        key = f"admin-email:{self.signature(record)}"
+        try:
+            first = cache.add(key, 1, settings.ADMIN_EMAIL_RATE_WINDOW)
+        except Exception:
+            # no cache, no deduplication
+            first = True
+        if first:
+            super().emit(record)
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, for the log shippers."""
+
+    def format(self, record):
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        request = getattr(record, "request", None)
+        if request is not None and hasattr(request, "path"):
+            data["method"] = request.method
+            data["path"] = request.path
+        status_code = getattr(record, "status_code", None)
+        if status_code is not None:
+            data["status_code"] = status_code
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exception"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
@@ -1,12 +1,25 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.utils import translation
 
 
 class SetForceLanguageMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         translation.activate("ro_RO")
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         response = self.get_response(request)
         translation.deactivate()
         return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        translation.deactivate()
+        return response
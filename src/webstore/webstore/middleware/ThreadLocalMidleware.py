@@ -1,5 +1,8 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
 from webstore.threadlocals import set_current_request
 
+
 class ThreadLocalMiddleware:
     """
     Middleware that stores the current HTTP request in thread-local storage.
@@ -11,8 +14,14 @@ class ThreadLocalMiddleware:
 
     This pattern should be used with care, as excessive use of thread-locals can
     make code harder to debug and test.
+
+    Under ASGI the storage is per request context rather than per thread, the
+    request is also seen by the `sync_to_async` code called for it.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         """
         One-time configuration and initialization.
@@ -21,6 +30,8 @@ class ThreadLocalMiddleware:
             get_response (callable): The next middleware or view function.
         """
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
         """
@@ -35,5 +46,20 @@ class ThreadLocalMiddleware:
         Returns:
             HttpResponse: The response returned by the view or subsequent middleware.
         """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         set_current_request(request)
         return self.get_response(request)
+
+    async def __acall__(self, request):
+        """
+        The asynchronous `__call__`, used when the next middleware is async.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request object.
+
+        Returns:
+            HttpResponse: The response returned by the view or subsequent middleware.
+        """
+        set_current_request(request)
+        return await self.get_response(request)
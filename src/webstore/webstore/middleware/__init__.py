@@ -1,4 +1,11 @@
-from .removewww import RemoveWWWMiddleware
+from .maintenance import MaintenanceModeMiddleware
+from .primaryPin import PrimaryPinMiddleware
+from .profiler import ProfilerMiddleware
 from .ThreadLocalMidleware import ThreadLocalMiddleware
 
-__all__ = [RemoveWWWMiddleware, ThreadLocalMiddleware]
+__all__ = [
+    MaintenanceModeMiddleware,
+    PrimaryPinMiddleware,
+    ProfilerMiddleware,
+    ThreadLocalMiddleware,
+]
@@ -0,0 +1,30 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from maintenance_mode.middleware import MaintenanceModeMiddleware as BaseMiddleware
+
+
+class MaintenanceModeMiddleware(BaseMiddleware):
+    """
+    django-maintenance-mode's middleware, also async: the upstream one is sync
+    only, as the last middleware it would run the whole stack of an ASGI
+    request in a thread. The state backend reads the database, it runs with
+    `sync_to_async` (and sees the request of ThreadLocalMiddleware).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        response = await sync_to_async(self.process_request)(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
@@ -0,0 +1,83 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from webstore.routers import has_written, pin_primary
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+
+class PrimaryPinMiddleware:
+    """
+    Read-your-writes for the replica router.
+
+    A request that writes (or any unsafe method) sets a short lived cookie,
+    the requests of that client read from the primary until it expires,
+    which covers the replication lag. It must run before the middlewares
+    reading the database (sessions, auth).
+
+    A streamed response (webstore.streaming) renders its template while the
+    server sends it, the pin is kept until the response is closed. The
+    cookie is set when the middleware returns, a write made by the template
+    doesn't pin the client.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        pin_primary(settings.REPLICA_PIN_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+            wrote = has_written()
+        except BaseException:
+            pin_primary(False)
+            raise
+        self.unpin(response)
+        return self.set_pin(request, response, wrote)
+
+    async def __acall__(self, request):
+        # the state is the request's, seen by its sync_to_async queries
+        pin_primary(settings.REPLICA_PIN_COOKIE in request.COOKIES)
+        try:
+            response = await self.get_response(request)
+            wrote = has_written()
+        except BaseException:
+            pin_primary(False)
+            raise
+        self.unpin(response)
+        return self.set_pin(request, response, wrote)
+
+    @staticmethod
+    def unpin(response):
+        if not response.streaming:
+            pin_primary(False)
+            return
+        # the template renders (and queries) while the server sends it
+        close = response.close
+
+        def close_and_unpin():
+            try:
+                close()
+            finally:
+                pin_primary(False)
+
+        response.close = close_and_unpin
+
+    def set_pin(self, request, response, wrote):
+        if settings.DATABASE_REPLICAS and (wrote or request.method not in SAFE_METHODS):
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,56 @@
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from webstore.profiler import sampler
+
+
+class ProfilerMiddleware:
+    """
+    Profile PROFILER_SAMPLE_RATE of the requests with the stack sampler,
+    see `webstore.profiler`. Off unless PROFILER_ENABLED, it goes first so
+    the other middlewares are part of the stacks.
+
+    The sampler follows the thread of a request, the async requests (which
+    share the event loop thread) aren't profiled.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.get_response(request)
+        if random.random() >= settings.PROFILER_SAMPLE_RATE:
+            return self.get_response(request)
+
+        sampler.add(request)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            sampler.remove()
+            raise
+        if response.streaming:
+            # the template renders while the server sends the response, the
+            # server closes it when done
+            close = response.close
+
+            def close_and_remove():
+                try:
+                    close()
+                finally:
+                    sampler.remove()
+
+            response.close = close_and_remove
+        else:
+            sampler.remove()
+        return response
@@ -0,0 +1,156 @@
+"""
+Statistical request profiler.
+
+A sampler thread looks at the stacks of the threads serving a profiled
+request every PROFILER_INTERVAL seconds (`sys._current_frames`, no tracing
+hooks, so the request runs at full speed) and counts them per URL name once
+the request is done. Every PROFILER_FLUSH seconds the counts are added to
+the ones of PROFILER_ROOT/<pid>.collapsed and reset, so the memory only holds
+the stacks of the last period and a file one line per distinct stack. The
+files are in the collapsed format of flamegraph.pl and speedscope, with the
+URL name as root frame; `dump_profile` merges them and `--clear` deletes them.
+"""
+
+import logging
+import os
+import sys
+import sysconfig
+import threading
+from collections import Counter
+from pathlib import Path
+from time import monotonic, sleep
+
+from django.conf import settings
+
+logger = logging.getLogger("django")
+
+# folded out of the frame labels
+_PREFIXES = sorted(
+    {
+        *(str(Path(path)) + os.sep for path in sys.path if path),
+        sysconfig.get_paths()["stdlib"] + os.sep,
+    },
+    key=len,
+    reverse=True,
+)
+
+
+def frame_label(code):
+    filename = code.co_filename
+    for prefix in _PREFIXES:
+        if filename.startswith(prefix):
+            filename = filename[len(prefix) :]
+            break
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+def collapse(frame, limit=128):
+    """The stack of `frame` as "root;...;leaf"."""
+    labels = []
+    while frame is not None and len(labels) < limit:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def url_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match and match.view_name else "unresolved"
+
+
+class Sampler:
+    def __init__(self):
+        self.active = {}  # thread id -> (request, {stack: samples})
+        self.stacks = Counter()  # (url name, stack) -> samples
+        self.lock = threading.Lock()
+        self.thread = None
+        self.pid = None
+
+    def start(self):
+        # a fork (gunicorn worker) inherits the object but not the thread
+        if self.thread is None or self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.stacks.clear()
+            self.thread = threading.Thread(
+                target=self.run, name="profiler-sampler", daemon=True
+            )
+            self.thread.start()
+
+    def add(self, request):
+        with self.lock:
+            self.start()
+            self.active[threading.get_ident()] = (request, Counter())
+
+    def remove(self):
+        """Count the samples of the request under its (now resolved) URL name."""
+        with self.lock:
+            request, stacks = self.active.pop(threading.get_ident(), (None, None))
+            if stacks:
+                name = url_name(request)
+                for stack, count in stacks.items():
+                    self.stacks[(name, stack)] += count
+
+    def sample(self):
+        if not self.active:
+            return
+        frames = sys._current_frames()
+        with self.lock:
+            for ident, (request, stacks) in self.active.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    stacks[collapse(frame)] += 1
+
+    def run(self):
+        flushed = monotonic()
+        while True:
+            sleep(settings.PROFILER_INTERVAL)
+            try:
+                self.sample()
+                if monotonic() - flushed > settings.PROFILER_FLUSH:
+                    flushed = monotonic()
+                    self.flush()
+            except Exception:
+                logger.exception("[Profiler] Sampling failed")
+
+    def flush(self):
+        """Add the counts of this process to its file and start over."""
+        with self.lock:
+            stacks, self.stacks = self.stacks, Counter()
+        if not stacks:
+            return
+        root = Path(settings.PROFILER_ROOT)
+        root.mkdir(parents=True, exist_ok=True)
+        path = root.joinpath(f"{self.pid}.collapsed")
+        # only this process writes the file, the readers see the old or the
+        # new version (the pid of a gone process can be reused, its counts are
+        # added to)
+        counts = read_collapsed(path) if path.exists() else Counter()
+        for (name, stack), count in stacks.items():
+            counts[f"{name};{stack}"] += count
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in counts.items()),
+            encoding="utf-8",
+        )
+        os.replace(temporary, path)
+
+
+sampler = Sampler()
+
+
+def read_collapsed(path):
+    """The collapsed stacks of one file: {stack: samples}."""
+    stacks = Counter()
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack and count.isdigit():
+            stacks[stack] += int(count)
+    return stacks
+
+
+def read_profiles(root=None):
+    """Merge the collapsed stacks of all the processes: {line: samples}."""
+    stacks = Counter()
+    for path in Path(root or settings.PROFILER_ROOT).glob("*.collapsed"):
+        stacks.update(read_collapsed(path))
+    return stacks
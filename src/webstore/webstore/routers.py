@@ -0,0 +1,125 @@
+"""
+Primary/replica database routing.
+
+Writes always go to `default`, reads are spread over the healthy replicas
+listed in `DATABASE_REPLICAS`. A replica is dropped from the rotation while
+its replication lag is above `REPLICA_MAX_LAG` or it can't be reached.
+
+Reads go back to the primary when the request is pinned (it wrote, or a
+recent response of the client did, see `PrimaryPinMiddleware`) and inside
+transactions, so a client always reads its own writes.
+"""
+
+import logging
+import random
+import threading
+from time import monotonic
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger("django")
+
+# the request's, followed into the sync_to_async threads under ASGI
+_state = Local()
+
+
+def pin_primary(pinned=True):
+    """Send the reads of the current request (thread) to the primary."""
+    _state.pinned = pinned
+    _state.wrote = False
+
+
+def is_pinned():
+    return getattr(_state, "pinned", False)
+
+
+def has_written():
+    return getattr(_state, "wrote", False)
+
+
+def replica_lag(alias):
+    """
+    Return the replication lag of a database in seconds, None when the
+    replication is broken. SQLite replicas are copies refreshed out of band.
+    """
+    connection = connections[alias]
+    if connection.vendor != "mysql":
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW REPLICA STATUS")
+        row = cursor.fetchone()
+        if row is None:
+            # not a replica (a cluster node), nothing to lag behind
+            return 0
+        status = dict(zip((column[0] for column in cursor.description), row))
+    return status.get("Seconds_Behind_Master", status.get("Seconds_Behind_Source"))
+
+
+# DatabaseCache entries: the versions have to be read where they are
+# written, and writing one (a fragment) doesn't pin the client
+CACHE_APP_LABEL = "django_cache"
+
+
+class PrimaryReplicaRouter:
+    def __init__(self):
+        self._health = {}  # alias -> (checked at, healthy)
+        self._lock = threading.Lock()
+
+    def _check(self, alias):
+        try:
+            lag = replica_lag(alias)
+        except DatabaseError as e:
+            logger.warning(f"[Router] Replica {alias} is unreachable: {e}")
+            return False
+        if lag is None:
+            # replication stopped (Seconds_Behind_Master is NULL)
+            logger.warning(f"[Router] Replica {alias} lag unknown")
+            return False
+        if lag > settings.REPLICA_MAX_LAG:
+            logger.warning(f"[Router] Replica {alias} lags behind ({lag}s)")
+            return False
+        return True
+
+    def healthy_replicas(self):
+        now = monotonic()
+        healthy = []
+        for alias in settings.DATABASE_REPLICAS:
+            checked, ok = self._health.get(alias, (None, False))
+            if checked is None or now - checked > settings.REPLICA_CHECK_INTERVAL:
+                with self._lock:
+                    ok = self._check(alias)
+                    self._health[alias] = (now, ok)
+            if ok:
+                healthy.append(alias)
+        return healthy
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        if not settings.DATABASE_REPLICAS or is_pinned():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = self.healthy_replicas()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        # the following reads of this request see the write
+        _state.wrote = True
+        _state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
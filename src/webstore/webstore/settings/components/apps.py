@@ -1,5 +1,6 @@
 # Application definition
 
+from os import getenv
 from typing import Tuple
 
 PREREQ_APPS: Tuple[str, ...] = (
@@ -30,13 +31,23 @@ PREREQ_APPS: Tuple[str, ...] = (
     "maintenance_mode",
 )
 
-PACKAGES: Tuple[str, ...] = ("packages.tagify",)
+# only used by the management commands, left out of the web workers started
+# with the lean profile (WORKER_PROFILE=lean, set by gunicorn.conf.py)
+COMMAND_APPS: Tuple[str, ...] = ("django_extensions",)
+
+if getenv("WORKER_PROFILE") == "lean":
+    PREREQ_APPS = tuple(app for app in PREREQ_APPS if app not in COMMAND_APPS)
+
+PACKAGES: Tuple[str, ...] = ("packages.tagify", "packages.opengraph")
 
 PROJECT_APPS: Tuple[str, ...] = (
     "apps.internal",
     "apps.siteSettings",
     "apps.frontpage",
     "apps.brands",
+    "apps.catalog",
+    "apps.search",
+    "apps.zipCodes",
 )
 
 # Application definition
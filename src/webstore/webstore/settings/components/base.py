@@ -1,11 +1,37 @@
-from os import getenv
+import sys
+from os import environ, getenv
+
+from webstore.settings import ROOT_DIR
 
 ROOT_URLCONF = "webstore.urls"
 
 WSGI_APPLICATION = "webstore.wsgi.application"
 
+# requested by each worker before it takes traffic, see webstore/warmup.py
+WARMUP_URLS = [
+    "frontpage:frontpage:index",
+    "brands:index",
+    "search:index",
+    "javascript-catalog",
+]
+# the warmup timings of every worker, one JSON line each
+WARMUP_LOG = str(ROOT_DIR.joinpath("var", "log", "warmup.log"))
+
+# written by gunicorn, see gunicorn.conf.py and `manage.py reload_workers`
+GUNICORN_PIDFILE = getenv(
+    "GUNICORN_PIDFILE", str(ROOT_DIR.joinpath("var", "run", "gunicorn.pid"))
+)
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = getenv("DEBUG", False)
+DEBUG = getenv("DEBUG", "0").lower() in ("1", "true")
+
+# running the test suite (manage.py test or pytest), the processes it starts
+# (probes, gunicorn) inherit it
+TESTING = bool(
+    "test" in sys.argv[1:2] or "pytest" in sys.modules or getenv("DJANGO_TESTING")
+)
+if TESTING:
+    environ["DJANGO_TESTING"] = "1"
 
 # Celery Configuration Options
 CELERY_TIMEZONE = "Europa/Bucharest"
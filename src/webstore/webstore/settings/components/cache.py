@@ -1,14 +1,60 @@
-CELERY_RESULT_BACKEND = "django-cache"
-# pick which cache from the CACHES setting.
-CELERY_CACHE_BACKEND = "default"
+from os import getenv
 
+from django.core.exceptions import ImproperlyConfigured
+
+CELERY_BROKER_URL = getenv("CELERY_BROKER_URL")
+# Without a broker the tasks run in the process that sends them (eager), in
+# development and the tests only, or when CELERY_TASK_ALWAYS_EAGER is set.
+# Eager tasks run inside the request and ignore `countdown`, the debounced
+# index rebuilds run on every save.
+CELERY_TASK_ALWAYS_EAGER = getenv("CELERY_TASK_ALWAYS_EAGER", "0").lower() in (
+    "1",
+    "true",
+) or (not CELERY_BROKER_URL and (DEBUG or TESTING))
+if not CELERY_BROKER_URL and not CELERY_TASK_ALWAYS_EAGER:
+    raise ImproperlyConfigured(
+        "CELERY_BROKER_URL is not set: the emails and the facet and search "
+        "indexes need a Celery worker. Set CELERY_TASK_ALWAYS_EAGER=1 to run "
+        "the tasks in the web processes instead."
+    )
+# django_celery_results, the results don't take the room of the cache
+CELERY_RESULT_BACKEND = "django-db"
+
+# The rendered fragments, counts and the like, lost without harm (culled when
+# full). A Redis server (django.core.cache.backends.redis.RedisCache, with the
+# redis package) can replace the database cache through CACHE_BACKEND and
+# CACHE_LOCATION; the database tables are made by `createcachetable`.
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "unique-snowflake",
+        "BACKEND": getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"
+        ),
+        "LOCATION": getenv("CACHE_LOCATION", "cache_default"),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    # The processes (gunicorn workers, Celery) coordinate through this one:
+    # the versions of the in-memory indexes and tables, the snapshots, the
+    # change logs, the pending tasks and the rate limits (webstore.coordination).
+    # It has to be shared by all of them (the internal.E001 check) and must
+    # not evict its keys: its few entries are never culled (a Redis server
+    # set with `maxmemory-policy noeviction`).
+    "coordination": {
+        "BACKEND": getenv(
+            "COORDINATION_CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"
+        ),
+        "LOCATION": getenv("COORDINATION_CACHE_LOCATION", "cache_coordination"),
+        "OPTIONS": {"MAX_ENTRIES": 10_000_000},
     },
     "staticfiles": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "unique-snowflake",
     },
 }
+
+# one process and a throwaway database
+if TESTING:
+    for alias in ("default", "coordination"):
+        CACHES[alias] = {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": alias,
+        }
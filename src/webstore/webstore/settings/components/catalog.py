@@ -0,0 +1,17 @@
+from webstore.settings import ROOT_DIR
+
+# the facet index files, mmap'ed by every worker
+CATALOG_INDEX_ROOT = str(ROOT_DIR.joinpath("var", "cache", "catalog"))
+# seconds to wait before rebuilding the facet index of a changed site
+CATALOG_INDEX_DEBOUNCE = 30
+
+# "fts5" or "memory", picked from the database when None
+SEARCH_BACKEND = None
+
+# the most popular products offered by the search box suggestions
+AUTOCOMPLETE_PRODUCTS = 20000
+# seconds between two checks for changes of the suggestions sources
+AUTOCOMPLETE_REFRESH = 30
+
+# the most SKUs answered by one request of the stock endpoint
+STOCK_LOOKUP_LIMIT = 50
@@ -1,19 +1,95 @@
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+from os import getenv
+from urllib.request import pathname2url
+
 from webstore.settings import ROOT_DIR
 
-DATABASES = {
-    "default": {
+# Under ASGI the connections belong to the context of a request, not to a
+# thread reused by the next one: the persistent ones would pile up, one per
+# request, so the workers open them per request.
+# https://docs.djangoproject.com/en/5.2/ref/databases/#persistent-connections
+ASGI_WORKER = "uvicorn" in getenv("GUNICORN_WORKER_CLASS", "").lower()
+
+
+def sqlite_primary(path):
+    """
+    Connection profile of the read/write SQLite database: WAL lets the
+    readers run next to a writer, IMMEDIATE transactions take the write lock
+    up front (no deadlocked lock upgrades) and the connections are kept by
+    the worker threads between requests (not under ASGI).
+    """
+    return {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": str(ROOT_DIR.joinpath("db.sqlite3")),
-    },
-    "zipCodes": {
+        "NAME": str(path),
+        "CONN_MAX_AGE": 0 if ASGI_WORKER else int(getenv("CONN_MAX_AGE", 600)),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA busy_timeout=5000;"
+                "PRAGMA temp_store=MEMORY;"
+                "PRAGMA mmap_size=134217728;"  # 128 MiB
+                "PRAGMA cache_size=-20000;"  # 20 MiB
+            ),
+        },
+    }
+
+
+def sqlite_reference(path):
+    """
+    Connection profile of the static, read-only SQLite files: the immutable
+    URI skips the file locking and change detection, the pages are read
+    through mmap.
+    """
+    return {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": str(ROOT_DIR.joinpath("romania_zip_codes.sqlite")),
-    },
+        "NAME": f"file:{pathname2url(str(path))}?mode=ro&immutable=1",
+        "CONN_MAX_AGE": 0 if ASGI_WORKER else None,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "uri": True,
+            "init_command": (
+                "PRAGMA query_only=1;"
+                "PRAGMA mmap_size=268435456;"  # 256 MiB
+                "PRAGMA cache_size=-8000;"  # 8 MiB
+            ),
+        },
+    }
+
+
+DATABASES = {
+    "default": sqlite_primary(ROOT_DIR.joinpath("db.sqlite3")),
+    "zipCodes": sqlite_reference(ROOT_DIR.joinpath("romania_zip_codes.sqlite")),
 }
 
+# Read replicas of the default database, a second SQLite copy works locally:
+# DATABASE_REPLICA=/path/to/copy.sqlite3
+DATABASE_REPLICAS = []
+if getenv("DATABASE_REPLICA"):
+    DATABASES["replica"] = sqlite_primary(getenv("DATABASE_REPLICA"))
+    DATABASES["replica"]["OPTIONS"]["init_command"] += "PRAGMA query_only=1;"
+    # the tests read and write the same database through both aliases
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append("replica")
+
+# replicas lagging more than this (in seconds) are skipped
+REPLICA_MAX_LAG = 5
+REPLICA_CHECK_INTERVAL = 10
+# how long a client reads from the primary after a write
+REPLICA_PIN_SECONDS = 15
+REPLICA_PIN_COOKIE = "pin_primary"
+
+DATABASE_ROUTERS = [
+    "apps.zipCodes.routers.ZipCodesRouter",
+    "webstore.routers.PrimaryReplicaRouter",
+]
+# load the zip codes index in the worker warmup (webstore.warmup)
+ZIP_CODES_PRELOAD = True
+
 # MIGRATION_MODULES = {
 #     "sites": "multisite.migrations",
 # }
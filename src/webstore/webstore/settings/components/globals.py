@@ -26,6 +26,11 @@ DEFAULT_SEO = {
     "THEME_COLOR": "#345212",
 }
 
+# packages.opengraph, the tags of an object are cached per version
+OPENGRAPH_CACHE_TIMEOUT = 60 * 60 * 24
+# the Product offers
+OPENGRAPH_CURRENCY = "RON"
+
 # check the resource_hints templatetags
 DNS_PREFETCH_DOMAINS = getenv("DNS_PREFETCH_DOMAINS").split(",")
 # check the resource_hints templatetags
@@ -1,8 +1,15 @@
 # Logging
 # https://docs.djangoproject.com/en/2.2/topics/logging/
 
+from os import getenv
+
 from webstore.settings import ROOT_DIR
 
+# "json" writes the log file one JSON object per line
+LOG_FORMAT = getenv("LOG_FORMAT", "verbose")
+# the same error emails the admins once per window (in seconds)
+ADMIN_EMAIL_RATE_WINDOW = 600
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -19,6 +26,9 @@ LOGGING = {
             "format": "%(asctime)s [%(levelname)s] %(message)s",
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
+        "json": {
+            "()": "webstore.logs.JSONFormatter",
+        },
     },
     "filters": {
         "require_not_maintenance_mode_503": {
@@ -30,36 +40,55 @@ LOGGING = {
             "level": "INFO",
             "class": "logging.FileHandler",
             "filename": str(ROOT_DIR.joinpath("var", "log", "django.log")),
-            "formatter": "verbose",
+            "formatter": LOG_FORMAT,
         },
         "email_admins": {
             "level": "ERROR",
-            "class": "django.utils.log.AdminEmailHandler",
+            "class": "webstore.logs.RateLimitedAdminEmailHandler",
         },
         "console": {
             "level": "INFO",
             "class": "logging.StreamHandler",
             "formatter": "simple",
         },
-        "console-verbose": {
+        "console_verbose": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
             "formatter": "verbose",
         },
+        # The loggers only use the queue handlers, the handlers above run in
+        # their listener threads. dictConfig configures the handlers in name
+        # order, the "queue" ones have to come last.
+        "queue": {
+            "class": "webstore.logs.QueueListenerHandler",
+            "handlers": [
+                "cfg://handlers.console",
+                "cfg://handlers.logfile",
+                "cfg://handlers.email_admins",
+            ],
+        },
+        "queue-file": {
+            "class": "webstore.logs.QueueListenerHandler",
+            "handlers": ["cfg://handlers.logfile", "cfg://handlers.email_admins"],
+        },
+        "queue-security": {
+            "class": "webstore.logs.QueueListenerHandler",
+            "handlers": ["cfg://handlers.console_verbose", "cfg://handlers.logfile"],
+        },
     },
     "loggers": {
         "django_file": {
-            "handlers": ["logfile", "email_admins"],
+            "handlers": ["queue-file"],
             "level": "DEBUG",
             "propagate": True,
         },
         "django": {
-            "handlers": ["console", "logfile", "email_admins"],
+            "handlers": ["queue"],
             "propagate": True,
             "level": "DEBUG",
         },
         "security": {
-            "handlers": ["console-verbose", "logfile"],
+            "handlers": ["queue-security"],
             "level": "DEBUG",
             "propagate": False,
         },
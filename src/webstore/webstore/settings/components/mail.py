@@ -9,7 +9,10 @@ DEFAULT_FROM_EMAIL = ''
 
 # https://docs.djangoproject.com/en/5.2/ref/settings/#email-backend
 # The backend to use for sending emails. For the list of available backends see Sending email.
-EMAIL_BACKEND = 'djcelery_email.backends.CeleryEmailBackend'
+# Batched per recipient domain, see apps/internal/mail.py
+EMAIL_BACKEND = 'apps.internal.mail.BatchedEmailBackend'
+# what the Celery workers deliver with
+CELERY_EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 
 # https://docs.djangoproject.com/en/5.2/ref/settings/#email-host
 EMAIL_HOST = 'smtp.gmail.com'
@@ -41,4 +44,5 @@ CELERY_EMAIL_TASK_CONFIG = {
 	'rate_limit': '50/m',  # * CELERY_EMAIL_CHUNK_SIZE (default: 10)
 	'ignore_result': False,
 }
-CELERY_EMAIL_CHUNK_SIZE = 1
+# messages per task (and per SMTP session), grouped by recipient domain
+CELERY_EMAIL_CHUNK_SIZE = 50
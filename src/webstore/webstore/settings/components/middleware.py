@@ -1,19 +1,39 @@
+from os import getenv
 from typing import Tuple
 
+from webstore.settings import ROOT_DIR
+
 MIDDLEWARE: Tuple[str, ...] = (
+    # sampling profiler, off unless PROFILER_ENABLED
+    "webstore.middleware.ProfilerMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # www redirects and request.site from the host table, before the sessions
+    "apps.siteSettings.middleware.HostCanonicalMiddleware",
+    # read-your-writes with the replicas, before anything reads the database
+    "webstore.middleware.PrimaryPinMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
-    "django.contrib.sites.middleware.CurrentSiteMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     # Force the language
     # "webstore.middleware.SetForceLanguageMiddleware.SetForceLanguageMiddleware",
     # push request to local thread
     "webstore.middleware.ThreadLocalMiddleware",
-    # https://github.com/fabiocaccamo/django-maintenance-mode
-    "maintenance_mode.middleware.MaintenanceModeMiddleware",
+    # https://github.com/fabiocaccamo/django-maintenance-mode, async capable
+    "webstore.middleware.MaintenanceModeMiddleware",
 )
+
+# Sampling profiler, dump the stacks with `manage.py dump_profile`
+PROFILER_ENABLED = getenv("PROFILER_ENABLED", "0") == "1"
+# share of the requests profiled
+PROFILER_SAMPLE_RATE = float(getenv("PROFILER_SAMPLE_RATE", 0.05))
+# seconds between two samples, and between two writes of the stacks
+PROFILER_INTERVAL = 0.005
+PROFILER_FLUSH = 30
+PROFILER_ROOT = str(ROOT_DIR.joinpath("var", "profile"))
+
+# seconds between two checks for changes of the host table (Site, SiteSettings)
+HOST_TABLE_REFRESH = 5
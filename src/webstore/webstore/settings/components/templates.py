@@ -1,3 +1,5 @@
+from os import getenv
+
 from django.conf import settings
 
 from webstore.settings import BASE_DIR
@@ -32,9 +34,15 @@ TEMPLATES = [
                 # local apps
                 "apps.siteSettings.context_processors.global_seo",
             ],
+            # compiled once per worker, see webstore/warmup.py
             "loaders": [
-                "django.template.loaders.filesystem.Loader",
-                "django.template.loaders.app_directories.Loader",
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
             ],
             "libraries": {
                 # resolve vars inside the static paths inside the template
@@ -50,3 +58,8 @@ TEMPLATES = [
         },
     },
 ]
+
+# the storefront pages are sent while they render (webstore/streaming.py),
+# in chunks of at least STREAMING_CHUNK_SIZE characters past the <head>
+STREAMING_RENDER = getenv("STREAMING_RENDER", "1") == "1"
+STREAMING_CHUNK_SIZE = 8192
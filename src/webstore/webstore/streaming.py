@@ -0,0 +1,169 @@
+"""
+Streaming template rendering.
+
+`render_stream` is the streaming `render()` of the storefront views: the
+template is rendered block by block while the server sends the response,
+so the <head> (resource hints, preloads, CSS) reaches the browser before
+the body is rendered. The chain of `{% extends %}` is walked the way
+ExtendsNode and BlockNode render it; the output is sent at the end of each
+block of the root template that rendered something (the <head> block, the
+body) and of the inner blocks once at least STREAMING_CHUNK_SIZE characters
+are pending.
+
+Under ASGI the response iterates asynchronously, each chunk rendered in the
+thread of the sync views (`thread_sensitive`), so the thread locals of the
+template tags and the database connection stay the same as with WSGI.
+
+The limits:
+
+- `_render_extends` and `_render_block` follow the private internals of
+  ExtendsNode.render and BlockNode.render (BlockContext, the render context
+  states); the tests compare the streamed output with `render_to_string`,
+  check them on every Django upgrade.
+- The response status and headers leave before the template renders: a
+  template error is logged (with the request, like the errors of the views)
+  but the client gets a truncated 200, and the template can't set cookies
+  (call `get_token` beforehand for a `{% csrf_token %}`).
+- The queries of the template run after the middlewares returned, the ones
+  keeping a per-request state until then (PrimaryPinMiddleware) keep it
+  until the response is closed.
+"""
+
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.template import loader
+from django.template.base import TextNode
+from django.template.context import make_context
+from django.template.loader_tags import (
+    BLOCK_CONTEXT_KEY,
+    BlockContext,
+    BlockNode,
+    ExtendsNode,
+)
+
+logger = logging.getLogger("django")
+
+# markers between the rendered strings
+_FLUSH = object()
+_BLOCK_END = object()
+
+
+def stream_template(template_name, context=None, request=None, using=None):
+    """Render the Django template `template_name` as an iterator of strings."""
+    template = loader.get_template(template_name, using=using)
+    context = make_context(
+        context, request, autoescape=template.backend.engine.autoescape
+    )
+    chunks = _coalesce(
+        _render(template.template, context), settings.STREAMING_CHUNK_SIZE
+    )
+    return _logged(chunks, template_name, request)
+
+
+def render_stream(
+    request, template_name, context=None, content_type=None, status=None, using=None
+):
+    """`django.shortcuts.render`, streamed unless STREAMING_RENDER is off."""
+    if not settings.STREAMING_RENDER:
+        return render(request, template_name, context, content_type, status, using)
+    chunks = stream_template(template_name, context, request, using)
+    if isinstance(request, ASGIRequest):
+        chunks = _async_chunks(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type, status=status)
+
+
+async def _async_chunks(chunks):
+    render_next = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await render_next(chunks, None)) is not None:
+        yield chunk
+
+
+def _logged(chunks, template_name, request):
+    try:
+        yield from chunks
+    except Exception:
+        # the handler doesn't see it, the status is already sent
+        logger.exception(
+            f"[Streaming] Rendering {template_name} failed, the page is truncated",
+            extra={"status_code": 500, "request": request},
+        )
+        raise
+
+
+def _coalesce(pieces, size):
+    buffer = []
+    length = 0
+    for piece in pieces:
+        if piece is _FLUSH or (piece is _BLOCK_END and length >= size):
+            if buffer:
+                yield "".join(buffer)
+                buffer = []
+                length = 0
+        elif piece is not _BLOCK_END:
+            buffer.append(piece)
+            length += len(piece)
+    if buffer:
+        yield "".join(buffer)
+
+
+def _render(template, context):
+    # Template.render
+    with context.render_context.push_state(template):
+        with context.bind_template(template):
+            context.template_name = template.name
+            yield from _render_nodes(template.nodelist, context, root=True)
+
+
+def _render_nodes(nodelist, context, root=False):
+    for node in nodelist:
+        if isinstance(node, ExtendsNode):
+            yield from _render_extends(node, context)
+        elif isinstance(node, BlockNode):
+            rendered = False
+            for piece in _render_block(node, context):
+                rendered = rendered or isinstance(piece, str) and piece != ""
+                yield piece
+            # the root blocks with content are sent right away (the <head>)
+            yield _FLUSH if root and rendered else _BLOCK_END
+        else:
+            yield node.render_annotated(context)
+
+
+def _render_extends(node, context):
+    # ExtendsNode.render
+    parent = node.get_parent(context)
+    block_context = context.render_context.setdefault(BLOCK_CONTEXT_KEY, BlockContext())
+    block_context.add_blocks(node.blocks)
+    for child in parent.nodelist:
+        if not isinstance(child, TextNode):
+            if not isinstance(child, ExtendsNode):
+                block_context.add_blocks(
+                    {n.name: n for n in parent.nodelist.get_nodes_by_type(BlockNode)}
+                )
+            break
+    with context.render_context.push_state(parent, isolated_context=False):
+        yield from _render_nodes(parent.nodelist, context, root=True)
+
+
+def _render_block(node, context):
+    # BlockNode.render
+    block_context = context.render_context.get(BLOCK_CONTEXT_KEY)
+    with context.push():
+        if block_context is None:
+            context["block"] = node
+            yield from _render_nodes(node.nodelist, context)
+            return
+        push = block = block_context.pop(node.name)
+        if block is None:
+            block = node
+        block = type(node)(block.name, block.nodelist)
+        block.context = context
+        context["block"] = block
+        yield from _render_nodes(block.nodelist, context)
+        if push is not None:
+            block_context.push(node.name, push)
@@ -1,7 +1,6 @@
 import os
 import re
 import json
-import requests
 import logging
 from threading import Lock
 
@@ -9,8 +8,10 @@ from django import template
 from django.conf import settings
 from django.utils.safestring import mark_safe
 from django.templatetags.static import static
+from django.urls import reverse
 from urllib.parse import quote
 
+from webstore.jscatalog import catalog_url
 from webstore.threadlocals import add_preload, get_preloads, clear_preloads
 
 register = template.Library()
@@ -78,6 +79,9 @@ def build_google_fonts_url(fonts, display="swap"):
 
 
 def download_google_font(family_str):
+    # only the first render of a font needs it, ~80ms less for every worker
+    import requests
+
     font_links = []
     try:
 
@@ -210,6 +214,11 @@ def load_manifest():
     return _manifest_cache, WEBPACK_MANIFEST_ROOT
 
 
+def reset_manifest():
+    global _manifest_cache
+    _manifest_cache = None
+
+
 def resolve_asset(entry_name, exts, manifest, suffix=None):
     if isinstance(exts, str):
         exts = [exts]
@@ -378,6 +387,19 @@ def local_assets(assets: str, as_type=None, preloads=True, crossorigin=None, **a
     return mark_safe("\n".join(tags))
 
 
+# ---------===== JavaScript catalog =====---------
+
+
+@register.simple_tag
+def javascript_catalog():
+    """
+    The translation catalog of the current language, precompiled by
+    `compile_js_catalog`, or the dynamic `javascript-catalog` view.
+    """
+    url = catalog_url() or reverse("javascript-catalog")
+    return mark_safe(f'<script src="{url}"></script>')
+
+
 # ---------===== Render preloads =====---------
 @register.simple_tag
 def render_preloads():
@@ -1,17 +1,11 @@
 import logging
 import re
+from functools import cache
 from html import unescape
 
 from django import template
 from django.utils.safestring import mark_safe
 
-from pymdownx.slugs import slugify
-from pymdownx import emoji
-from markdown import Markdown, markdown
-from markdown.extensions.codehilite import CodeHiliteExtension
-from bleach.css_sanitizer import CSSSanitizer
-from bleach.sanitizer import Cleaner
-
 from webstore.utils.markdown.markdown import load_markdown
 
 register = template.Library()
@@ -33,7 +27,10 @@ def mermaid_formatter(name, code, options, md):
     return f'<div class="mermaid">{code}</div>'
 
 
-css_sanitizer = CSSSanitizer()
+# markdown, pymdownx, bleach and pygments are imported on the first render:
+# Django loads every templatetags module when the template engine starts, in
+# every worker, and only a few pages render markdown
+
 markdown_extensions = [
     # see: https://facelessuser.github.io/pymdown-extensions/extensions/superfences/
     "pymdownx.superfences",
@@ -71,106 +68,129 @@ markdown_extensions = [
     "webstore.utils.markdown.extensions.youtube",
 ]
 
-extension_configs = {
-    "markdown.extensions.toc": {"slugify": slugify(case="lower", percent_encode=True)},
-    "pymdownx.magiclink": {
-        "repo_url_shortener": True,
-        "repo_url_shorthand": True,
-        "provider": "github",
-        "user": "facelessuser",
-        "repo": "pymdown-extensions",
-    },
-    "pymdownx.tilde": {"subscript": False},
-    "pymdownx.emoji": {
-        "emoji_index": emoji.gemoji,
-        "emoji_generator": emoji.to_png,
-        "alt": "short",
-        "options": {
-            "attributes": {"align": "absmiddle", "height": "20px", "width": "20px"},
-            "image_path": "https://github.githubassets.com/images/icons/emoji/unicode/",
-            "non_standard_image_path": "https://github.githubassets.com/images/icons/emoji/",
+
+@cache
+def get_extension_configs():
+    from pymdownx import emoji
+    from pymdownx.slugs import slugify
+
+    return {
+        "markdown.extensions.toc": {
+            "slugify": slugify(case="lower", percent_encode=True)
+        },
+        "pymdownx.magiclink": {
+            "repo_url_shortener": True,
+            "repo_url_shorthand": True,
+            "provider": "github",
+            "user": "facelessuser",
+            "repo": "pymdown-extensions",
+        },
+        "pymdownx.tilde": {"subscript": False},
+        "pymdownx.emoji": {
+            "emoji_index": emoji.gemoji,
+            "emoji_generator": emoji.to_png,
+            "alt": "short",
+            "options": {
+                "attributes": {"align": "absmiddle", "height": "20px", "width": "20px"},
+                "image_path": "https://github.githubassets.com/images/icons/emoji/unicode/",
+                "non_standard_image_path": "https://github.githubassets.com/images/icons/emoji/",
+            },
         },
-    },
-    "pymdownx.superfences": {
-        "custom_fences": [
-            {
-                "name": "mermaid",
-                "class": "mermaid",
-                "format": lambda name, code, options, md: f'<div class="mermaid">{code.strip()}</div>',
-            }
+        "pymdownx.superfences": {
+            "custom_fences": [
+                {
+                    "name": "mermaid",
+                    "class": "mermaid",
+                    "format": lambda name, code, options, md: f'<div class="mermaid">{code.strip()}</div>',
+                }
+            ],
+        },
+        "pymdownx.highlight": {
+            "linenums": True,
+            "noclasses": True,
+            "pygments_style": "monokai",
+            "auto_title": True,
+        },
+        "codehilite": {
+            "linenums": True,
+            "guess_lang": False,
+            "css_class": "syntax",
+            "use_pygments": True,
+        },
+    }
+
+
+@cache
+def get_cleaner():
+    """Bleach sanitizer to clean HTML (optional but safe)"""
+    from bleach.css_sanitizer import CSSSanitizer
+    from bleach.sanitizer import Cleaner
+
+    return Cleaner(
+        tags=[
+            "a",
+            "abbr",
+            "acronym",
+            "b",
+            "blockquote",
+            "code",
+            "em",
+            "i",
+            "li",
+            "ol",
+            "strong",
+            "ul",
+            "h1",
+            "h2",
+            "h3",
+            "p",
+            "pre",
+            "img",
+            "table",
+            "thead",
+            "tbody",
+            "tr",
+            "th",
+            "td",
+            "hr",
+            "br",
+            "span",
+            "div",
+            "iframe",
         ],
-    },
-    "pymdownx.highlight": {
-        "linenums": True,
-        "noclasses": True,
-        "pygments_style": "monokai",
-        "auto_title": True,
-    },
-    "codehilite": {
-        "linenums": True,
-        "guess_lang": False,
-        "css_class": "syntax",
-        "use_pygments": True,
-    },
-}
-
-# Bleach sanitizer to clean HTML (optional but safe)
-cleaner = Cleaner(
-    tags=[
-        "a",
-        "abbr",
-        "acronym",
-        "b",
-        "blockquote",
-        "code",
-        "em",
-        "i",
-        "li",
-        "ol",
-        "strong",
-        "ul",
-        "h1",
-        "h2",
-        "h3",
-        "p",
-        "pre",
-        "img",
-        "table",
-        "thead",
-        "tbody",
-        "tr",
-        "th",
-        "td",
-        "hr",
-        "br",
-        "span",
-        "div",
-        "iframe",
-    ],
-    attributes={
-        "*": ["class", "href", "title", "src", "alt", "style"],
-        "img": ["src", "alt", "title"],
-        "iframe": ["src", "width", "height", "frameborder", "allow", "allowfullscreen"],
-        "div": ["class", "style"],
-    },
-    css_sanitizer=css_sanitizer,
-    protocols=["http", "https", "mailto"],
-    strip=True,
-)
+        attributes={
+            "*": ["class", "href", "title", "src", "alt", "style"],
+            "img": ["src", "alt", "title"],
+            "iframe": [
+                "src",
+                "width",
+                "height",
+                "frameborder",
+                "allow",
+                "allowfullscreen",
+            ],
+            "div": ["class", "style"],
+        },
+        css_sanitizer=CSSSanitizer(),
+        protocols=["http", "https", "mailto"],
+        strip=True,
+    )
 
 
 @register.simple_tag(takes_context=True)
 def markdownify(context, file_path, **kwargs):
+    from markdown import Markdown
+
     raw = load_markdown(file_path, context)
 
     md = Markdown(
         extensions=markdown_extensions,
-        extension_configs=extension_configs,
+        extension_configs=get_extension_configs(),
     )
 
     md = md.convert(raw)
 
     html = postprocess_diagrams(md)
-    cleaned = cleaner.clean(html).replace("&gt;", ">")
+    cleaned = get_cleaner().clean(html).replace("&gt;", ">")
 
     return mark_safe(cleaned)
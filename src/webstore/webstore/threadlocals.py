@@ -1,12 +1,14 @@
 import logging
-import threading
 
+from asgiref.local import Local
 from django.core.cache import cache
 
 logger = logging.getLogger("django")
 
-_thread_locals = threading.local()
-_storage = threading.local()
+# per thread under WSGI, per request context under ASGI (and followed into
+# the sync_to_async threads of the request)
+_thread_locals = Local()
+_storage = Local()
 
 
 def set_current_request(request):
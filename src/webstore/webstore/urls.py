@@ -15,7 +15,6 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from django.conf.urls.i18n import i18n_patterns
@@ -24,10 +23,17 @@ from django.views.i18n import JavaScriptCatalog
 from django.views.decorators.http import last_modified
 from django.views.generic.base import TemplateView
 
+from apps.catalog.views import stock
+from apps.search.views import autocomplete
+from apps.zipCodes.views import lookup as zip_codes
+from webstore.jscatalog import JS_INFO_DICT
+
 admin.autodiscover()
 
 urlpatterns = [
     path("brands/", include("apps.brands.urls", namespace="brands")),
+    path("catalog/", include("apps.catalog.urls", namespace="catalog")),
+    path("search/", include("apps.search.urls", namespace="search")),
     # path("grappelli/", include("grappelli.urls")),  # grappelli URLS
     path("admin/", admin.site.urls),
     path(
@@ -40,12 +46,14 @@ front_pags_urls = (
     [path("", include("apps.frontpage.urls"), name="index")],
     "frontpage",
 )
-webstore_urls = ([], "webstore")
-
-js_info_dict = {
-    "domain": "django",
-    "packages": getattr(settings, "PROJECT_APPS"),
-}
+webstore_urls = (
+    [
+        path("autocomplete/", autocomplete, name="autocomplete"),
+        path("zip-codes/", zip_codes, name="zip_codes"),
+        path("stock/", stock, name="stock"),
+    ],
+    "webstore",
+)
 
 last_modified_date = timezone.now()
 urlpatterns += i18n_patterns(
@@ -54,7 +62,7 @@ urlpatterns += i18n_patterns(
     path(
         "system.js",
         last_modified(lambda req, **kw: last_modified_date)(
-            JavaScriptCatalog.as_view(**js_info_dict)
+            JavaScriptCatalog.as_view(**JS_INFO_DICT)
         ),
         name="javascript-catalog",
     ),
@@ -0,0 +1,25 @@
+"""
+Domain parsing against the Public Suffix List snapshot bundled with
+tldextract: no download (`suffix_list_urls=()`) and no disk cache, so it
+behaves the same on the offline deploys and never blocks a request.
+
+The results are memoized per domain; the site domains are parsed by the
+siteSettings warmup, before the worker takes traffic.
+"""
+
+from functools import lru_cache
+
+from tldextract import TLDExtract
+
+_extract = TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+
+@lru_cache(maxsize=256)
+def split_domain(domain):
+    """tldextract's ExtractResult (subdomain, domain, suffix) of `domain`."""
+    return _extract(domain)
+
+
+def domain_name(domain):
+    """The registered name without its suffix: "shop" for www.shop.co.uk."""
+    return split_domain(domain).domain
@@ -0,0 +1,255 @@
+"""
+Worker warmup.
+
+Fills the per-process caches before a worker takes traffic, so the first
+requests after a (re)start don't pay for them:
+
+- the project steps registered with `@warmup` (URL resolver, compiled
+  templates, manifests, translation catalogs),
+- the `warmup()` method of the AppConfigs defining one (site settings,
+  facet indexes, search structures, zip codes),
+- a request to each of WARMUP_URLS, per site and language, through the
+  whole middleware stack.
+
+gunicorn runs it from its `post_worker_init` hook (gunicorn.conf.py), the
+timings are logged and appended to WARMUP_LOG, one JSON line per worker.
+
+With GUNICORN_PRELOAD the master builds the read-only part before forking
+(`run_preload`: the `@warmup` steps and the `@preload` ones, too big to
+build in every worker) and freezes it out of the garbage collector, so the
+workers share its memory pages (copy-on-write) instead of each building
+their own copy. The data warmups still run in the workers, the master
+doesn't know when it changes.
+"""
+
+import gc
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.test import RequestFactory
+from django.urls import NoReverseMatch, get_resolver, reverse
+from django.utils import translation
+
+logger = logging.getLogger("django")
+
+WARMUPS = []
+PRELOADS = []
+
+
+def warmup(function):
+    """Register `function` as a warmup step."""
+    WARMUPS.append(function)
+    return function
+
+
+def preload(function):
+    """Register `function` as a step of the preload, in the master only."""
+    PRELOADS.append(function)
+    return function
+
+
+def _timed(timings, name, function, *args):
+    start = perf_counter()
+    try:
+        function(*args)
+    except Exception:
+        logger.exception(f"[Warmup] {name} failed")
+    timings[name] = perf_counter() - start
+
+
+def run_warmups(requests=True):
+    """Run the warmup, return {step name: seconds}."""
+    steps = {}
+    for function in WARMUPS:
+        _timed(steps, function.__name__, function)
+    for app in apps.get_app_configs():
+        if callable(getattr(app, "warmup", None)):
+            _timed(steps, app.label, app.warmup)
+
+    urls = {}
+    if requests:
+        for host, path in warmup_urls():
+            _timed(urls, f"{host}{path}", warm_request, host, path)
+
+    total = sum(steps.values()) + sum(urls.values())
+    logger.info(
+        f"[Warmup] Done in {total * 1000:.0f} ms: "
+        + ", ".join(f"{name} {t * 1000:.0f} ms" for name, t in steps.items())
+        + f", {len(urls)} requests {sum(urls.values()) * 1000:.0f} ms"
+    )
+    _record(total, steps, urls)
+    return {**steps, **urls}
+
+
+def run_preload():
+    """Build the read-only structures before the fork, return {step: seconds}."""
+    steps = {}
+    for function in [*WARMUPS, *PRELOADS]:
+        _timed(steps, function.__name__, function)
+
+    # the workers open their own
+    connections.close_all()
+    caches.close_all()
+    # the objects built so far are never collected, their pages stay shared
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        f"[Warmup] Preloaded in {sum(steps.values()) * 1000:.0f} ms, "
+        f"{gc.get_freeze_count()} objects frozen: "
+        + ", ".join(f"{name} {t * 1000:.0f} ms" for name, t in steps.items())
+    )
+    return steps
+
+
+def reset_preload():
+    """Drop the preloaded structures, rebuilt by `run_preload` (gunicorn HUP)."""
+    from django.template.autoreload import reset_loaders
+    from django.utils.translation import trans_real
+
+    from webstore import jscatalog
+    from webstore.templatetags import assets
+
+    gc.unfreeze()
+    reset_loaders()
+    assets.reset_manifest()
+    jscatalog.reset_manifest()
+    # like Django's autoreloader does when a .mo file changes
+    trans_real._translations = {}
+    trans_real._default = None
+
+
+def _record(total, steps, urls):
+    """Append the timings to WARMUP_LOG, to follow them from deploy to deploy."""
+    if not settings.WARMUP_LOG:
+        return
+    line = {
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "pid": os.getpid(),
+        "total_ms": round(total * 1000, 1),
+        "steps_ms": {name: round(t * 1000, 1) for name, t in steps.items()},
+        "requests_ms": {name: round(t * 1000, 1) for name, t in urls.items()},
+    }
+    path = Path(settings.WARMUP_LOG)
+    try:
+        # var/ is ignored, a fresh checkout doesn't have it
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as log:
+            log.write(json.dumps(line) + "\n")
+    except OSError as e:
+        logger.warning(f"[Warmup] Can't write {settings.WARMUP_LOG}: {e}")
+
+
+def warmup_urls():
+    """(host, path) of WARMUP_URLS for the sites with settings, per language."""
+    from apps.siteSettings.models import SiteSettings
+
+    urls = []
+    hosts = SiteSettings.objects.values_list("site__domain", flat=True)
+    for host in hosts:
+        for language, name in settings.LANGUAGES:
+            with translation.override(language):
+                for url_name in settings.WARMUP_URLS:
+                    try:
+                        url = (host, reverse(url_name))
+                    except NoReverseMatch:
+                        logger.warning(f"[Warmup] No URL named {url_name}")
+                        continue
+                    # the URLs out of i18n_patterns are the same in all languages
+                    if url not in urls:
+                        urls.append(url)
+    return urls
+
+
+_handler = None
+
+
+def warm_request(host, path):
+    global _handler
+    if _handler is None:
+        _handler = WSGIHandler()
+    request = RequestFactory(HTTP_HOST=host).get(path)
+    response = _handler.get_response(request)
+    # renders the streamed responses, request_finished closes the connections
+    b"".join(response)
+    response.close()
+    if response.status_code >= 500:
+        logger.warning(f"[Warmup] {host}{path} answered {response.status_code}")
+
+
+def template_names():
+    """The templates of the project (not the packages), relative names."""
+    directories = [Path(directory) for directory in settings.TEMPLATES[0]["DIRS"]]
+    for app in apps.get_app_configs():
+        if app.name in settings.PROJECT_APPS:
+            directories.append(Path(app.path, "templates"))
+    for directory in directories:
+        for path in sorted(directory.rglob("*.html")):
+            yield path.relative_to(directory).as_posix()
+
+
+@warmup
+def load_urls():
+    # imports the URLconf (admin.autodiscover) and fills the reverse maps
+    resolver = get_resolver()
+    resolver.reverse_dict
+    resolver.namespace_dict
+
+
+@warmup
+def compile_templates():
+    # kept by the cached template loader
+    engine = engines["django"]
+    for name in template_names():
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError:
+            logger.exception(f"[Warmup] Template {name} doesn't compile")
+
+
+@warmup
+def load_manifests():
+    from webstore import jscatalog
+    from webstore.templatetags import assets
+
+    assets.load_manifest()
+    jscatalog.load_manifest()
+
+
+@warmup
+def load_translations():
+    for language, name in settings.LANGUAGES:
+        with translation.override(language):
+            translation.gettext("")
+
+
+@preload
+def load_markdown():
+    from markdown import Markdown
+
+    from webstore.templatetags.markdown import (
+        get_cleaner,
+        get_extension_configs,
+        markdown_extensions,
+    )
+
+    # imports the extensions, pygments and the emoji index
+    Markdown(extensions=markdown_extensions, extension_configs=get_extension_configs())
+    get_cleaner()
+
+
+@preload
+def load_domain_suffixes():
+    from webstore.utils.domains import split_domain
+
+    # the public suffix list, loaded on the first call
+    split_domain("example.com")
@@ -231,6 +231,12 @@ if [[ "$ACTION" == "install" ]]; then
 	cd "$PROJECT_ROOT/src/webstore"
     poetry run python manage.py collectstatic --noinput
 
+	log "🔤 Precompiling the JavaScript translation catalogs..."
+    poetry run python manage.py compile_js_catalog
+
+	log "🗄️ Creating the cache tables..."
+    poetry run python manage.py createcachetable
+
     # ------------------------------------------------------------
     # 🔧 Fix the paths and owner for the file to www-data:www-data
     # ------------------------------------------------------------
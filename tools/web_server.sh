@@ -79,6 +79,8 @@ usage() {
     log "  --gunicorn-socket      	- (Optional) path to Gunicorn socket, default $GUNICORN_SOCK_FILE"
     log "  --static-subdomain		- (Optional) Define the subdomain for static files"
     log "  --media-subdomain		- (Optional) Define the subdomain for media files"
+    log "  --preload             	- (Optional) Load the app in the Gunicorn master, the workers share its memory"
+    log "  --asgi                	- (Optional) Serve the ASGI application with uvicorn workers"
     log "  -h|--help               	- display this help information"
   exit 1
 }
@@ -97,6 +99,9 @@ log "🔧 Setting up Gunicorn and Nginx server"
 DOMAINS=()
 STATIC_SUBDOMAIN="/static/"
 MEDIA_SUBDOMAIN="/media/"
+GUNICORN_PRELOAD=0
+GUNICORN_WORKER_CLASS="gthread"
+GUNICORN_APPLICATION="wsgi"
 
 # Parse arguments
 while [[ $# -gt 0 ]]; do
@@ -117,6 +122,15 @@ while [[ $# -gt 0 ]]; do
       MEDIA_SUBDOMAIN="$2"
       shift 2
       ;;
+    --preload)
+      GUNICORN_PRELOAD=1
+      shift
+      ;;
+    --asgi)
+      GUNICORN_WORKER_CLASS="uvicorn_worker.UvicornWorker"
+      GUNICORN_APPLICATION="asgi"
+      shift
+      ;;
     -h|--help)
       usage
       ;;
@@ -190,14 +204,13 @@ if [ ! -f "$SUPERVISOR_PATH/$PROJECT_NAME.conf" ]; then
     tee "$SUPERVISOR_PATH/$PROJECT_NAME.conf" > /dev/null <<EOF
 [program:$PROJECT_NAME]
 directory=$PROJECT_ROOT/src/webstore
-command=$VENV_DIR/bin/gunicorn $PROJECT_NAME.wsgi:application \
---bind unix:$GUNICORN_SOCK_FILE --workers $GUNICORN_WORKERS --threads $GUNICORN_THREADS --timeout 60 --reload
+command=$VENV_DIR/bin/gunicorn --config $PROJECT_ROOT/src/webstore/gunicorn.conf.py $PROJECT_NAME.$GUNICORN_APPLICATION:application
 user=www-data
 autostart=true
 autorestart=true
 stderr_logfile=$PROJECT_ROOT/var/log/$PROJECT_NAME.err.log
 stdout_logfile=$PROJECT_ROOT/var/log/$PROJECT_NAME.out.log
-environment=DJANGO_SETTINGS_MODULE="$PROJECT_NAME.settings",PYTHONUNBUFFERED="1",ENV_PATH="$PROJECT_ROOT/.env",TLDEXTRACT_CACHE="$PROJECT_ROOT/var/cache/tldextract"
+environment=DJANGO_SETTINGS_MODULE="$PROJECT_NAME.settings",PYTHONUNBUFFERED="1",ENV_PATH="$PROJECT_ROOT/.env",GUNICORN_BIND="unix:$GUNICORN_SOCK_FILE",GUNICORN_WORKERS="$GUNICORN_WORKERS",GUNICORN_THREADS="$GUNICORN_THREADS",GUNICORN_PIDFILE="$PROJECT_ROOT/var/run/gunicorn.pid",GUNICORN_PRELOAD="$GUNICORN_PRELOAD",GUNICORN_WORKER_CLASS="$GUNICORN_WORKER_CLASS"
 EOF
 
 supervisorctl reread
@@ -458,6 +471,16 @@ server {
     alias $PROJECT_ROOT/www/static/;
     access_log off;
     expires 30d;
+    # serve the precompressed .gz next to the file (JavaScript catalogs)
+    gzip_static on;
+
+    # content hashed names never change
+    location ~ ^/static/.*\.[a-f0-9]{8,}\.[a-z0-9]+$ {
+      access_log off;
+      expires max;
+      gzip_static on;
+      add_header cache-control "public, max-age=31536000, immutable";
+    }
   }
 
   location /media/ {
@@ -559,6 +582,7 @@ server {
     alias $PROJECT_ROOT/www/static/\$1;
     access_log off;
     expires 30d;
+    gzip_static on;
 
     add_header cache-control "public, immutable";
     add_header Access-Control-Allow-Origin "\$cors_allow_origin" always;
@@ -723,7 +747,7 @@ systemctl restart nginx
 ### Summary
 echo_step "Deployment finished successfully!"
 log "🖥️  Hardware: CPU cores: ${CPU_CORES}, RAM: ${RAM_SIZE_TXT}"
-log "⚙️  Gunicorn workers: ${GUNICORN_WORKERS}, threads: ${GUNICORN_THREADS}"
+log "⚙️  Gunicorn workers: ${GUNICORN_WORKERS}, threads: ${GUNICORN_THREADS}, preload: ${GUNICORN_PRELOAD}, worker class: ${GUNICORN_WORKER_CLASS}"
 log "📁 Nginx config updated: $NGINX_CONF"
 log "📁 Project path: ${PROJECT_ROOT}"
 log "🐍 Domains: ${DOMAINS[*]}"